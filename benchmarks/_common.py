@@ -0,0 +1,142 @@
+# Copyright 2025 Qiskit on IQM developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Circuits, timing helpers and reference implementations shared by the benchmarks."""
+from collections.abc import Callable
+import math
+import time
+from typing import Any, Optional
+
+import numpy as np
+from qiskit import ClassicalRegister, QuantumCircuit
+from qiskit.circuit.equivalence_library import SessionEquivalenceLibrary
+from qiskit.circuit.library import RGate
+from qiskit.dagcircuit import DAGCircuit
+from qiskit.transpiler.passes import BasisTranslator, Optimize1qGatesDecomposition
+
+from iqm.qiskit_iqm.iqm_transpilation import TOLERANCE
+
+
+def deep_circuit(
+    num_qubits: int,
+    edges: list[tuple[int, int]],
+    num_gates: int,
+    seed: int,
+    *,
+    classically_controlled: bool = True,
+) -> QuantumCircuit:
+    """Random circuit of native gates.
+
+    Args:
+        num_qubits: number of qubits in the circuit
+        edges: qubit pairs on which CZ gates can be applied
+        num_gates: approximate number of instructions in the circuit
+        seed: random seed
+        classically_controlled: Iff True, some of the measurements are followed by a classically controlled gate.
+
+    Returns:
+        the circuit
+    """
+    rng = np.random.default_rng(seed)
+    creg = ClassicalRegister(num_qubits, 'c')
+    circuit = QuantumCircuit(num_qubits)
+    circuit.add_register(creg)
+    kinds = rng.choice(
+        4, size=num_gates, p=[0.55, 0.35, 0.05, 0.05] if classically_controlled else [0.55, 0.4, 0.05, 0]
+    )
+    angles = rng.uniform(0, 2 * np.pi, size=(num_gates, 2))
+    for i, kind in enumerate(kinds):
+        qubit = int(rng.integers(num_qubits))
+        if kind == 0:
+            circuit.r(angles[i, 0], angles[i, 1], qubit)
+        elif kind == 1:
+            circuit.cz(*edges[int(rng.integers(len(edges)))])
+        elif kind == 2:
+            circuit.measure(qubit, creg[qubit])
+        else:
+            circuit.measure(qubit, creg[qubit])
+            circuit.x(qubit).c_if(creg[qubit], 1)
+    return circuit
+
+
+def best_time(function: Callable[..., object], repeats: int, setup: Optional[Callable[[], Any]] = None) -> float:
+    """Best wall clock time of calling ``function`` ``repeats`` times, in seconds.
+
+    Args:
+        function: function to time
+        repeats: number of calls
+        setup: If given, called before each call of ``function`` without being timed, and its result is passed to
+            ``function``, e.g. to give each call a fresh copy of its input.
+
+    Returns:
+        the best time
+    """
+    times = []
+    for _ in range(repeats):
+        args = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def dag_copy(dag: DAGCircuit) -> Callable[[], DAGCircuit]:
+    """Setup function returning a fresh copy of ``dag`` for each timed call, see :func:`best_time`."""
+
+    def setup() -> DAGCircuit:
+        copy = dag.copy_empty_like()
+        copy.compose(dag)
+        return copy
+
+    return setup
+
+
+def three_stage_optimization(dag: DAGCircuit, drop_final_rz: bool = True) -> DAGCircuit:
+    """Single-qubit gate optimization as it was done before :class:`.IQMOptimizeSingleQubitGates` fused it.
+
+    Translates the circuit into U gates, combines them with
+    :class:`~qiskit.transpiler.passes.Optimize1qGatesDecomposition` and converts the U gates into R gates while
+    tracking the virtual RZ rotations. Used as the baseline of the benchmarks and as the reference of the tests.
+
+    Args:
+        dag: circuit of R, CZ and MOVE gates, measurements and resets, without classically controlled gates
+        drop_final_rz: Iff False, the RZ rotations left at the end of the circuit are applied as two R gates.
+
+    Returns:
+        the optimized circuit
+    """
+    basis = ['u', 'cz', 'move']
+    dag = BasisTranslator(SessionEquivalenceLibrary, basis).run(dag)
+    dag = Optimize1qGatesDecomposition(basis).run(dag)
+    rz_angles = [0.0] * dag.num_qubits()
+    for node in dag.topological_op_nodes():
+        indices = [dag.find_bit(qubit).index for qubit in node.qargs]
+        if node.name == 'u':
+            theta, phi, lam = node.op.params
+            if math.isclose(theta, 0, abs_tol=TOLERANCE):
+                dag.remove_op_node(node)
+            else:
+                dag.substitute_node(node, RGate(theta, np.pi / 2 - lam - rz_angles[indices[0]]))
+            dag.global_phase += (phi + lam) / 2
+            rz_angles[indices[0]] += phi + lam
+        elif node.name in {'measure', 'reset'}:
+            for index in indices:
+                rz_angles[index] = 0
+        elif node.name == 'move':
+            rz_angles[indices[0]], rz_angles[indices[1]] = rz_angles[indices[1]], rz_angles[indices[0]]
+    if not drop_final_rz:
+        for index, rz_angle in enumerate(rz_angles):
+            if rz_angle != 0:
+                dag.apply_operation_back(RGate(-np.pi, 0), (dag.qubits[index],))
+                dag.apply_operation_back(RGate(np.pi, rz_angle / 2), (dag.qubits[index],))
+    return dag
@@ -0,0 +1,63 @@
+# Copyright 2025 Qiskit on IQM developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the cold-start import time of :mod:`iqm.qiskit_iqm`.
+
+Each measurement imports the package in a fresh interpreter, so that nothing is cached in ``sys.modules``.
+
+Usage::
+
+    python benchmarks/bench_import_time.py [--repeats N]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULES = ['qiskit', 'iqm.iqm_client', 'iqm.qiskit_iqm', 'iqm.qiskit_iqm.fake_backends']
+
+_CODE = '''
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, 'qiskit_aer' in sys.modules)
+'''
+
+
+def measure_import(module: str) -> tuple[float, bool]:
+    """Import ``module`` in a fresh interpreter.
+
+    Returns:
+        import time in seconds, whether ``qiskit_aer`` was loaded as a side effect
+    """
+    result = subprocess.run(
+        [sys.executable, '-c', _CODE.format(module=module)], capture_output=True, text=True, check=True
+    )
+    duration, aer_loaded = result.stdout.split()
+    return float(duration), aer_loaded == 'True'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=5, help='number of fresh interpreters per module')
+    args = parser.parse_args()
+
+    print(f'{"module":<32} {"median [ms]":>12} {"min [ms]":>10}  qiskit_aer loaded')
+    for module in MODULES:
+        samples = [measure_import(module) for _ in range(args.repeats)]
+        times = [1e3 * t for t, _ in samples]
+        print(f'{module:<32} {statistics.median(times):>12.1f} {min(times):>10.1f}  {samples[-1][1]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# Copyright 2025 Qiskit on IQM developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the MOVE routing pass on the fake Deneb backend.
+
+Compares :class:`.IQMNaiveResonatorMoving`, which routes the DAG directly, against the IQM client round trip it
+replaced: serializing the DAG into an IQM client circuit, routing it using
+:func:`~iqm.iqm_client.transpile.transpile_insert_moves`, and deserializing the result into a DAG. The circuits are
+GHZ, quantum volume and random deep circuits transpiled to the simplified architecture of the backend.
+
+Usage::
+
+    python benchmarks/bench_move_routing.py [--num-gates N] [--repeats N] [--seed N]
+"""
+import argparse
+
+from _common import best_time, dag_copy, deep_circuit
+from qiskit import QuantumCircuit, QuantumRegister, transpile
+from qiskit.circuit.library import QuantumVolume
+from qiskit.converters import circuit_to_dag
+from qiskit.dagcircuit import DAGCircuit
+from qiskit.transpiler.layout import Layout
+
+from iqm.iqm_client import Circuit
+from iqm.iqm_client.transpile import transpile_insert_moves
+from iqm.qiskit_iqm.fake_backends import IQMFakeDeneb
+from iqm.qiskit_iqm.iqm_backend import IQMTarget
+from iqm.qiskit_iqm.iqm_naive_move_pass import IQMNaiveResonatorMoving
+from iqm.qiskit_iqm.qiskit_to_iqm import deserialize_instructions, serialize_dag
+
+
+def round_trip(dag: DAGCircuit, target: IQMTarget) -> DAGCircuit:
+    """Route the DAG through the IQM client circuit format."""
+    layout = Layout.generate_trivial_layout(*dag.qregs.values())
+    circuit = Circuit(name='routing', instructions=tuple(serialize_dag(dag, target.iqm_idx_to_component)))
+    routed = transpile_insert_moves(circuit, target.iqm_dqa)
+    routed_circuit = deserialize_instructions(list(routed.instructions), target.iqm_component_to_idx, layout)
+    return circuit_to_dag(routed_circuit)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--num-gates', type=int, default=10_000, help='number of gates in the deep circuit')
+    parser.add_argument('--repeats', type=int, default=5, help='number of repetitions of each measurement')
+    parser.add_argument('--seed', type=int, default=1, help='random seed for the circuits and the transpiler')
+    args = parser.parse_args()
+
+    backend = IQMFakeDeneb()
+    target = backend.target
+    num_qubits = len(backend.architecture.qubits)
+    ghz = QuantumCircuit(num_qubits)
+    ghz.h(0)
+    for qubit in range(num_qubits - 1):
+        ghz.cx(qubit, qubit + 1)
+    ghz.measure_all()
+    qv = QuantumVolume(num_qubits, seed=args.seed)
+    qv.measure_all()
+    circuits = {
+        'ghz': ghz,
+        'qv': qv,
+        'deep': deep_circuit(
+            num_qubits,
+            list(backend.coupling_map.get_edges()),
+            args.num_gates,
+            args.seed,
+            classically_controlled=False,
+        ),
+    }
+
+    print(f'{"circuit":<8} {"ops":>7} {"round trip [s]":>15} {"pass [s]":>10} {"speedup":>8}')
+    for name, circuit in circuits.items():
+        transpiled = transpile(circuit, target=target, optimization_level=1, seed_transpiler=args.seed)
+        # the DAG acts on all the QPU components, like in the scheduling stage
+        physical = QuantumCircuit(QuantumRegister(target.num_qubits, 'q'), *transpiled.cregs)
+        physical.compose(transpiled, inplace=True)
+        dag = circuit_to_dag(physical)
+        old = best_time(lambda d: round_trip(d, target), args.repeats, setup=dag_copy(dag))
+        new = best_time(lambda d: IQMNaiveResonatorMoving(target).run(d), args.repeats, setup=dag_copy(dag))
+        print(f'{name:<8} {dag.size():>7} {old:>15.4f} {new:>10.4f} {old / new:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
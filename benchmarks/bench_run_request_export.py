@@ -0,0 +1,86 @@
+# Copyright 2025 Qiskit on IQM developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the binary export of run requests against their JSON representation.
+
+The run request consists of random deep circuits of native gates on fake Garnet, see ``_common.py``.
+Reports the size of both representations, and the best time for writing them and reading them back.
+
+Usage::
+
+    python benchmarks/bench_run_request_export.py [--num-circuits N] [--num-gates N] [--repeats N] [--seed N]
+"""
+import argparse
+import io
+import uuid
+
+from _common import best_time, deep_circuit
+
+from iqm.iqm_client import Circuit, RunRequest
+from iqm.qiskit_iqm.fake_backends.fake_garnet import IQMFakeGarnet
+from iqm.qiskit_iqm.qiskit_to_iqm import serialize_instructions
+from iqm.qiskit_iqm.run_request_export import export_run_request, load_run_request
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--num-circuits', type=int, default=100, help='number of circuits in the run request')
+    parser.add_argument('--num-gates', type=int, default=10_000, help='number of instructions per circuit')
+    parser.add_argument('--repeats', type=int, default=3, help='number of repetitions of each measurement')
+    parser.add_argument('--seed', type=int, default=1, help='random seed for the circuits')
+    args = parser.parse_args()
+
+    backend = IQMFakeGarnet()
+    edges = list(backend.coupling_map.get_edges())
+    qubit_index_to_name = {i: backend.index_to_qubit_name(i) for i in range(backend.num_qubits)}
+    circuits = []
+    for i in range(args.num_circuits):
+        circuit = deep_circuit(backend.num_qubits, edges, args.num_gates, args.seed + i)
+        instructions = serialize_instructions(circuit, qubit_index_to_name)
+        circuits.append(Circuit(name=f'circuit_{i}', instructions=instructions, metadata={'index': i}))
+    run_request = RunRequest(circuits=circuits, calibration_set_id=uuid.uuid4(), shots=1000)
+    num_instructions = sum(len(c.instructions) for c in circuits)
+    print(f'{args.num_circuits} circuits, {num_instructions} instructions\n')
+
+    json_data = run_request.model_dump_json()
+    binary = io.BytesIO()
+    export_run_request(run_request, binary)
+    binary_data = binary.getvalue()
+
+    def export() -> None:
+        export_run_request(run_request, io.BytesIO())
+
+    results = [
+        ('json', 'write', len(json_data), best_time(run_request.model_dump_json, args.repeats)),
+        ('json', 'read', len(json_data), best_time(lambda: RunRequest.model_validate_json(json_data), args.repeats)),
+        ('binary', 'write', len(binary_data), best_time(export, args.repeats)),
+        (
+            'binary',
+            'read',
+            len(binary_data),
+            best_time(lambda: load_run_request(io.BytesIO(binary_data)), args.repeats),
+        ),
+        (
+            'binary',
+            'read trusted',
+            len(binary_data),
+            best_time(lambda: load_run_request(io.BytesIO(binary_data), trusted=True), args.repeats),
+        ),
+    ]
+    print(f'{"format":<8} {"operation":<14} {"size [MB]":>10} {"best [s]":>10} {"instructions/s":>16}')
+    for fmt, operation, size, best in results:
+        print(f'{fmt:<8} {operation:<14} {size / 1e6:>10.2f} {best:>10.3f} {num_instructions / best:>16.0f}')
+
+
+if __name__ == '__main__':
+    main()
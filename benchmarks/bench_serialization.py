@@ -0,0 +1,57 @@
+# Copyright 2025 Qiskit on IQM developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the serialization of deep circuits into the IQM data transfer format.
+
+The circuits consist of random native gates on the qubits and couplings of the fake backends, with occasional
+mid-circuit measurements and classically controlled gates. Each circuit is serialized both with and without
+the validation of the instructions, see the ``trusted`` argument of :func:`.serialize_instructions`.
+
+Usage::
+
+    python benchmarks/bench_serialization.py [--num-gates N] [--repeats N] [--seed N]
+"""
+import argparse
+from functools import partial
+
+from _common import best_time, deep_circuit
+
+from iqm.qiskit_iqm.fake_backends.fake_aphrodite import IQMFakeAphrodite
+from iqm.qiskit_iqm.fake_backends.fake_garnet import IQMFakeGarnet
+from iqm.qiskit_iqm.qiskit_to_iqm import serialize_instructions
+
+BACKENDS = {'garnet': IQMFakeGarnet, 'aphrodite': IQMFakeAphrodite}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--num-gates', type=int, default=100_000, help='number of instructions per circuit')
+    parser.add_argument('--repeats', type=int, default=3, help='number of serializations per backend')
+    parser.add_argument('--seed', type=int, default=1, help='random seed for the circuits')
+    args = parser.parse_args()
+
+    print(f'{"backend":<12} {"trusted":<8} {"instructions":>12} {"best [s]":>10} {"instructions/s":>16}')
+    for name, backend_factory in BACKENDS.items():
+        backend = backend_factory()
+        edges = list(backend.coupling_map.get_edges())
+        circuit = deep_circuit(backend.num_qubits, edges, args.num_gates, args.seed)
+        qubit_index_to_name = {i: backend.index_to_qubit_name(i) for i in range(backend.num_qubits)}
+        for trusted in (False, True):
+            best = best_time(
+                partial(serialize_instructions, circuit, qubit_index_to_name, trusted=trusted), args.repeats
+            )
+            print(f'{name:<12} {trusted!s:<8} {len(circuit.data):>12} {best:>10.3f} {len(circuit.data) / best:>16.0f}')
+
+
+if __name__ == '__main__':
+    main()
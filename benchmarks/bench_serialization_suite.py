@@ -0,0 +1,198 @@
+# Copyright 2025 Qiskit on IQM developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the serialization round trip on typical workloads, to track its performance across releases.
+
+Quantum volume, GHZ, random Clifford and mid-circuit measurement circuits (with classically controlled gates) are
+transpiled for the fake Adonis, Garnet, Deneb and Aphrodite backends. For each transpiled circuit, the script measures
+:func:`.serialize_instructions` (with and without validation), :meth:`.IQMBackend.serialize_circuit`,
+:func:`.deserialize_instructions`, and encoding and decoding the measurement keys using :class:`.MeasurementKey`.
+It reports the throughput in instructions (or measurement keys) per second, and the peak memory allocated during a
+single call.
+
+Usage::
+
+    python benchmarks/bench_serialization_suite.py [--backends NAME ...] [--workloads NAME ...] [--min-time S]
+"""
+import argparse
+from collections.abc import Callable
+import time
+import tracemalloc
+
+import numpy as np
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+from qiskit.circuit.library import QuantumVolume
+from qiskit.quantum_info import random_clifford
+from qiskit.transpiler.layout import Layout
+
+from iqm.iqm_client import DynamicQuantumArchitecture
+from iqm.qiskit_iqm import transpile_to_IQM
+from iqm.qiskit_iqm.fake_backends import IQMFakeAdonis, IQMFakeAphrodite, IQMFakeDeneb
+from iqm.qiskit_iqm.fake_backends.fake_garnet import IQMFakeGarnet
+from iqm.qiskit_iqm.fake_backends.iqm_fake_backend import IQMFakeBackend
+from iqm.qiskit_iqm.iqm_provider import IQMBackend
+from iqm.qiskit_iqm.qiskit_to_iqm import (
+    MeasurementKey,
+    _parse_measurement_key,
+    deserialize_instructions,
+    serialize_instructions,
+)
+
+BACKENDS: dict[str, Callable[[], IQMFakeBackend]] = {
+    'adonis': IQMFakeAdonis,
+    'garnet': IQMFakeGarnet,
+    'deneb': IQMFakeDeneb,
+    'aphrodite': IQMFakeAphrodite,
+}
+
+
+class OfflineClient:
+    """Stands in for the IQM client, so that an :class:`.IQMBackend` can be created for a fake backend."""
+
+    def __init__(self, architecture: DynamicQuantumArchitecture):
+        self.architecture = architecture
+
+    def get_dynamic_quantum_architecture(self, _calibration_set_id=None) -> DynamicQuantumArchitecture:
+        """Architecture of the fake backend."""
+        return self.architecture
+
+
+def quantum_volume(num_qubits: int, seed: int) -> QuantumCircuit:
+    """Quantum volume circuit of width and depth ``min(num_qubits, 8)``."""
+    width = min(num_qubits, 8)
+    circuit = QuantumVolume(width, seed=seed).decompose()
+    circuit.measure_all()
+    return circuit
+
+
+def ghz(num_qubits: int, seed: int) -> QuantumCircuit:  # pylint: disable=unused-argument
+    """GHZ state preparation on all the qubits."""
+    circuit = QuantumCircuit(num_qubits)
+    circuit.h(0)
+    for qubit in range(num_qubits - 1):
+        circuit.cx(qubit, qubit + 1)
+    circuit.measure_all()
+    return circuit
+
+
+def clifford(num_qubits: int, seed: int) -> QuantumCircuit:
+    """Random Clifford circuit on ``min(num_qubits, 10)`` qubits."""
+    circuit = random_clifford(min(num_qubits, 10), seed=seed).to_circuit()
+    circuit.measure_all()
+    return circuit
+
+
+def mid_circuit_measurements(num_qubits: int, seed: int) -> QuantumCircuit:
+    """Rounds of entangling layers followed by mid-circuit measurements and classically controlled corrections."""
+    rng = np.random.default_rng(seed)
+    qreg = QuantumRegister(num_qubits, 'q')
+    cregs = [ClassicalRegister(num_qubits, f'round_{i}') for i in range(4)]
+    circuit = QuantumCircuit(qreg, *cregs)
+    for creg in cregs:
+        for qubit in range(num_qubits):
+            circuit.h(qubit)
+        for qubit in rng.permutation(num_qubits - 1):
+            circuit.cx(int(qubit), int(qubit) + 1)
+        for qubit in range(num_qubits):
+            circuit.measure(qubit, creg[qubit])
+            circuit.x(qubit).c_if(creg[qubit], 1)
+    return circuit
+
+
+WORKLOADS: dict[str, Callable[[int, int], QuantumCircuit]] = {
+    'qv': quantum_volume,
+    'ghz': ghz,
+    'clifford': clifford,
+    'mcm': mid_circuit_measurements,
+}
+
+
+def throughput(function: Callable[[], object], items: int, min_time: float) -> float:
+    """Best throughput of ``function`` in items per second, calling it repeatedly for at least ``min_time`` seconds."""
+    best = float('inf')
+    total = 0.0
+    while total < min_time:
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+    return items / best
+
+
+def peak_memory(function: Callable[[], object]) -> float:
+    """Peak memory allocated during a single call of ``function``, in KiB."""
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def decode_keys(keys: list[str]) -> None:
+    """Parse measurement keys, bypassing the cache of parsed keys."""
+    _parse_measurement_key.cache_clear()
+    for key in keys:
+        MeasurementKey.from_string(key)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backends', nargs='+', choices=list(BACKENDS), default=list(BACKENDS))
+    parser.add_argument('--workloads', nargs='+', choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument('--min-time', type=float, default=0.2, help='minimum time spent on each measurement [s]')
+    parser.add_argument('--seed', type=int, default=1, help='random seed for the circuits and the transpiler')
+    args = parser.parse_args()
+
+    print(f'{"backend":<10} {"workload":<9} {"operation":<22} {"items":>7} {"items/s":>12} {"peak [KiB]":>11}')
+    for backend_name in args.backends:
+        fake_backend = BACKENDS[backend_name]()
+        backend = IQMBackend(OfflineClient(fake_backend.architecture))  # type: ignore[arg-type]
+        qubit_index_to_name = backend._idx_to_qb
+        qubit_name_to_index = backend._qb_to_idx
+        num_qubits = len(fake_backend.architecture.qubits)
+        for workload in args.workloads:
+            circuit = WORKLOADS[workload](num_qubits, args.seed)
+            transpiled = transpile_to_IQM(circuit, fake_backend, seed_transpiler=args.seed)
+            instructions = serialize_instructions(transpiled, qubit_index_to_name)
+            layout = Layout.generate_trivial_layout(QuantumRegister(num_qubits, 'q'))
+            mk_table = MeasurementKey.table_for(transpiled)
+            keys = [str(mk) for mk in mk_table.values()]
+
+            operations: list[tuple[str, Callable[[], object], int]] = [
+                ('serialize_instructions', lambda: serialize_instructions(transpiled, qubit_index_to_name), 0),
+                (
+                    '  trusted',
+                    lambda: serialize_instructions(transpiled, qubit_index_to_name, trusted=True),
+                    0,
+                ),
+                ('serialize_circuit', lambda: backend.serialize_circuit(transpiled), 0),
+                (
+                    'deserialize',
+                    lambda: deserialize_instructions(instructions, qubit_name_to_index, layout.copy()),
+                    0,
+                ),
+                ('mk encode', lambda: [str(mk) for mk in MeasurementKey.table_for(transpiled).values()], len(keys)),
+                ('mk decode', lambda: decode_keys(keys), len(keys)),
+            ]
+            for operation, function, items in operations:
+                items = items or len(instructions)
+                rate = throughput(function, items, args.min_time)
+                peak = peak_memory(function)
+                print(f'{backend_name:<10} {workload:<9} {operation:<22} {items:>7} {rate:>12.0f} {peak:>11.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# Copyright 2025 Qiskit on IQM developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the single-qubit gate optimization pass on the fake Apollo backend.
+
+Compares :class:`.IQMOptimizeSingleQubitGates`, which combines the runs of R gates in a single traversal of the DAG,
+against the three-stage pipeline it replaced: translating the circuit into U gates with
+:class:`~qiskit.transpiler.passes.BasisTranslator`, combining them with
+:class:`~qiskit.transpiler.passes.Optimize1qGatesDecomposition`, and converting the U gates into R gates while
+tracking the virtual RZ rotations. The circuits are quantum volume and random deep circuits transpiled to the
+backend without optimization, so that they contain long runs of R gates.
+
+Usage::
+
+    python benchmarks/bench_single_qubit_optimization.py [--num-gates N] [--repeats N] [--seed N]
+"""
+import argparse
+
+from _common import best_time, dag_copy, deep_circuit, three_stage_optimization
+from qiskit import transpile
+from qiskit.circuit.library import QuantumVolume
+from qiskit.converters import circuit_to_dag
+
+from iqm.qiskit_iqm.fake_backends import IQMFakeApollo
+from iqm.qiskit_iqm.iqm_transpilation import IQMOptimizeSingleQubitGates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--num-gates', type=int, default=10_000, help='number of gates in the deep circuit')
+    parser.add_argument('--repeats', type=int, default=5, help='number of repetitions of each measurement')
+    parser.add_argument('--seed', type=int, default=1, help='random seed for the circuits and the transpiler')
+    args = parser.parse_args()
+
+    backend = IQMFakeApollo()
+    num_qubits = backend.num_qubits
+    qv = QuantumVolume(num_qubits, seed=args.seed)
+    qv.measure_all()
+    circuits = {
+        'qv': qv,
+        # the three-stage pipeline loses the conditions of classically controlled gates
+        'deep': deep_circuit(
+            num_qubits, list(backend.coupling_map.get_edges()), args.num_gates, args.seed, classically_controlled=False
+        ),
+    }
+
+    print(
+        f'{"circuit":<8} {"ops":>7} {"r in":>7} {"r out":>7} {"three-stage [s]":>16} {"fused [s]":>10} {"speedup":>8}'
+    )
+    for name, circuit in circuits.items():
+        transpiled = transpile(circuit, target=backend.target, optimization_level=0, seed_transpiler=args.seed)
+        dag = circuit_to_dag(transpiled)
+        old = best_time(three_stage_optimization, args.repeats, setup=dag_copy(dag))
+        new = best_time(IQMOptimizeSingleQubitGates().run, args.repeats, setup=dag_copy(dag))
+        new_result = IQMOptimizeSingleQubitGates().run(dag_copy(dag)())
+        assert new_result.count_ops() == three_stage_optimization(dag_copy(dag)()).count_ops()
+        r_in, r_out = dag.count_ops().get('r', 0), new_result.count_ops().get('r', 0)
+        print(f'{name:<8} {dag.size():>7} {r_in:>7} {r_out:>7} {old:>16.4f} {new:>10.4f} {old / new:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# Copyright 2025 Qiskit on IQM developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark building :class:`.IQMTarget` for synthetic star architectures of growing size.
+
+The architectures have a number of computational resonators, each coupled by CZ to an equal share of the qubits, and
+MOVE gates between every qubit and its resonator, so that all the qubits sharing a resonator are connected by fake CZs.
+The target is built with and without the resonators. For comparison, the table also shows the time it takes to
+only find the fake CZs by scanning all the qubits and the CZ loci for each MOVE locus, like the target construction
+used to do.
+
+Usage::
+
+    python benchmarks/bench_target_construction.py [--sizes N [N ...]] [--qubits-per-resonator N] [--repeats N]
+"""
+import argparse
+from functools import partial
+from uuid import UUID
+
+from _common import best_time
+
+from iqm.iqm_client import DynamicQuantumArchitecture, GateImplementationInfo, GateInfo
+from iqm.qiskit_iqm.iqm_backend import IQMTarget
+
+
+def star_architecture(num_qubits: int, qubits_per_resonator: int) -> DynamicQuantumArchitecture:
+    """Star architecture with ``num_qubits`` qubits and a resonator for every ``qubits_per_resonator`` of them."""
+    qubits = [f'QB{i + 1}' for i in range(num_qubits)]
+    resonators = [f'CR{i + 1}' for i in range(-(-num_qubits // qubits_per_resonator))]
+    pairs = tuple((qubit, resonators[i // qubits_per_resonator]) for i, qubit in enumerate(qubits))
+    single_qubit_loci = tuple((qubit,) for qubit in qubits)
+
+    def gate(loci: tuple[tuple[str, ...], ...]) -> GateInfo:
+        return GateInfo(
+            implementations={'default': GateImplementationInfo(loci=loci)},
+            default_implementation='default',
+            override_default_implementation={},
+        )
+
+    return DynamicQuantumArchitecture(
+        calibration_set_id=UUID('26c5e70f-bea0-43af-bd37-6212ec7d04cb'),
+        qubits=qubits,
+        computational_resonators=resonators,
+        gates={
+            'prx': gate(single_qubit_loci),
+            'cc_prx': gate(single_qubit_loci),
+            'cz': gate(pairs),
+            'move': gate(pairs),
+            'measure': gate(single_qubit_loci),
+        },
+    )
+
+
+def scan_fake_czs(architecture: DynamicQuantumArchitecture) -> set[tuple[str, str]]:
+    """Fake CZ loci of the architecture, found by scanning all the qubits and CZ loci for each MOVE locus."""
+    cz_loci = architecture.gates['cz'].loci
+    fake_czs = set()
+    for c1, res in architecture.gates['move'].loci:
+        for c2 in architecture.qubits:
+            if c2 not in [c1, res] and ((c2, res) in cz_loci or (res, c2) in cz_loci):
+                fake_czs.add((c1, c2))
+                fake_czs.add((c2, c1))
+    return fake_czs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[20, 50, 100, 200, 500], help='numbers of qubits in the architectures'
+    )
+    parser.add_argument('--qubits-per-resonator', type=int, default=25, help='number of qubits coupled to a resonator')
+    parser.add_argument('--repeats', type=int, default=3, help='number of repetitions of each measurement')
+    args = parser.parse_args()
+
+    print(f'{"qubits":>7} {"components":>11} {"cz loci":>8} {"target [s]":>11} {"with res. [s]":>14} {"scan [s]":>9}')
+    for size in args.sizes:
+        architecture = star_architecture(size, args.qubits_per_resonator)
+        component_to_idx = {component: idx for idx, component in enumerate(architecture.components)}
+        target = IQMTarget(architecture, component_to_idx, include_resonators=False)
+        simplified = best_time(
+            partial(IQMTarget, architecture, component_to_idx, include_resonators=False), args.repeats
+        )
+        with_resonators = best_time(
+            partial(IQMTarget, architecture, component_to_idx, include_resonators=True), args.repeats
+        )
+        scan = best_time(partial(scan_fake_czs, architecture), args.repeats)
+        print(
+            f'{size:>7} {len(component_to_idx):>11} {len(target["cz"]):>8} '
+            f'{simplified:>11.4f} {with_resonators:>14.4f} {scan:>9.4f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -13,17 +13,43 @@
 # limitations under the License.
 """Qiskit adapter for IQM's quantum computers.
 """
-from iqm.qiskit_iqm.fake_backends import IQMErrorProfile, IQMFakeAdonis, IQMFakeAphrodite, IQMFakeApollo, IQMFakeDeneb
-from iqm.qiskit_iqm.fake_backends.iqm_fake_backend import IQMFakeBackend
+from importlib import import_module
+from typing import Any
+
 from iqm.qiskit_iqm.iqm_circuit import IQMCircuit
 from iqm.qiskit_iqm.iqm_job import IQMJob
 from iqm.qiskit_iqm.iqm_move_layout import generate_initial_layout
 from iqm.qiskit_iqm.iqm_naive_move_pass import IQMNaiveResonatorMoving, transpile_to_IQM
+from iqm.qiskit_iqm.iqm_noise_aware_layout import IQMNoiseAwareLayout, generate_noise_aware_layout
 from iqm.qiskit_iqm.iqm_provider import IQMBackend, IQMProvider, __version__
 from iqm.qiskit_iqm.iqm_transpilation import IQMOptimizeSingleQubitGates, optimize_single_qubit_gates
 from iqm.qiskit_iqm.move_gate import MoveGate
+from iqm.qiskit_iqm.transpilation_cache import TranspilationCache, TranspilationCacheInfo
 from iqm.qiskit_iqm.transpiler_plugins import *
 
+# The fake backends depend on qiskit-aer, which is slow to import, so they are only imported on first access.
+_LAZY_IMPORTS = {
+    'IQMErrorProfile': 'iqm.qiskit_iqm.fake_backends.iqm_fake_backend',
+    'IQMFakeBackend': 'iqm.qiskit_iqm.fake_backends.iqm_fake_backend',
+    'IQMFakeAdonis': 'iqm.qiskit_iqm.fake_backends.fake_adonis',
+    'IQMFakeAphrodite': 'iqm.qiskit_iqm.fake_backends.fake_aphrodite',
+    'IQMFakeApollo': 'iqm.qiskit_iqm.fake_backends.fake_apollo',
+    'IQMFakeDeneb': 'iqm.qiskit_iqm.fake_backends.fake_deneb',
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
 raise RuntimeError(
     "The qiskit-iqm package is obsolete. If you are using IQM Resonance or your qccsw_version>=4.0.0, please use "
     "iqm-client[qiskit] instead, otherwise use qiskit-iqm<18.0."
@@ -93,7 +93,9 @@ class IQMFakeBackend(IQMBackendBase):
 
     A fake backend contains information about a specific IQM system, such as the quantum architecture (number of qubits,
     connectivity), the native gate set, and a noise model based on system parameters such as relaxation (:math:`T_1`)
-    and dephasing (:math:`T_2`) times, gate infidelities, and readout errors.
+    and dephasing (:math:`T_2`) times, gate infidelities, and readout errors. The default transpilation targets of the
+    backend do not carry the gate errors and durations of the error profile, the target returned by
+    :meth:`~.IQMBackendBase.get_noise_aware_target` does.
 
     Args:
         architecture: Quantum architecture associated with the backend instance.
@@ -107,9 +109,9 @@ class IQMFakeBackend(IQMBackendBase):
         name: str = "IQMFakeBackend",
         **kwargs,
     ):
-        super().__init__(architecture, **kwargs)
-
         self._validate_architecture_and_error_profile(architecture, error_profile)
+        super().__init__(architecture, error_profile=error_profile, **kwargs)
+
         self.__architecture, self.__error_profile = architecture, error_profile
 
         self.noise_model = self._create_noise_model(architecture, error_profile)
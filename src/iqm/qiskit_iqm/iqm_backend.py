@@ -16,14 +16,18 @@
 from __future__ import annotations
 
 from abc import ABC
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Sequence
 import itertools
-from typing import Final, Union
+from typing import TYPE_CHECKING, Any, Final, Optional, Union
 from uuid import UUID
 
+from qiskit import user_config
 from qiskit.circuit import Delay, Parameter, Reset
 from qiskit.circuit.library import CZGate, IGate, Measure, RGate
 from qiskit.providers import BackendV2
-from qiskit.transpiler import Target
+from qiskit.transpiler import InstructionProperties, StagedPassManager, Target
+from qiskit.transpiler.preset_passmanagers import generate_preset_pass_manager
 
 from iqm.iqm_client import (
     DynamicQuantumArchitecture,
@@ -33,11 +37,21 @@ from iqm.iqm_client import (
 )
 from iqm.qiskit_iqm.move_gate import MoveGate
 
+if TYPE_CHECKING:
+    from iqm.qiskit_iqm.fake_backends.iqm_fake_backend import IQMErrorProfile
+
 IQM_TO_QISKIT_GATE_NAME: Final[dict[str, str]] = {'prx': 'r', 'cz': 'cz'}
 
 Locus = tuple[str, ...]
 LocusIdx = tuple[int, ...]
 
+PASS_MANAGER_CACHE_SIZE: Final[int] = 32
+"""Maximum number of pass managers memoized by :meth:`IQMBackendBase.get_pass_manager` for each backend."""
+
+RESTRICTED_TARGET_CACHE_SIZE: Final[int] = 64
+"""Maximum number of restricted targets memoized by :meth:`IQMBackendBase.restrict_to_qubits` for each backend, and
+by :meth:`IQMTarget.restrict_to_qubits` for each target."""
+
 
 def _dqa_from_static_architecture(sqa: QuantumArchitectureSpecification) -> DynamicQuantumArchitecture:
     """Create a dynamic quantum architecture from the given static quantum architecture.
@@ -77,16 +91,21 @@ def _dqa_from_static_architecture(sqa: QuantumArchitectureSpecification) -> Dyna
     )
 
 
-class IQMBackendBase(BackendV2, ABC):
+class IQMBackendBase(BackendV2, ABC):  # pylint: disable=too-many-instance-attributes
     """Abstract base class for various IQM-specific backends.
 
     Args:
         architecture: Description of the quantum architecture associated with the backend instance.
+        error_profile: Characteristics of the QPU. If given, :meth:`get_noise_aware_target` carries the estimated
+            errors and durations of the native operations, which makes noise-aware layout possible. The other
+            transpilation targets of the backend do not use it.
     """
 
     def __init__(
         self,
         architecture: Union[QuantumArchitectureSpecification, DynamicQuantumArchitecture],
+        *,
+        error_profile: Optional[IQMErrorProfile] = None,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -102,14 +121,18 @@ class IQMBackendBase(BackendV2, ABC):
         # qubits, or else transpiling with optimization_level=0 will fail because of lacking resonator indices.
         qb_to_idx = {qb: idx for idx, qb in enumerate(arch.qubits + arch.computational_resonators)}
 
+        self._error_profile = error_profile
         self._target = IQMTarget(arch, qb_to_idx, include_resonators=False)
-        self._fake_target_with_moves = (
-            IQMTarget(arch, qb_to_idx, include_resonators=True) if 'move' in arch.gates else None
-        )
+        # The targets below are only needed for MOVE routing and layout, so they are built on first use.
+        # The coupling map is likewise built lazily by BackendV2.coupling_map.
+        self._fake_target_with_moves: Optional[IQMTarget] = None
+        self._real_target: Optional[IQMTarget] = None
+        self._noise_aware_target: Optional[IQMTarget] = None
+        self._pass_managers: OrderedDict[Hashable, StagedPassManager] = OrderedDict()
+        self._restricted_targets = _RestrictedTargets()
         self._qb_to_idx = qb_to_idx
         self._idx_to_qb = {v: k for k, v in qb_to_idx.items()}
         self.name = 'IQMBackend'
-        self._coupling_map = self.target.build_coupling_map()
 
     @property
     def target(self) -> Target:
@@ -117,9 +140,14 @@ class IQMBackendBase(BackendV2, ABC):
 
     @property
     def target_with_resonators(self) -> Target:
-        """Return the target with MOVE gates and resonators included."""
-        if self._fake_target_with_moves is None:
+        """Return the target with MOVE gates and resonators included.
+
+        The target is built on first access and then reused.
+        """
+        if 'move' not in self.architecture.gates:
             return self.target
+        if self._fake_target_with_moves is None:
+            self._fake_target_with_moves = IQMTarget(self.architecture, self._qb_to_idx, include_resonators=True)
         return self._fake_target_with_moves
 
     @property
@@ -132,13 +160,38 @@ class IQMBackendBase(BackendV2, ABC):
         return bool(self.architecture.computational_resonators)
 
     def get_real_target(self) -> Target:
-        """Return the real physical target of the backend without virtual CZ gates."""
-        return IQMTarget(
-            architecture=self.architecture,
-            component_to_idx=self._qb_to_idx,
-            include_resonators=True,
-            include_fake_czs=False,
-        )
+        """Return the real physical target of the backend without virtual CZ gates.
+
+        The target is built on the first call and the same instance is returned afterwards,
+        so it should not be modified by the caller.
+        """
+        if self._real_target is None:
+            self._real_target = IQMTarget(
+                architecture=self.architecture,
+                component_to_idx=self._qb_to_idx,
+                include_resonators=True,
+                include_fake_czs=False,
+            )
+        return self._real_target
+
+    def get_noise_aware_target(self) -> IQMTarget:
+        """Return the transpilation target of the backend with the instruction properties estimated from its error
+        profile.
+
+        Apart from the instruction properties, the target is the same as :attr:`target`. It is used for choosing
+        noise-aware layouts, see :class:`.IQMNoiseAwareLayout`. If the backend has no error profile, all the
+        instruction properties are None.
+
+        The target is built on the first call and the same instance is returned afterwards,
+        so it should not be modified by the caller.
+        """
+        if self._error_profile is None:
+            return self._target
+        if self._noise_aware_target is None:
+            self._noise_aware_target = IQMTarget(
+                self.architecture, self._qb_to_idx, include_resonators=False, error_profile=self._error_profile
+            )
+        return self._noise_aware_target
 
     def qubit_name_to_index(self, name: str) -> int:
         """Given an IQM-style qubit name, return the corresponding index in the register.
@@ -176,11 +229,52 @@ class IQMBackendBase(BackendV2, ABC):
         """Return the plugin that should be used for scheduling the circuits on this backend."""
         return 'iqm_default_scheduling'
 
+    def get_pass_manager(self, optimization_level: Optional[int] = None, **options) -> StagedPassManager:
+        """Return a preset pass manager for transpiling circuits to this backend.
+
+        The pass manager transpiles to :attr:`target`, using the scheduling stage plugin of the backend, like
+        :func:`~qiskit.compiler.transpile` does. Pass managers are memoized by the optimization level and the
+        options, so transpiling many circuits in a loop with the same options builds the pass manager only once:
+
+        .. code-block:: python
+
+            pass_manager = backend.get_pass_manager(optimization_level=1, seed_transpiler=42)
+            transpiled_circuits = [pass_manager.run(circuit) for circuit in circuits]
+
+        The same instance is returned for equal options, so it should not be modified by the caller.
+        Options that cannot be hashed, e.g. a :class:`~qiskit.transpiler.Layout`, disable the memoization.
+
+        Args:
+            optimization_level: Optimization level of the pass manager. By default, the same as in
+                :func:`~qiskit.compiler.transpile`.
+            options: Keyword arguments for :func:`~qiskit.transpiler.generate_preset_pass_manager`, e.g.
+                ``seed_transpiler``, ``initial_layout`` or ``scheduling_method``.
+
+        Returns:
+            the pass manager
+        """
+        if optimization_level is None:
+            optimization_level = user_config.get_config().get('transpile_optimization_level', 1)
+        options = {'target': self.target, 'scheduling_method': self.get_scheduling_stage_plugin()} | options
+        key = _pass_manager_key(optimization_level, options)
+        pass_manager = None if key is None else self._pass_managers.get(key)
+        if pass_manager is not None:
+            self._pass_managers.move_to_end(key)
+            return pass_manager
+        pass_manager = generate_preset_pass_manager(optimization_level, **options)
+        if key is not None:
+            self._pass_managers[key] = pass_manager
+            if len(self._pass_managers) > PASS_MANAGER_CACHE_SIZE:
+                self._pass_managers.popitem(last=False)
+        return pass_manager
+
     def restrict_to_qubits(
         self, qubits: Union[list[int], list[str]], include_resonators: bool = False, include_fake_czs: bool = True
     ) -> IQMTarget:
         """Generated a restricted transpilation target from this backend that only contains the given qubits.
 
+        The restricted targets are memoized by the qubits and the flags, so they must not be modified.
+
         Args:
             qubits: Qubits to restrict the target to. Can be either a list of qubit indices or qubit names.
             include_resonators: Whether to restrict `self.target` or `self.target_with_resonators`.
@@ -189,12 +283,73 @@ class IQMBackendBase(BackendV2, ABC):
         Returns:
             restricted target
         """
-        qubits_str = [self._idx_to_qb[q] if isinstance(q, int) else str(q) for q in qubits]
-        return _restrict_dqa_to_qubits(self.architecture, qubits_str, include_resonators, include_fake_czs)
+        qubits_str = tuple(self._idx_to_qb[q] if isinstance(q, int) else str(q) for q in qubits)
+        return self._restricted_targets.get_or_build(
+            (qubits_str, include_resonators, include_fake_czs),
+            lambda: _restrict_dqa_to_qubits(self.architecture, qubits_str, include_resonators, include_fake_czs),
+        )
+
+
+def _pass_manager_key(optimization_level: int, options: dict[str, Any]) -> Optional[Hashable]:
+    """Memoization key of a preset pass manager, or None if the options cannot be hashed.
+
+    Targets are compared by identity. Otherwise only scalars, and lists, tuples and dicts of them, can be hashed,
+    since other objects, e.g. layouts, may be mutated after the pass manager was built.
+    """
+
+    def freeze(value: Any) -> Hashable:
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, (list, tuple)):
+            return tuple(freeze(item) for item in value)
+        if isinstance(value, dict):
+            return tuple((freeze(item_key), freeze(item)) for item_key, item in value.items())
+        if isinstance(value, Target):
+            # the memoized pass managers refer to their targets, so the identities stay valid
+            return 'target', id(value)
+        raise TypeError(f'Cannot hash {type(value)}')
+
+    try:
+        return optimization_level, tuple((name, freeze(value)) for name, value in sorted(options.items()))
+    except TypeError:
+        return None
+
+
+def _has_smaller_error(properties: Optional[InstructionProperties], other: Optional[InstructionProperties]) -> bool:
+    """True iff the error of ``properties`` is known, and the error of ``other`` is unknown or larger."""
+    if properties is None or properties.error is None:
+        return False
+    return other is None or other.error is None or properties.error < other.error
+
+
+class _RestrictedTargets(OrderedDict):
+    """LRU cache of restricted targets by the restriction, see :meth:`IQMBackendBase.restrict_to_qubits`.
+
+    The cache is not copied or pickled along with its owner, the restricted targets are built again when needed.
+    """
+
+    def __reduce__(self):
+        return self.__class__, ()
+
+    def get_or_build(self, key: Hashable, build: Callable[[], IQMTarget]) -> IQMTarget:
+        """Return the cached target for the restriction, or build and cache it."""
+        target = self.get(key)
+        if target is not None:
+            self.move_to_end(key)
+            return target
+        target = build()
+        self[key] = target
+        if len(self) > RESTRICTED_TARGET_CACHE_SIZE:
+            self.popitem(last=False)
+        return target
 
 
 def _restrict_dqa_to_qubits(
-    architecture: DynamicQuantumArchitecture, qubits: list[str], include_resonators: bool, include_fake_czs: bool = True
+    architecture: DynamicQuantumArchitecture,
+    qubits: Sequence[str],
+    include_resonators: bool,
+    include_fake_czs: bool = True,
+    error_profile: Optional[IQMErrorProfile] = None,
 ) -> IQMTarget:
     """Generated a restricted transpilation target from this backend that only contains the given qubits.
 
@@ -203,15 +358,17 @@ def _restrict_dqa_to_qubits(
         qubits: Qubits to restrict the target to. Can be either a list of qubit indices or qubit names.
         include_resonators: Whether to include MOVE gates in the target.
         include_fake_czs: Whether to include virtual CZs that are not natively supported, but could be routed via MOVE.
+        error_profile: Characteristics of the QPU, used for the instruction properties of the target.
 
     Returns:
         restricted target
     """
+    qubit_set = set(qubits)
     new_gates = {}
     for gate_name, gate_info in architecture.gates.items():
         new_implementations = {}
         for implementation_name, implementation_info in gate_info.implementations.items():
-            new_loci = [locus for locus in implementation_info.loci if all(q in qubits for q in locus)]
+            new_loci = [locus for locus in implementation_info.loci if qubit_set.issuperset(locus)]
             if new_loci:
                 new_implementations[implementation_name] = GateImplementationInfo(loci=new_loci)
         if new_implementations:
@@ -220,13 +377,17 @@ def _restrict_dqa_to_qubits(
                 default_implementation=gate_info.default_implementation,
                 override_default_implementation=gate_info.override_default_implementation,
             )
+    architecture_qubits = set(architecture.qubits)
+    architecture_resonators = set(architecture.computational_resonators)
     new_arch = DynamicQuantumArchitecture(
         calibration_set_id=architecture.calibration_set_id,
-        qubits=[q for q in qubits if q in architecture.qubits],
-        computational_resonators=[q for q in qubits if q in architecture.computational_resonators],
+        qubits=[q for q in qubits if q in architecture_qubits],
+        computational_resonators=[q for q in qubits if q in architecture_resonators],
         gates=new_gates,
     )
-    return IQMTarget(new_arch, {name: idx for idx, name in enumerate(qubits)}, include_resonators, include_fake_czs)
+    return IQMTarget(
+        new_arch, {name: idx for idx, name in enumerate(qubits)}, include_resonators, include_fake_czs, error_profile
+    )
 
 
 class IQMTarget(Target):
@@ -234,11 +395,15 @@ class IQMTarget(Target):
 
     Contains the mapping of physical qubit name on the device to qubit index in the Target.
 
+    If an error profile is given, the instructions of the target carry the errors and durations of the native
+    operations estimated from it, see :meth:`_locus_properties`. Otherwise all the instruction properties are None.
+
     Args:
         architecture: Quantum architecture that defines the target.
         component_to_idx: Mapping from QPU component names to integer indices used by Qiskit to refer to them.
         include_resonators: Whether to include MOVE gates in the target.
         include_fake_czs: Whether to include virtual CZs that are not natively supported, but could be routed via MOVE.
+        error_profile: Characteristics of the QPU, used for the instruction properties.
     """
 
     def __init__(
@@ -247,7 +412,9 @@ class IQMTarget(Target):
         component_to_idx: dict[str, int],
         include_resonators: bool,
         include_fake_czs: bool = True,
+        error_profile: Optional[IQMErrorProfile] = None,
     ):
+        # pylint: disable=too-many-arguments
         super().__init__()
         # Using iqm as a prefix to avoid name clashes with the base class.
         self.iqm_dqa = architecture
@@ -255,8 +422,62 @@ class IQMTarget(Target):
         self.iqm_idx_to_component = {v: k for k, v in component_to_idx.items()}
         self.iqm_includes_resonators = include_resonators
         self.iqm_includes_fake_czs = include_fake_czs
+        self.iqm_error_profile = error_profile
+        self._iqm_restricted_targets = _RestrictedTargets()
         self._add_connections_from_DQA()
 
+    def _locus_properties(self, name: str, locus: Locus) -> Optional[InstructionProperties]:
+        """Estimate the error and duration of the given native operation at the given locus.
+
+        The depolarizing error parameter :math:`p` of an :math:`n`-qubit gate in the error profile corresponds to the
+        average gate infidelity :math:`p (d - 1) / d`, where :math:`d = 2^n`. Thermal relaxation during the gate is not
+        included. The error of a measurement is the readout error averaged over the two states.
+
+        Args:
+            name: name of the IQM native operation
+            locus: names of the QPU components the operation acts on
+
+        Returns:
+            properties of the operation, or None if the target has no error profile
+        """
+        profile = self.iqm_error_profile
+        if profile is None:
+            return None
+        error: Optional[float] = None
+        duration: Optional[float] = None
+        if name == 'measure':
+            readout_error = profile.readout_errors.get(locus[0])
+            if readout_error is not None:
+                error = (readout_error['0'] + readout_error['1']) / 2
+        elif len(locus) == 1:
+            depolarizing = profile.single_qubit_gate_depolarizing_error_parameters.get(name, {})
+            if locus[0] in depolarizing:
+                error = depolarizing[locus[0]] / 2
+            duration = profile.single_qubit_gate_durations.get(name)
+        elif len(locus) == 2:
+            pairs = profile.two_qubit_gate_depolarizing_error_parameters.get(name, {})
+            p = pairs.get((locus[0], locus[1]), pairs.get((locus[1], locus[0])))
+            if p is not None:
+                error = 3 * p / 4
+            duration = profile.two_qubit_gate_durations.get(name)
+        # the error profile uses ns, Qiskit uses s
+        return InstructionProperties(duration=None if duration is None else duration * 1e-9, error=error)
+
+    def _fake_cz_properties(self, qubit: str, other: str, resonator: str) -> Optional[InstructionProperties]:
+        """Estimate the error and duration of a CZ between two qubits, routed by moving the state of ``qubit`` into
+        ``resonator``, applying a CZ between ``other`` and the resonator, and moving the state back."""
+        move = self._locus_properties('move', (qubit, resonator))
+        cz = self._locus_properties('cz', (other, resonator))
+        if move is None or cz is None:
+            return None
+        error = None
+        if move.error is not None and cz.error is not None:
+            error = 1 - (1 - move.error) ** 2 * (1 - cz.error)
+        duration = None
+        if move.duration is not None and cz.duration is not None:
+            duration = 2 * move.duration + cz.duration
+        return InstructionProperties(duration=duration, error=error)
+
     def _add_connections_from_DQA(self):
         """Initializes the Target, making it represent the dynamic quantum architecture :attr:`iqm_dqa`."""
         # pylint: disable=too-many-branches,too-many-nested-blocks
@@ -264,28 +485,28 @@ class IQMTarget(Target):
         architecture = self.iqm_dqa
         component_to_idx = self.iqm_component_to_idx
         op_loci = {gate_name: gate_info.loci for gate_name, gate_info in architecture.gates.items()}
+        qubits = set(architecture.qubits)
 
         def locus_to_idx(locus: Locus) -> LocusIdx:
             """Map the given locus to use component indices instead of component names."""
             return tuple(component_to_idx[component] for component in locus)
 
-        def create_properties(name: str, *, symmetrize: bool = False) -> dict[tuple[int, ...], None]:
+        def create_properties(
+            name: str, *, symmetrize: bool = False
+        ) -> dict[tuple[int, ...], Optional[InstructionProperties]]:
             """Creates the Qiskit instruction properties dictionary for the given IQM native operation.
 
-            Currently we do not provide any actual properties for the operation, hence the all the
-            allowed loci map to None.
+            The allowed loci map to the properties estimated from the error profile, or to None without one.
             """
             if self.iqm_includes_resonators:
                 loci = op_loci[name]
             else:
                 # Remove the loci that correspond to resonators.
-                loci = [
-                    locus for locus in op_loci[name] if all(component in self.iqm_dqa.qubits for component in locus)
-                ]
+                loci = [locus for locus in op_loci[name] if qubits.issuperset(locus)]
             if symmetrize:
                 # symmetrize the loci
                 loci = tuple(permuted_locus for locus in loci for permuted_locus in itertools.permutations(locus))
-            return {locus_to_idx(locus): None for locus in loci}
+            return {locus_to_idx(locus): self._locus_properties(name, locus) for locus in loci}
 
         # like barrier, delay is always available for all single-qubit loci
         self.add_instruction(Delay(0), {locus_to_idx((q,)): None for q in architecture.qubits})
@@ -322,23 +543,35 @@ class IQMTarget(Target):
         if 'cz' in op_loci:
             if self.iqm_includes_fake_czs and 'move' in op_loci:
                 # CZ and MOVE: star
-                cz_connections: dict[LocusIdx, None] = {}
+                cz_connections: dict[LocusIdx, Optional[InstructionProperties]] = {}
                 cz_loci = op_loci['cz']
+                cz_adjacency: dict[str, set[str]] = {}
                 for c1, c2 in cz_loci:
-                    if self.iqm_includes_resonators or all(component in self.iqm_dqa.qubits for component in (c1, c2)):
+                    if self.iqm_includes_resonators or qubits.issuperset((c1, c2)):
                         idx_locus = locus_to_idx((c1, c2))
-                        cz_connections[idx_locus] = None
-
+                        cz_connections[idx_locus] = self._locus_properties('cz', (c1, c2))
+                    cz_adjacency.setdefault(c1, set()).add(c2)
+                    cz_adjacency.setdefault(c2, set()).add(c1)
+                # the qubits coupled to each component by a CZ, in the order of the architecture
+                cz_neighbors: dict[str, list[str]] = {}
+                for qubit in architecture.qubits:
+                    for component in cz_adjacency.get(qubit, ()):
+                        cz_neighbors.setdefault(component, []).append(qubit)
+
+                real_loci = set(cz_connections)
                 for c1, res in op_loci['move']:
-                    for c2 in architecture.qubits:
-                        if c2 not in [c1, res]:
-                            # loop over c2 that is not c1
-                            if (c2, res) in cz_loci or (res, c2) in cz_loci:
-                                # This is a fake CZ and can be bidirectional.
-                                # cz routable via res between qubits, put into fake_cz_conn both ways
-                                idx_locus = locus_to_idx((c1, c2))
-                                cz_connections[idx_locus] = None
-                                cz_connections[idx_locus[::-1]] = None
+                    for c2 in cz_neighbors.get(res, ()):
+                        if c2 not in (c1, res):
+                            # This is a fake CZ and can be bidirectional.
+                            # cz routable via res between qubits, put into fake_cz_conn both ways
+                            idx_locus = locus_to_idx((c1, c2))
+                            properties = self._fake_cz_properties(c1, c2, res)
+                            for locus in (idx_locus, idx_locus[::-1]):
+                                if locus in real_loci:
+                                    continue
+                                # of several possible routes, keep the one with the smallest known error
+                                if locus not in cz_connections or _has_smaller_error(properties, cz_connections[locus]):
+                                    cz_connections[locus] = properties
                 self.add_instruction(CZGate(), cz_connections)
             else:
                 # CZ but no MOVE: crystal
@@ -353,13 +586,22 @@ class IQMTarget(Target):
     def restrict_to_qubits(self, qubits: Union[list[int], list[str]]) -> IQMTarget:
         """Generated a restricted transpilation target from this Target that only contains the given qubits.
 
+        The restricted targets are memoized by the qubits, so they must not be modified.
+
         Args:
             qubits: Qubits to restrict the target to. Can be either a list of qubit indices or qubit names.
 
         Returns:
             restricted target
         """
-        qubits_str = [self.iqm_idx_to_component[q] if isinstance(q, int) else str(q) for q in qubits]
-        return _restrict_dqa_to_qubits(
-            self.iqm_dqa, qubits_str, self.iqm_includes_resonators, self.iqm_includes_fake_czs
+        qubits_str = tuple(self.iqm_idx_to_component[q] if isinstance(q, int) else str(q) for q in qubits)
+        return self._iqm_restricted_targets.get_or_build(
+            qubits_str,
+            lambda: _restrict_dqa_to_qubits(
+                self.iqm_dqa,
+                qubits_str,
+                self.iqm_includes_resonators,
+                self.iqm_includes_fake_czs,
+                self.iqm_error_profile,
+            ),
         )
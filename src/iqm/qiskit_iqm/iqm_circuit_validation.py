@@ -13,29 +13,31 @@
 # limitations under the License.
 """Helper functions for circuit validation."""
 
-from typing import Optional
+from typing import Optional, Union
 
 from qiskit import QuantumCircuit
+from qiskit.dagcircuit import DAGCircuit
 
 from iqm.iqm_client import Circuit as IQMClientCircuit
 from iqm.iqm_client import IQMClient, MoveGateValidationMode
 from iqm.qiskit_iqm.iqm_backend import IQMBackendBase
-from iqm.qiskit_iqm.qiskit_to_iqm import serialize_instructions
+from iqm.qiskit_iqm.qiskit_to_iqm import serialize_dag, serialize_instructions
 
 
 def validate_circuit(
-    circuit: QuantumCircuit,
+    circuit: Union[QuantumCircuit, DAGCircuit],
     backend: IQMBackendBase,
     validate_moves: Optional[MoveGateValidationMode] = None,
     qubit_mapping: Optional[dict[int, str]] = None,
 ):
-    """Validate a circuit against the backend."""
+    """Validate a circuit, or its DAG representation, against the backend."""
     if qubit_mapping is None:
         qubit_mapping = backend._idx_to_qb
-    new_circuit = IQMClientCircuit(
-        name="Validation circuit",
-        instructions=serialize_instructions(circuit=circuit, qubit_index_to_name=qubit_mapping),
-    )
+    if isinstance(circuit, DAGCircuit):
+        instructions = serialize_dag(circuit, qubit_index_to_name=qubit_mapping)
+    else:
+        instructions = serialize_instructions(circuit=circuit, qubit_index_to_name=qubit_mapping)
+    new_circuit = IQMClientCircuit(name="Validation circuit", instructions=instructions)
     if validate_moves is None:
         validate_moves = MoveGateValidationMode.STRICT
     IQMClient._validate_circuit_instructions(
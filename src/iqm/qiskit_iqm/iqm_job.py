@@ -17,7 +17,7 @@ from __future__ import annotations
 
 from collections import Counter
 from datetime import date
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Any, Final, Optional, Union
 import uuid
 import warnings
 
@@ -40,6 +40,12 @@ from iqm.qiskit_iqm.qiskit_to_iqm import MeasurementKey
 if TYPE_CHECKING:
     from iqm.qiskit_iqm.iqm_provider import IQMBackend
 
+DUPLICATE_CIRCUITS_METADATA_KEY: Final[str] = 'qiskit_iqm_duplicates'
+"""Key of the circuit metadata item that describes the identical circuits a submitted circuit stands for.
+
+See ``deduplicate_circuits`` in :meth:`.IQMBackend.create_run_request`.
+"""
+
 
 class IQMJob(JobV1):
     """Implementation of Qiskit's job interface to handle circuit execution on an IQM server.
@@ -102,7 +108,8 @@ class IQMJob(JobV1):
         formatted_results: dict[int, np.ndarray] = {}
         for k, v in measurement_results.items():
             # measurement keys encode data about the classical registers in the original Qiskit circuit
-            mk = MeasurementKey.from_string(k)
+            mks = MeasurementKey.split(k)
+            mk = mks[0]
             res = np.array(v, dtype=int)
             shots = len(res)
             if shots == 0 and not expect_exact_shots:
@@ -110,20 +117,23 @@ class IQMJob(JobV1):
                     'Received measurement results containing zero shots. '
                     'In case you are using non-default heralding mode, this could be because of bad calibration.'
                 )
-                res = np.array([])
+                res = np.zeros((0, len(mks)), dtype=int)
             else:
                 # in Qiskit each measurement is a separate single-qubit instruction. qiskit-iqm assigns unique
-                # measurement key to each such instruction, so only one column is expected per measurement key.
-                if res.shape[1] != 1:
-                    raise ValueError(f'Measurement result {mk} has the wrong shape {res.shape}, expected (*, 1)')
-                res = res[:, 0]
+                # measurement key to each such instruction, so only one column is expected per measurement key,
+                # unless the measurements were grouped, in which case the key has one clbit per column.
+                if res.shape[1] != len(mks):
+                    raise ValueError(
+                        f'Measurement result {k} has the wrong shape {res.shape}, expected (*, {len(mks)})'
+                    )
 
             if expect_exact_shots and shots != requested_shots:
-                raise ValueError(f'Expected {requested_shots} shots but got {shots} for measurement result {mk}')
+                raise ValueError(f'Expected {requested_shots} shots but got {shots} for measurement result {k}')
 
             # group the measurements into cregs, fill in zeros for unused bits
             creg = formatted_results.setdefault(mk.creg_idx, np.zeros((shots, mk.creg_len), dtype=int))
-            creg[:, mk.clbit_idx] = res
+            for column, column_mk in enumerate(mks):
+                creg[:, column_mk.clbit_idx] = res[:, column]
 
         # TODO If the original circuit has a creg that is not used at all we won't know about it here,
         # and thus cannot include it (containing only zeros) in the result strings.
@@ -136,6 +146,47 @@ class IQMJob(JobV1):
             for s in range(shots)
         ]
 
+    @staticmethod
+    def _fan_out_duplicates(
+        results: list[tuple[str, list[str]]], circuit_metadata: list[Any]
+    ) -> tuple[list[tuple[str, list[str]]], list[Any]]:
+        """Give the results of deduplicated circuits to all the identical circuits in the original batch.
+
+        Args:
+            results: (circuit_name, measurements) tuples for the submitted circuits
+            circuit_metadata: metadata of the submitted circuits
+        Returns:
+            (circuit_name, measurements) tuples and the metadata for the circuits of the original batch, in the
+            original order
+        """
+        if not any(isinstance(md, dict) and DUPLICATE_CIRCUITS_METADATA_KEY in md for md in circuit_metadata):
+            return results, circuit_metadata
+
+        # maps the index of a circuit in the original batch to its name, measurements and metadata
+        copies: dict[int, tuple[str, list[str], Any]] = {}
+        # circuits without duplicates, in the original order
+        singles: list[tuple[str, list[str], Any]] = []
+        for (name, measurements), metadata in zip(results, circuit_metadata):
+            duplicates = metadata.get(DUPLICATE_CIRCUITS_METADATA_KEY) if isinstance(metadata, dict) else None
+            if duplicates is None:
+                singles.append((name, measurements, metadata))
+                continue
+            originals = duplicates['circuits']
+            n_copies = len(originals)
+            shots = len(measurements)
+            for j, (idx, original_name, original_metadata) in enumerate(originals):
+                if duplicates['split_shots']:
+                    # each copy gets its own consecutive share of the shots
+                    copy_measurements = measurements[shots * j // n_copies : shots * (j + 1) // n_copies]
+                else:
+                    copy_measurements = measurements
+                copies[idx] = (original_name, copy_measurements, original_metadata)
+
+        # the circuits without duplicates fill the remaining positions, in order
+        remaining = iter(singles)
+        fanned_out = [copies[i] if i in copies else next(remaining) for i in range(len(copies) + len(singles))]
+        return [(name, measurements) for name, measurements, _ in fanned_out], [md for _, _, md in fanned_out]
+
     def submit(self):
         raise NotImplementedError(
             'You should never have to submit jobs by calling this method. When running circuits through '
@@ -170,6 +221,8 @@ class IQMJob(JobV1):
             # RunResult.metadata.request.circuits[n].metadata
             if self.circuit_metadata is None and results.metadata.request is not None:
                 self.circuit_metadata = [c.metadata for c in results.metadata.circuits]
+            if self.circuit_metadata is not None:
+                self._result, self.circuit_metadata = self._fan_out_duplicates(self._result, self.circuit_metadata)
 
         result_dict = {
             'backend_name': None,
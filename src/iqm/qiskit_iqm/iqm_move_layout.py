@@ -13,6 +13,7 @@
 # limitations under the License.
 """Generate an initial layout for a quantum circuit that is
 valid on the quantum architecture specification of the given backend."""
+import itertools
 from typing import Optional, Union
 
 from qiskit import QuantumCircuit
@@ -22,7 +23,10 @@ from qiskit.transpiler import PassManager, TranspilerError
 from qiskit.transpiler.layout import Layout
 from qiskit.transpiler.passes import TrivialLayout
 
-from iqm.qiskit_iqm.iqm_backend import IQMBackendBase
+from iqm.qiskit_iqm.iqm_backend import IQMBackendBase, IQMTarget
+
+Requirement = tuple[str, Optional[int]]
+"""Operation a logical qubit must have available, and the logical resonator it must be available with, if any."""
 
 
 class IQMMoveLayout(TrivialLayout):
@@ -36,10 +40,16 @@ class IQMMoveLayout(TrivialLayout):
     This class is required because Qiskit's basic layout algorithm assumes all connections between
     two qubits have the same two-qubit gates available, which isn't true in general.
 
+    The logical resonators are mapped to the physical computational resonators first. Given that, each logical qubit
+    can be mapped to the physical qubits that have all the operations the circuit applies on it available, with the
+    required resonators. The logical qubits are then assigned distinct physical qubits by finding a maximum
+    bipartite matching between them, so a layout is found whenever one exists. The assignments of the logical
+    resonators are tried in turn until one of them admits a layout.
+
     .. note::
 
-       This version of the layout generator only works reliably with a single resonator,
-       and can only handle pure Star architecture circuits.
+       This version of the layout generator can only handle pure Star architecture circuits, i.e. all the two-qubit
+       gates in the circuit must act on a (qubit, resonator) locus.
        It also assumes that a valid layout exists for the circuit that does not require SWAPs, which
        isn't true in general.
     """
@@ -53,54 +63,59 @@ class IQMMoveLayout(TrivialLayout):
         Raises:
             TranspilerError: A valid layout could not be found.
         """
+        # pylint: disable=too-many-branches
         target = self.target
+        component_to_idx = target.iqm_component_to_idx
 
         # NOTE assumes we use the real Star architecture here
         reqs, resonators = self._calculate_requirements(dag)
-        if len(resonators) > 1:
+        physical_resonators = [component_to_idx[r] for r in target.iqm_dqa.computational_resonators]
+        if len(resonators) > len(physical_resonators):
             raise TranspilerError(
-                'Circuit requires more than one computational resonator, IQMMoveLayout cannot yet handle this.'
+                f'Circuit requires {len(resonators)} computational resonators, '
+                f'but the architecture only has {len(physical_resonators)}.'
             )
 
-        # map unused physical components to the gates they support
-        free_qubits: dict[int, set[str]] = {}
+        # physical qubits that have each single-qubit operation available,
+        # and physical qubits that have each qubit-resonator gate available with each physical resonator
+        available: dict[Union[str, tuple[str, int]], set[int]] = {}
+        # physical qubits mapped to the operations they support
+        qubit_ops: dict[int, set[str]] = {component_to_idx[q]: set() for q in target.iqm_dqa.qubits}
         for op in ['move', 'cz', 'measure', 'r']:
             for locus in target.qargs_for_operation_name(op):
-                # For arity-2 gates, we only care about the first locus component,
-                # because in the Star architecture the second one is a resonator.
-                free_qubits.setdefault(locus[0], set()).add(op)
-
-        # Add reqs for unused logical components in the circuit (they require nothing) so they too end up in the layout.
-        # They are assigned physical components only after all the used components have been assigned theirs, hence
-        # they will not affect the satisfiability.
-        for log_idx in range(len(dag.qubits)):
-            if log_idx not in resonators:
-                reqs.setdefault(log_idx, set())
+                if locus[0] not in qubit_ops:
+                    continue
+                qubit_ops[locus[0]].add(op)
+                # For arity-2 gates, the second locus component is a resonator in the Star architecture.
+                available.setdefault(op if len(locus) == 1 else (op, locus[1]), set()).add(locus[0])
+        # physical qubits in the order of preference, the ones with the fewest unneeded ops first
+        preference = sorted(qubit_ops, key=lambda phys_idx: len(qubit_ops[phys_idx]))
+
+        logical_resonators = sorted(resonators)
+        errors: list[str] = []
+        for physical_assignment in itertools.permutations(physical_resonators, len(logical_resonators)):
+            resonator_map = dict(zip(logical_resonators, physical_assignment))
+            qubit_map = self._match_qubits(reqs, resonator_map, available, preference, errors)
+            if qubit_map is not None:
+                break
+        else:
+            raise TranspilerError(errors[0])
 
         # mapping from physical component index to logical qubit
-        layout: dict[int, Qubit] = {}
-        # add the resonators to the layout
-        # TODO if we require more than one resonator, the order in which we map them to physical resonators matters
-        for log_idx, res_name in zip(resonators, target.iqm_dqa.computational_resonators):
-            phys_idx = target.iqm_component_to_idx[res_name]
-            layout = {phys_idx: dag.qubits[log_idx]}
-
-        # add qubits to the layout
-        for log_idx, req_ops in reqs.items():
-            # which physical qubits have the required ops available?
-            mapping_options = [(phys_idx, len(av_ops)) for phys_idx, av_ops in free_qubits.items() if req_ops <= av_ops]
-            # pick the one that has the fewest unneeded ops
-            # TODO this heuristic does not always find a possible layout! If there are two options, each with a
-            # different unnecessary gate, we pick one essentially at random, which may mean that later we cannot
-            # satisfy another logical component because we picked the wrong option.
-            if not mapping_options:
-                raise TranspilerError(
-                    f'Cannot find a physical qubit to map logical qubit {log_idx} to, '
-                    f'requires {req_ops}, available: {free_qubits}.'
-                )
-            phys_idx, _ = min(mapping_options, key=lambda x: x[1])
-            layout[phys_idx] = dag.qubits[log_idx]
-            del free_qubits[phys_idx]  # phys_idx is now taken
+        layout: dict[int, Qubit] = {phys_idx: dag.qubits[log_idx] for log_idx, phys_idx in resonator_map.items()}
+        layout.update((phys_idx, dag.qubits[log_idx]) for log_idx, phys_idx in qubit_map.items())
+
+        # Unused logical components in the circuit (they require nothing) are assigned the remaining physical qubits,
+        # so they too end up in the layout.
+        free_qubits = (phys_idx for phys_idx in preference if phys_idx not in layout)
+        for log_idx, qubit in enumerate(dag.qubits):
+            if log_idx not in reqs and log_idx not in resonators:
+                phys_idx = next(free_qubits, None)
+                if phys_idx is None:
+                    raise TranspilerError(
+                        f'Cannot find a physical qubit to map logical qubit {log_idx} to, all of them are in use.'
+                    )
+                layout[phys_idx] = qubit
 
         self.property_set['layout'] = Layout(layout)
 
@@ -112,8 +127,84 @@ class IQMMoveLayout(TrivialLayout):
         """
         return self.property_set['layout']
 
+    def _match_qubits(
+        self,
+        reqs: dict[int, set[Requirement]],
+        resonator_map: dict[int, int],
+        available: dict[Union[str, tuple[str, int]], set[int]],
+        preference: list[int],
+        errors: list[str],
+    ) -> Optional[dict[int, int]]:
+        """Map the used logical qubits to distinct physical qubits that satisfy their requirements.
+
+        Finds a maximum bipartite matching between the logical and physical qubits using augmenting paths. Free
+        physical qubits are preferred over reassigning the already mapped logical qubits, and otherwise the
+        physical qubits are tried in the order of ``preference``.
+
+        Args:
+            reqs: Mapping of the used logical qubit indices to their requirements.
+            resonator_map: Mapping of the logical resonator indices to physical resonator indices.
+            available: Physical qubits that have each operation available, see :meth:`run`.
+            preference: Physical qubits in the order of preference.
+            errors: The reason is appended here if no mapping is found.
+
+        Returns:
+            Mapping of the logical qubit indices to physical qubit indices, or None if no mapping exists.
+        """
+        # pylint: disable=too-many-arguments
+        idx_to_component = self.target.iqm_idx_to_component
+        candidates: dict[int, list[int]] = {}
+        for log_idx, req in reqs.items():
+            allowed = set(preference)
+            for op, log_res in req:
+                allowed &= available.get(op if log_res is None else (op, resonator_map[log_res]), set())
+            if not allowed:
+                errors.append(
+                    f'Cannot find a physical qubit to map logical qubit {log_idx} to, '
+                    f'requires {self._format_requirements(req, resonator_map)}, which no physical qubit has.'
+                )
+                return None
+            candidates[log_idx] = [phys_idx for phys_idx in preference if phys_idx in allowed]
+
+        phys_to_log: dict[int, int] = {}
+
+        def augment(log_idx: int, visited: set[int]) -> bool:
+            """Try to find an augmenting path starting from the given logical qubit."""
+            for phys_idx in candidates[log_idx]:
+                if phys_idx not in visited:
+                    visited.add(phys_idx)
+                    other = phys_to_log.get(phys_idx)
+                    if other is None or augment(other, visited):
+                        phys_to_log[phys_idx] = log_idx
+                        return True
+            return False
+
+        for log_idx, options in candidates.items():
+            free = next((phys_idx for phys_idx in options if phys_idx not in phys_to_log), None)
+            if free is not None:
+                phys_to_log[free] = log_idx
+            elif not augment(log_idx, set()):
+                taken = ', '.join(idx_to_component[phys_idx] for phys_idx in options)
+                errors.append(
+                    f'Cannot find a physical qubit to map logical qubit {log_idx} to, '
+                    f'requires {self._format_requirements(reqs[log_idx], resonator_map)}, '
+                    f'and all the physical qubits that have them ({taken}) are needed by other logical qubits.'
+                )
+                return None
+        return {log_idx: phys_idx for phys_idx, log_idx in phys_to_log.items()}
+
+    def _format_requirements(self, req: set[Requirement], resonator_map: dict[int, int]) -> str:
+        """Human-readable list of requirements, with the physical resonators."""
+        idx_to_component = self.target.iqm_idx_to_component
+        return ', '.join(
+            sorted(
+                op if log_res is None else f'{op} with {idx_to_component[resonator_map[log_res]]}'
+                for op, log_res in req
+            )
+        )
+
     @staticmethod
-    def _calculate_requirements(dag: DAGCircuit) -> tuple[dict[int, set[str]], set[int]]:
+    def _calculate_requirements(dag: DAGCircuit) -> tuple[dict[int, set[Requirement]], set[int]]:
         """Determine the requirements for each used logical qubit in the circuit.
 
         Because in the Star architecture two-qubit gates have (qubit, resonator) loci, based on them
@@ -125,14 +216,14 @@ class IQMMoveLayout(TrivialLayout):
             dag: circuit to check
 
         Returns:
-            Mapping of the logical qubit indices to the required gates for that qubit,
-            logical qubit indices that must be resonators.
+            Mapping of the logical qubit indices to the required operations for that qubit, with the logical
+            resonators the two-qubit gates must be available with, logical qubit indices that must be resonators.
         """
-        reqs: dict[int, set[str]] = {}
+        reqs: dict[int, set[Requirement]] = {}
         resonators: set[int] = set()
         qubit_to_idx: dict[Qubit, int] = {qubit: log_idx for log_idx, qubit in enumerate(dag.qubits)}
 
-        def _require_qubit_type(qubit: Qubit, required_type: str):
+        def _require_qubit_type(qubit: Qubit, required_type: str, resonator: Optional[int] = None):
             """Add a requirement for the given qubit."""
             log_idx = qubit_to_idx[qubit]
             if log_idx in resonators:
@@ -140,7 +231,7 @@ class IQMMoveLayout(TrivialLayout):
                     f"Virtual/logical qubit {qubit} for the '{node.name}' operation must be a qubit, "
                     f'but it is already required to be a resonator.'
                 )
-            reqs.setdefault(log_idx, set()).add(required_type)
+            reqs.setdefault(log_idx, set()).add((required_type, resonator))
 
         for node in dag.topological_op_nodes():
             if node.name in ('barrier',):
@@ -148,14 +239,14 @@ class IQMMoveLayout(TrivialLayout):
             if node.name in ('move', 'cz'):
                 # In the real Star architecture, all arity-2 ops act on a (qubit, resonator) locus.
                 qubit, resonator = node.qargs
-                _require_qubit_type(qubit, node.name)
                 # resonator
                 log_idx = qubit_to_idx[resonator]
                 if log_idx in reqs:
                     raise TranspilerError(
                         f"Virtual/logical qubit {resonator} for the '{node.name}' operation must be a resonator, "
-                        f'but it is already required to be a qubit({reqs[log_idx]}).'
+                        f'but it is already required to be a qubit.'
                     )
+                _require_qubit_type(qubit, node.name, log_idx)
                 resonators.add(log_idx)
             elif node.name == 'measure':
                 _require_qubit_type(node.qargs[0], 'measure')
@@ -185,7 +276,14 @@ def generate_initial_layout(
     target = backend.get_real_target()
     if restrict_to_qubits is not None:
         target = target.restrict_to_qubits(restrict_to_qubits)
+    return _generate_layout(target, circuit)
+
 
+def _generate_layout(target: IQMTarget, circuit: QuantumCircuit) -> Layout:
+    """Generate an initial layout for the given circuit on the given real target, see :func:`generate_initial_layout`.
+
+    Batches of circuits use the same target for all the circuits.
+    """
     layout_gen = IQMMoveLayout(target)
     pm = PassManager(layout_gen)
     pm.run(circuit)
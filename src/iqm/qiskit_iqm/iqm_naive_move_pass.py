@@ -12,32 +12,53 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Naive transpilation for the IQM Star architecture."""
-from typing import Optional, Union
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import math
+import os
+from typing import Optional, Union, overload
 import warnings
 
-import numpy as np
-from pydantic_core import ValidationError
-from qiskit import QuantumCircuit, transpile
-from qiskit.circuit.library import RGate
-from qiskit.converters import circuit_to_dag, dag_to_circuit
-from qiskit.dagcircuit import DAGCircuit
+from qiskit import QuantumCircuit, QuantumRegister, user_config
+from qiskit.circuit.parameterexpression import ParameterValueType
+from qiskit.dagcircuit import DAGCircuit, DAGOpNode
 from qiskit.transpiler.basepasses import TransformationPass
 from qiskit.transpiler.layout import Layout
+from qiskit.transpiler.passmanager import StagedPassManager
+from qiskit.transpiler.preset_passmanagers import generate_preset_pass_manager
 
-from iqm.iqm_client import Circuit as IQMClientCircuit
-from iqm.iqm_client.transpile import ExistingMoveHandlingOptions, transpile_insert_moves
+from iqm.iqm_client import CircuitTranspilationError, DynamicQuantumArchitecture
+from iqm.iqm_client.transpile import ExistingMoveHandlingOptions
 
 from .iqm_backend import IQMBackendBase, IQMTarget
-from .iqm_move_layout import generate_initial_layout
-from .qiskit_to_iqm import deserialize_instructions, serialize_instructions
+from .iqm_move_layout import _generate_layout
+from .iqm_noise_aware_layout import generate_noise_aware_layout
+from .move_gate import MoveGate
+from .transpilation_cache import TranspilationCache
+
+Locus = tuple[str, ...]
+"""Names of the QPU components an operation acts on."""
+Resolution = tuple[str, str, str]
+"""Gate qubit, move qubit and resonator used to implement a fictional qubit-qubit gate."""
+
+_NATIVE_OPERATION_NAMES = {"r": "prx", "x": "prx", "rx": "prx", "y": "prx", "ry": "prx"}
+"""Names of the native IQM operations the Qiskit operations are serialized into, if the names differ."""
+_UNCALIBRATED_OPERATIONS = frozenset(("barrier", "delay", "reset"))
+"""Native operations that can be applied on any locus."""
+_SYMMETRIC_GATES = frozenset(("cz",))
+"""Native gates whose loci can be given in any order."""
 
 
 class IQMNaiveResonatorMoving(TransformationPass):
     """Naive transpilation pass for resonator moving.
 
-    The logic of this pass is deferred to `iqm-client.transpile_insert_moves`.
-    This pass is a wrapper that converts the circuit into the IQMClient Circuit format,
-    runs the `transpile_insert_moves` function, and then converts the result back to a Qiskit circuit.
+    Inserts the MOVE gates needed to implement the two-qubit gates of a circuit transpiled to the simplified
+    architecture (where the resonators are abstracted away) on the real Star architecture, following the rules of
+    :func:`iqm.iqm_client.transpile.transpile_insert_moves`. The routing is done directly on the nodes of the DAG,
+    using the loci of the target architecture, without converting the circuit into the IQM client format and back.
+    The operations of the circuit are kept as they are, so gates with unbound parameters can be routed, and the
+    parameters bound afterwards.
 
     Args:
         target: Transpilation target.
@@ -55,6 +76,7 @@ class IQMNaiveResonatorMoving(TransformationPass):
         self.idx_to_component = target.iqm_idx_to_component
         self.component_to_idx = target.iqm_component_to_idx
         self.existing_moves_handling = existing_moves_handling
+        self._router = _MoveRouter(self.architecture)
 
     def run(self, dag: DAGCircuit) -> DAGCircuit:
         """Run the pass on a circuit.
@@ -69,21 +91,7 @@ class IQMNaiveResonatorMoving(TransformationPass):
             TranspilerError: The layout is not compatible with the DAG, or if the input gate set is incorrect.
         """
         # pylint: disable=too-many-branches
-
-        # TODO: Temporary hack to get the symbolic parameters to work: replace symbols with (inf, idx).
-        # Replace symbolic parameters with indices and store the index to symbol mapping.
-        symbolic_gates = {}
-        symbolic_index = 0
-        for node in dag.topological_op_nodes():
-            # This only works for prx gates because that has two parameters
-            # We use one to mark that it is a symbolic gate (np.inf) and the other to store the index.
-            if node.name == "r" and not all(isinstance(param, (float, int)) for param in node.op.params):
-                symbolic_gates[symbolic_index] = node.op.params
-                dag.substitute_node(node, RGate(np.inf, float(symbolic_index)))
-                symbolic_index += 1
-
-        circuit = dag_to_circuit(dag)
-        if len(circuit) == 0:
+        if dag.size() == 0:
             return dag  # Empty circuit, no need to transpile.
         # For some reason, the dag does not contain the layout, so we need to do a bunch of fixing.
         if self.property_set.get("layout"):
@@ -91,48 +99,48 @@ class IQMNaiveResonatorMoving(TransformationPass):
         else:
             # Reconstruct the layout from the dag.
             layout = Layout()
-            for qreg in dag.qregs:
+            for qreg in dag.qregs.values():
                 layout.add_register(qreg)
             for i, qubit in enumerate(dag.qubits):
                 layout.add(qubit, i)
 
-        # Convert the circuit to the IQMClientCircuit format and run the transpiler.
-        iqm_circuit = IQMClientCircuit(
-            name="Transpiling Circuit",
-            instructions=tuple(serialize_instructions(circuit, self.idx_to_component)),
-        )
-        try:
-            routed_iqm_circuit = transpile_insert_moves(
-                iqm_circuit, self.architecture, existing_moves=self.existing_moves_handling
-            )
-            routed_circuit = deserialize_instructions(
-                list(routed_iqm_circuit.instructions), self.component_to_idx, layout
-            )
-        except ValidationError as e:  # The Circuit without move gates is empty.
-            errors = e.errors()
-            if (
-                len(errors) == 1
-                and errors[0]["msg"] == "Value error, Each circuit should have at least one instruction."
-            ):
-                circ_args = [circuit.num_ancillas, circuit.num_clbits]
-                routed_circuit = QuantumCircuit(*layout.get_registers(), *(arg for arg in circ_args if arg > 0))
-            else:
-                raise e
+        nodes, operations = _native_operations(dag, self.idx_to_component)
+        routed = self._router.route(operations, self.existing_moves_handling)
 
-        # Create the new DAG and make sure that the qubits are properly ordered.
-        ordered_qubits = [layout.get_physical_bits()[i] for i in range(len(layout.get_physical_bits()))]
-        new_dag = circuit_to_dag(routed_circuit, qubit_order=ordered_qubits, clbit_order=routed_circuit.clbits)
+        # The resonators are added to the layout if the DAG does not contain them yet.
+        n_qubits = len(layout.get_physical_bits())
+        n_resonators = len(self.component_to_idx) - n_qubits
+        if n_resonators > 0:
+            resonator_reg = QuantumRegister(n_resonators, "resonators")
+            layout.add_register(resonator_reg)
+            for idx in range(n_resonators):
+                layout.add(resonator_reg[idx], idx + n_qubits)
 
-        # Reinsert the symbolic parameters.
-        for node in new_dag.topological_op_nodes():
-            # This only works for prx gates because that has two parameters
-            # We use one to mark that it is a symbolic gate (np.inf) and the other to store the index.
-            if node.name == "r" and not np.isfinite(node.op.params[0]):
-                new_dag.substitute_node(node, RGate(*symbolic_gates[int(node.op.params[1])]))
+        # Create the new DAG and make sure that the qubits are properly ordered.
+        inv_layout = layout.get_physical_bits()
+        ordered_qubits = [inv_layout[i] for i in range(len(inv_layout))]
+        new_dag = DAGCircuit()
+        new_dag.name = dag.name
+        new_dag.metadata = dag.metadata
+        new_dag.global_phase = dag.global_phase
+        new_dag.add_qubits(ordered_qubits)
+        for qreg in layout.get_registers():
+            new_dag.add_qreg(qreg)
+        new_dag.add_clbits(dag.clbits)
+        for creg in dag.cregs.values():
+            new_dag.add_creg(creg)
+        component_to_qubit = {component: ordered_qubits[idx] for component, idx in self.component_to_idx.items()}
+        move = MoveGate()
+        for idx, locus in routed:
+            qargs = tuple(component_to_qubit[component] for component in locus)
+            if idx < 0:
+                new_dag.apply_operation_back(move, qargs, (), check=False)
+            else:
+                node = nodes[idx]
+                new_dag.apply_operation_back(node.op, qargs, node.cargs, check=False)
 
         # Update the final_layout with the correct bits.
         if "final_layout" in self.property_set:
-            inv_layout = layout.get_physical_bits()
             new_final_layout_dict = {
                 physical: inv_layout[dag.find_bit(virtual).index]
                 for physical, virtual in self.property_set["final_layout"].get_physical_bits().items()
@@ -150,6 +158,375 @@ class IQMNaiveResonatorMoving(TransformationPass):
         return new_dag
 
 
+def _native_operations(
+    dag: DAGCircuit, idx_to_component: dict[int, str]
+) -> tuple[list[DAGOpNode], list[tuple[str, Locus]]]:
+    """Operation nodes of the DAG in topological order, with the names and the loci of the corresponding native
+    IQM operations.
+
+    Identity gates are dropped, like in serialization.
+    """
+    qubit_to_component = {qubit: idx_to_component[idx] for idx, qubit in enumerate(dag.qubits)}
+    nodes: list[DAGOpNode] = []
+    operations: list[tuple[str, Locus]] = []
+    for node in dag.topological_op_nodes():
+        name = node.op.name
+        if name == "id":
+            continue
+        name = _NATIVE_OPERATION_NAMES.get(name, name)
+        if name == "prx" and node.op.condition is not None:
+            name = "cc_prx"
+        nodes.append(node)
+        operations.append((name, tuple(qubit_to_component[qubit] for qubit in node.qargs)))
+    return nodes, operations
+
+
+class _MoveRouter:  # pylint: disable=too-many-instance-attributes
+    """Inserts MOVE gates into a sequence of operations acting on the QPU components of a Star architecture.
+
+    Follows the same rules as :func:`iqm.iqm_client.transpile.transpile_insert_moves`, and thus gives the
+    same routing, but works directly on the operation names and loci of the DAG nodes instead of IQM client
+    circuits. The allowed loci of each gate are collected into sets once, so checking whether an operation can be
+    applied as is on its locus is a set lookup.
+
+    Fictional qubit-qubit gates G(a, b) are implemented as G(g, r) for a resonator r, where the state of the
+    move qubit m (the other one of a and b) has been MOVEd into r. The resolution (g, m, r) is chosen using
+    the state of the resonators, and the next operations on a and b.
+
+    Args:
+        architecture: Real Star architecture the operations are routed to.
+    """
+
+    move_gate = "move"
+    """Name of the MOVE gate in the architecture."""
+
+    def __init__(self, architecture: DynamicQuantumArchitecture):
+        resonators = set(architecture.computational_resonators)
+        # maps qubit-resonator gate name to a mapping from qubit to resonators with which it has the gate available
+        qr_gates: dict[str, dict[str, set[str]]] = {}
+        for gate_name in (self.move_gate, "cz"):
+            if (gate_info := architecture.gates.get(gate_name)) is not None:
+                qr_loci: dict[str, set[str]] = {}
+                for q, r in gate_info.loci:
+                    if q in resonators or (gate_name == self.move_gate and r not in resonators):
+                        raise ValueError(f"Gate {gate_name} locus {q, r} is not of the form (qubit, resonator)")
+                    qr_loci.setdefault(q, set()).add(r)
+                qr_gates[gate_name] = qr_loci
+
+        self.move_q2r = qr_gates.pop(self.move_gate, {})
+        """Mapping from qubit to resonators it can be MOVEd into."""
+        self.move_r2q: dict[str, set[str]] = {}
+        """Mapping from resonator to qubits whose state can be MOVEd into it."""
+        for q, rs in self.move_q2r.items():
+            for r in rs:
+                self.move_r2q.setdefault(r, set()).add(q)
+        self.qr_gates_q2r = qr_gates
+        """Mapping from QR gate name to mapping from qubit to resonators with which it has the gate available."""
+        self.has_moves = self.move_gate in architecture.gates
+        """True iff the architecture supports MOVE gates."""
+        self.qubits = frozenset(architecture.qubits)
+        self.computational_resonators = frozenset(architecture.computational_resonators)
+        self.resonators = tuple(self.move_r2q)
+        """Computational resonators that are being tracked."""
+
+        # allowed loci of the calibrated operations
+        self.loci: dict[str, frozenset[Locus]] = {}
+        for gate_name, gate_info in architecture.gates.items():
+            loci = gate_info.loci
+            if gate_name in _SYMMETRIC_GATES:
+                loci = tuple(permuted for locus in loci for permuted in itertools.permutations(locus))
+            self.loci[gate_name] = frozenset(loci)
+        # measurements can be applied on any combination of the measurable components
+        self.measurable = frozenset(c for locus in self.loci.get("measure", ()) for c in locus)
+
+        self.res_state_owner: dict[str, str] = {}
+        """Maps resonator to the QPU component whose state it currently holds."""
+
+    def is_native(self, name: str, locus: Locus) -> bool:
+        """True iff the operation can be applied on the locus as is."""
+        if name in _UNCALIBRATED_OPERATIONS:
+            return True
+        if name == "measure":
+            return "measure" in self.loci and all(c in self.measurable for c in locus)
+        loci = self.loci.get(name)
+        return loci is not None and locus in loci
+
+    def route(
+        self,
+        operations: list[tuple[str, Locus]],
+        existing_moves: ExistingMoveHandlingOptions = ExistingMoveHandlingOptions.KEEP,
+    ) -> list[tuple[int, Locus]]:
+        """Insert the MOVE gates needed to apply the given operations, and close all MOVE sandwiches at the end.
+
+        Args:
+            operations: Names of the native operations and their loci, in execution order.
+            existing_moves: Specifies how to deal with the MOVE operations in ``operations``, if any.
+
+        Returns:
+            Indices of the operations in ``operations`` with their new loci, in execution order.
+            MOVE gates that have been inserted have the index -1.
+
+        Raises:
+            CircuitTranspilationError: The operations cannot be routed.
+        """
+        # pylint: disable=too-many-branches
+        move_gate = self.move_gate
+        has_moves = any(name == move_gate for name, _ in operations)
+        if not self.has_moves:
+            if has_moves:
+                raise ValueError("Circuit contains MOVE instructions, but the architecture does not support them.")
+            return [(idx, locus) for idx, (_, locus) in enumerate(operations)]
+
+        if existing_moves == ExistingMoveHandlingOptions.KEEP:
+            self._validate_moves(operations)
+        elif existing_moves == ExistingMoveHandlingOptions.REMOVE and has_moves:
+            operations = _remove_moves(operations)
+
+        self.res_state_owner = {r: r for r in self.resonators}
+        # for each fictional gate, maps its locus qubits to the indices of the next operations acting on them
+        followers = self._find_followers(operations)
+        routed: list[tuple[int, Locus]] = []
+        for idx, (name, locus) in enumerate(operations):
+            if not name:
+                continue  # removed MOVE
+            if self.is_native(name, locus):
+                if name == move_gate:
+                    # apply the requested MOVE, closing interfering MOVE sandwiches first
+                    routed += self._create_moves(*locus)
+                    continue
+                # Some locus qubits may not hold their states, which need to be restored before applying the gate.
+                # NOTE: as a consequence, a barrier closes a MOVE sandwich.
+                if res_match := [r for r, q in self.res_state_owner.items() if q != r and q in locus]:
+                    routed += self._restore_moves(res_match)
+                routed.append((idx, locus))
+                continue
+
+            if name not in self.qr_gates_q2r or any(c in self.res_state_owner for c in locus):
+                raise CircuitTranspilationError(f"{locus} is not allowed as locus for '{name}'")
+            resolution = self._find_best_resolution(name, locus, operations, followers[idx])
+            if resolution is None:
+                raise CircuitTranspilationError(
+                    f"Unable to find native gate sequence to enable fictional gate {name} at {locus}."
+                    " Try routing the circuit to the simplified architecture first."
+                )
+            # implement G(g, m) as G(g, r), with the state of m in r and g holding its own state
+            g, m, r = resolution
+            if self._state_holder(m) != r:
+                routed += self._create_moves(m, r)
+            if (g_holder := self._state_holder(g)) != g:
+                routed += self._restore_moves([g_holder])
+            routed.append((idx, (g, r)))
+
+        routed += self._restore_moves(self.resonators)
+        return routed
+
+    def _validate_moves(self, operations: list[tuple[str, Locus]]) -> None:
+        """Check that the MOVE operations form valid MOVE sandwiches.
+
+        Raises:
+            CircuitTranspilationError: The MOVE operations are not valid.
+        """
+        # Mapping from resonator to the qubit whose state it holds. Resonators not in the map hold no qubit state.
+        resonator_occupations: dict[str, str] = {}
+        # Qubits whose states are currently moved to a resonator
+        moved_qubits: set[str] = set()
+        for name, locus in operations:
+            if name == self.move_gate:
+                qubit, resonator = locus
+                if qubit not in self.qubits or resonator not in self.computational_resonators:
+                    raise CircuitTranspilationError(
+                        f"MOVE instructions are only allowed between qubit and resonator, not {locus}."
+                    )
+                if (resonator_qubit := resonator_occupations.get(resonator)) is None:
+                    if qubit in moved_qubits:
+                        raise CircuitTranspilationError(
+                            f"MOVE instruction {locus}: state of {qubit} is "
+                            f"in another resonator: {resonator_occupations}."
+                        )
+                    resonator_occupations[resonator] = qubit
+                    moved_qubits.add(qubit)
+                else:
+                    if resonator_qubit != qubit:
+                        raise CircuitTranspilationError(
+                            f"MOVE instruction {locus} to an already occupied resonator: {resonator_occupations}."
+                        )
+                    del resonator_occupations[resonator]
+                    moved_qubits.remove(qubit)
+            elif moved_qubits and name != "barrier" and (overlap := set(locus) & moved_qubits):
+                raise CircuitTranspilationError(
+                    f"Instruction {name} acts on {locus} while the state(s) of {overlap} "
+                    f"are in a resonator. Current resonator occupation: {resonator_occupations}."
+                )
+        if resonator_occupations:
+            raise CircuitTranspilationError(
+                f"Circuit ends while qubit state(s) are still in a resonator: {resonator_occupations}."
+            )
+
+    def _find_followers(self, operations: list[tuple[str, Locus]]) -> dict[int, dict[str, int]]:
+        """For each fictional qubit-qubit gate, find the next operations acting on its locus qubits."""
+        followers: dict[int, dict[str, int]] = {}
+        next_use: dict[str, int] = {}
+        for idx in range(len(operations) - 1, -1, -1):
+            name, locus = operations[idx]
+            if name in self.qr_gates_q2r and not self.is_native(name, locus):
+                followers[idx] = {q: next_use[q] for q in locus if q in next_use}
+            for q in locus:
+                next_use[q] = idx
+        return followers
+
+    def _state_holder(self, qubit: str) -> str:
+        """QPU component currently holding the state of the given qubit."""
+        for r, c in self.res_state_owner.items():
+            if c == qubit and c != r:
+                return r
+        return qubit
+
+    def _apply_move(self, qubit: str, resonator: str) -> None:
+        """Record the changes to the state locations when a MOVE gate is applied."""
+        if qubit in self.move_r2q.get(resonator, ()) and (owner := self.res_state_owner[resonator]) in (
+            qubit,
+            resonator,
+        ):
+            self.res_state_owner[resonator] = qubit if owner == resonator else resonator
+        else:
+            raise CircuitTranspilationError(f"MOVE locus {qubit, resonator} is not allowed.")
+
+    def _create_moves(self, qubit: str, resonator: str) -> list[tuple[int, Locus]]:
+        """MOVE gates that move the state of the qubit into the resonator, or back to the qubit.
+
+        If the resonator holds the state of another qubit, or the state of the qubit is in another resonator,
+        they are restored first.
+        """
+        moves: list[tuple[int, Locus]] = []
+        owner = self.res_state_owner[resonator]
+        if owner not in (qubit, resonator):
+            self._apply_move(owner, resonator)
+            moves.append((-1, (owner, resonator)))
+        holder = next((r for r, c in self.res_state_owner.items() if c == qubit), None)
+        if holder is not None and holder != resonator:
+            self._apply_move(qubit, holder)
+            moves.append((-1, (qubit, holder)))
+        self._apply_move(qubit, resonator)
+        moves.append((-1, (qubit, resonator)))
+        return moves
+
+    def _restore_moves(self, resonators: Iterable[str]) -> list[tuple[int, Locus]]:
+        """MOVE gates that move the states held in the given resonators back to their qubits."""
+        moves: list[tuple[int, Locus]] = []
+        for r in resonators:
+            q = self.res_state_owner[r]
+            if q != r:
+                self._apply_move(q, r)
+                moves.append((-1, (q, r)))
+        return moves
+
+    def _find_resolutions(self, name: str, locus: Locus) -> list[Resolution]:
+        """All the possible resolutions for the fictional qubit-qubit gate ``name`` on ``locus``."""
+        if (gate_q2r := self.qr_gates_q2r.get(name)) is None:
+            return []
+        a, b = locus
+        empty: set[str] = set()
+        return [(a, b, r) for r in gate_q2r.get(a, empty) & self.move_q2r.get(b, empty)] + [
+            (b, a, r) for r in gate_q2r.get(b, empty) & self.move_q2r.get(a, empty)
+        ]
+
+    def _find_best_resolution(
+        self, name: str, locus: Locus, operations: list[tuple[str, Locus]], followers: dict[str, int]
+    ) -> Optional[Resolution]:
+        """Find the resolution that needs the fewest extra MOVE gates for implementing the fictional gate and
+        the next operations on its locus qubits, see :meth:`_ResonatorStateTracker.find_best_resolution` in
+        :mod:`iqm.iqm_client.transpile`.
+        """
+        resolutions = self._find_resolutions(name, locus)
+        if not resolutions:
+            return None
+
+        def get_badness(res: Resolution, g_holder: str, m_holder: str, r_owner: str) -> int:
+            """Number of MOVE gates needed for implementing the gate, given the current state locations."""
+            g, m, r = res
+            badness = 0
+            if g_holder != g:
+                badness += 1  # need to move the state back to g from a resonator
+            if m_holder != r:
+                if r_owner != r:
+                    badness += 1  # resonator has some other qubit's state in it, and it must be restored
+                # the m state is either in m, or in another resonator
+                badness += 1 if m_holder == m else 2
+            return badness
+
+        def follower_badness(res: Resolution) -> int:
+            """Badness of the follower operation(s), after implementing the gate using ``res``."""
+            # pylint: disable=too-many-return-statements
+            g, m, r = res
+            g_idx = followers.get(g)
+            m_idx = followers.get(m)
+
+            if g_idx is not None and g_idx == m_idx:
+                # two-qubit follower on the same locus
+                f_name, f_locus = operations[g_idx]
+                if f_name == name:
+                    return 0  # same gate, the same resolution works
+                follower_resolutions = self._find_resolutions(f_name, f_locus)
+                if not follower_resolutions or res in follower_resolutions:
+                    return 0
+                return min(get_badness(f_res, g, r, m) for f_res in follower_resolutions)
+
+            badness = 0
+            if g_idx is not None:
+                follower_resolutions = self._find_resolutions(*operations[g_idx])
+                if follower_resolutions and all(f_res[2] == r for f_res in follower_resolutions):
+                    badness += 2  # follower needs to use the same resonator but a different move qubit
+
+            if m_idx is not None:
+                f_name, f_locus = operations[m_idx]
+                follower_resolutions = self._find_resolutions(f_name, f_locus)
+                if follower_resolutions:
+                    if any(f_res[1:] == (m, r) for f_res in follower_resolutions):
+                        pass  # follower can use m as the move qubit and r as the resonator
+                    elif any(f_res[2] != r for f_res in follower_resolutions):
+                        badness += 1  # follower can use a different resonator, the m state must be restored
+                    else:
+                        badness += 2  # follower needs to use the same resonator but a different move qubit
+                elif len(f_locus) == 1:
+                    badness += 1  # the m state must be restored for a single-qubit operation
+            return badness
+
+        options = []
+        for res in resolutions:
+            g, m, r = res
+            badness = get_badness(res, self._state_holder(g), self._state_holder(m), self.res_state_owner[r])
+            badness += follower_badness(res)
+            if badness == 0:
+                return res  # cannot get any better
+            options.append((res, badness))
+        return min(options, key=lambda x: x[1])[0]
+
+
+def _remove_moves(operations: list[tuple[str, Locus]]) -> list[tuple[str, Locus]]:
+    """Remove the MOVE operations, and map the resonators in the loci of the other operations into the qubits
+    whose states they hold, like :func:`iqm.iqm_client.transpile.transpile_remove_moves`.
+
+    The removed MOVE operations are replaced with placeholders so that the indices of the other operations
+    are kept.
+    """
+    res_state_owner: dict[str, str] = {}
+    new_operations: list[tuple[str, Locus]] = []
+    for name, locus in operations:
+        if name == _MoveRouter.move_gate:
+            qubit, resonator = locus
+            owner = res_state_owner.get(resonator, resonator)
+            if owner == resonator:
+                res_state_owner[resonator] = qubit
+            elif owner == qubit:
+                res_state_owner[resonator] = resonator
+            else:
+                raise CircuitTranspilationError(f"MOVE locus {qubit, resonator} is not allowed.")
+            new_operations.append(("", ()))
+        else:
+            new_operations.append((name, tuple(res_state_owner.get(c, c) for c in locus)))
+    return new_operations
+
+
 def _get_scheduling_method(
     perform_move_routing: bool,
     optimize_single_qubits: bool,
@@ -193,6 +570,27 @@ def _get_scheduling_method(
     return scheduling_method
 
 
+# QuantumCircuit is Any for mypy, so the list overload must come first to be reachable
+@overload
+def transpile_to_IQM(  # pylint: disable=too-many-arguments
+    circuit: list[QuantumCircuit],
+    backend: IQMBackendBase,
+    target: Optional[IQMTarget] = None,
+    initial_layout: Optional[Union[Layout, dict, list]] = None,
+    perform_move_routing: bool = True,
+    optimize_single_qubits: bool = True,
+    ignore_barriers: bool = False,
+    remove_final_rzs: bool = True,
+    existing_moves_handling: Optional[ExistingMoveHandlingOptions] = None,
+    restrict_to_qubits: Optional[Union[list[int], list[str]]] = None,
+    noise_aware_layout: bool = False,
+    cache: Optional[TranspilationCache] = None,
+    num_processes: Optional[int] = None,
+    **qiskit_transpiler_kwargs,
+) -> list[QuantumCircuit]: ...
+
+
+@overload
 def transpile_to_IQM(  # pylint: disable=too-many-arguments
     circuit: QuantumCircuit,
     backend: IQMBackendBase,
@@ -204,18 +602,44 @@ def transpile_to_IQM(  # pylint: disable=too-many-arguments
     remove_final_rzs: bool = True,
     existing_moves_handling: Optional[ExistingMoveHandlingOptions] = None,
     restrict_to_qubits: Optional[Union[list[int], list[str]]] = None,
+    noise_aware_layout: bool = False,
+    cache: Optional[TranspilationCache] = None,
+    num_processes: Optional[int] = None,
     **qiskit_transpiler_kwargs,
-) -> QuantumCircuit:
+) -> QuantumCircuit: ...
+
+
+def transpile_to_IQM(  # pylint: disable=too-many-arguments
+    circuit: Union[QuantumCircuit, list[QuantumCircuit]],
+    backend: IQMBackendBase,
+    target: Optional[IQMTarget] = None,
+    initial_layout: Optional[Union[Layout, dict, list]] = None,
+    perform_move_routing: bool = True,
+    optimize_single_qubits: bool = True,
+    ignore_barriers: bool = False,
+    remove_final_rzs: bool = True,
+    existing_moves_handling: Optional[ExistingMoveHandlingOptions] = None,
+    restrict_to_qubits: Optional[Union[list[int], list[str]]] = None,
+    noise_aware_layout: bool = False,
+    cache: Optional[TranspilationCache] = None,
+    num_processes: Optional[int] = None,
+    **qiskit_transpiler_kwargs,
+) -> Union[QuantumCircuit, list[QuantumCircuit]]:
     """Customized transpilation to IQM backends.
 
     Works with both the Crystal and Star architectures.
 
+    A list of circuits is transpiled as a batch: the targets are restricted and the pass managers are built only once
+    for the whole batch, and the initial layouts are generated for each circuit. If ``num_processes`` is given, the
+    batch is transpiled in parallel worker processes, each of which receives the targets only once.
+
     Args:
-        circuit: The circuit to be transpiled without MOVE gates.
+        circuit: The circuit to be transpiled without MOVE gates, or a list of such circuits.
         backend: The target backend to compile to. Does not require a resonator.
         target: An alternative target to compile to than the backend, using this option requires intimate knowledge
             of the transpiler and thus it is not recommended to use.
         initial_layout: The initial layout to use for the transpilation, same as :func:`~qiskit.compiler.transpile`.
+            Used for all the circuits of a batch.
         perform_move_routing: Whether to perform MOVE gate routing.
         optimize_single_qubits: Whether to optimize single qubit gates away.
         ignore_barriers: Whether to ignore barriers when optimizing single qubit gates away.
@@ -225,27 +649,86 @@ def transpile_to_IQM(  # pylint: disable=too-many-arguments
             MOVE gates.
         restrict_to_qubits: Restrict the transpilation to only use these specific physical qubits. Note that you will
             have to pass this information to the ``backend.run`` method as well as a dictionary.
+        noise_aware_layout: If no initial layout is given, choose it using :class:`.IQMNoiseAwareLayout`, which
+            maximizes the estimated success probability of the circuit. The errors are taken from
+            :meth:`.IQMBackendBase.get_noise_aware_target`, or from ``target`` if it is given. Circuits that contain
+            MOVE gates, or that cannot be placed without SWAPs, use the default layout.
+        cache: If given, the transpiled circuits are looked up in this cache first, and stored in it afterwards.
+        num_processes: Number of worker processes used for transpiling a batch of circuits. By default, the circuits
+            are transpiled in this process. A ``callback`` passed to the Qiskit transpiler also forces serial
+            transpilation.
         qiskit_transpiler_kwargs: Arguments to be passed to the Qiskit transpiler.
 
     Returns:
-        Transpiled circuit ready for running on the backend.
+        Transpiled circuit ready for running on the backend, or a list of them in the same order as ``circuit``.
     """
+    # pylint: disable=too-many-branches,too-many-locals,too-many-statements
+    circuits = circuit if isinstance(circuit, list) else [circuit]
     if restrict_to_qubits is not None:
         restrict_to_qubits = [backend.qubit_name_to_index(q) if isinstance(q, str) else q for q in restrict_to_qubits]
 
-    if target is None:
-        if circuit.count_ops().get("move", 0) > 0:
-            target = backend.target_with_resonators
+    # transpiled circuits by their index in the batch
+    transpiled: dict[int, QuantumCircuit] = {}
+    cache_keys: dict[int, str] = {}
+    if cache is not None:
+        options = {
+            "restrict_to_qubits": restrict_to_qubits,
+            "perform_move_routing": perform_move_routing,
+            "optimize_single_qubits": optimize_single_qubits,
+            "ignore_barriers": ignore_barriers,
+            "remove_final_rzs": remove_final_rzs,
+            "existing_moves_handling": None if existing_moves_handling is None else existing_moves_handling.value,
+            "noise_aware_layout": noise_aware_layout,
+            "qiskit_transpiler_kwargs": qiskit_transpiler_kwargs,
+        }
+        for i, qc in enumerate(circuits):
+            key = _transpilation_cache_key(cache, qc, backend, target, initial_layout, options)
+            if key is not None:
+                cache_keys[i] = key
+                cached = cache.get(key, qc)
+                if cached is not None:
+                    transpiled[i] = cached
+    pending = [i for i in range(len(circuits)) if i not in transpiled]
+
+    # the targets, and the target for generating MOVE layouts, are restricted once for the whole batch
+    targets: dict[bool, IQMTarget] = {}
+    layout_target: Optional[IQMTarget] = None
+    noise_aware_target: Optional[IQMTarget] = None
+    jobs: list[_TranspilationJob] = []
+    for i in pending:
+        qc = circuits[i]
+        has_moves = qc.count_ops().get("move", 0) > 0
+        layout: Union[None, str, tuple[int, ...]] = None if initial_layout is None else _GIVEN_LAYOUT
+        if has_moves and target is None:
             # Create a sensible initial layout if none is provided
             if initial_layout is None:
-                initial_layout = generate_initial_layout(backend, circuit, restrict_to_qubits)
+                if layout_target is None:
+                    layout_target = backend.get_real_target()
+                    if restrict_to_qubits is not None:
+                        layout_target = layout_target.restrict_to_qubits(restrict_to_qubits)
+                layout = _layout_indices(_generate_layout(layout_target, qc), qc)
             if perform_move_routing and existing_moves_handling is None:
                 raise ValueError("The circuit contains MOVE gates but existing_moves_handling is not set.")
-        else:
-            target = backend.target
-
-    if restrict_to_qubits is not None:
-        target = target.restrict_to_qubits(restrict_to_qubits)
+        # a given target is used for all the circuits
+        target_key = has_moves and target is None
+        if target_key not in targets:
+            circuit_target = target
+            if circuit_target is None:
+                circuit_target = backend.target_with_resonators if has_moves else backend.target
+            if restrict_to_qubits is not None:
+                circuit_target = circuit_target.restrict_to_qubits(restrict_to_qubits)
+            targets[target_key] = circuit_target
+        if noise_aware_layout and initial_layout is None and not targets[target_key].iqm_includes_resonators:
+            if noise_aware_target is None:
+                # the targets used for transpilation do not carry the errors, so that the default results of the
+                # transpiler do not depend on the error profile
+                noise_aware_target = targets[target_key] if target is not None else backend.get_noise_aware_target()
+                if target is None and restrict_to_qubits is not None:
+                    noise_aware_target = noise_aware_target.restrict_to_qubits(restrict_to_qubits)
+            noise_aware = generate_noise_aware_layout(qc, noise_aware_target)
+            if noise_aware is not None:
+                layout = _layout_indices(noise_aware, qc)
+        jobs.append((qc, target_key, layout))
 
     # Determine which scheduling method to use
     scheduling_method = qiskit_transpiler_kwargs.pop("scheduling_method", None)
@@ -264,5 +747,161 @@ def transpile_to_IQM(  # pylint: disable=too-many-arguments
             + "`ignore_barriers`, and `existing_moves_handling` arguments."
         )
     qiskit_transpiler_kwargs["scheduling_method"] = scheduling_method
-    new_circuit = transpile(circuit, target=target, initial_layout=initial_layout, **qiskit_transpiler_kwargs)
-    return new_circuit
+    callback = qiskit_transpiler_kwargs.pop("callback", None)
+    output_name = qiskit_transpiler_kwargs.pop("output_name", None)
+
+    state = _TranspilationState(targets, initial_layout, qiskit_transpiler_kwargs)
+    if callback is not None or num_processes is None or num_processes <= 1 or len(jobs) <= 1:
+        results = [_run_job(job, state, callback) for job in jobs]
+    else:
+        results = _run_jobs_in_parallel(jobs, state, num_processes)
+
+    for i, result in zip(pending, results):
+        transpiled[i] = result
+        if cache is not None and i in cache_keys:
+            cache.put(cache_keys[i], result)
+    if output_name is not None:
+        names = [output_name] if isinstance(output_name, str) else output_name
+        for i, name in enumerate(names):
+            transpiled[i].name = name
+    if isinstance(circuit, list):
+        return [transpiled[i] for i in range(len(circuits))]
+    return transpiled[0]
+
+
+_GIVEN_LAYOUT = "given"
+"""Marks the jobs that use the initial layout given to :func:`transpile_to_IQM`."""
+
+_TranspilationJob = tuple[QuantumCircuit, bool, Union[None, str, tuple[int, ...]]]
+"""Circuit to transpile, key of its target, and its initial layout as physical qubit indices."""
+
+
+class _TranspilationState:
+    """Targets and options shared by all the circuits of a batch, and the pass managers built from them.
+
+    Args:
+        targets: targets to transpile the circuits to, the key is True for the target with resonators
+        initial_layout: initial layout given to :func:`transpile_to_IQM`
+        transpiler_kwargs: arguments for the preset pass managers
+    """
+
+    def __init__(
+        self, targets: dict[bool, IQMTarget], initial_layout: Optional[Union[Layout, dict, list]], transpiler_kwargs
+    ):
+        self.targets = targets
+        self.initial_layout = initial_layout
+        self.transpiler_kwargs = transpiler_kwargs
+        self.pass_managers: dict[tuple[bool, Union[None, str, tuple[int, ...]]], StagedPassManager] = {}
+
+    def __getstate__(self):
+        # the pass managers are rebuilt in each worker process
+        return self.targets, self.initial_layout, self.transpiler_kwargs
+
+    def __setstate__(self, state):
+        self.__init__(*state)  # pylint: disable=unnecessary-dunder-call
+
+    def pass_manager(self, target_key: bool, layout: Union[None, str, tuple[int, ...]]) -> StagedPassManager:
+        """Pass manager for transpiling to the given target using the given initial layout."""
+        pass_manager = self.pass_managers.get((target_key, layout))
+        if pass_manager is None:
+            kwargs = dict(self.transpiler_kwargs)
+            optimization_level = kwargs.pop("optimization_level", None)
+            if optimization_level is None:
+                # same default as in qiskit.transpile
+                optimization_level = user_config.get_config().get("transpile_optimization_level", 1)
+            if layout is None:
+                initial_layout = None
+            elif layout == _GIVEN_LAYOUT:
+                initial_layout = self.initial_layout
+            else:
+                initial_layout = list(layout)
+            pass_manager = generate_preset_pass_manager(
+                optimization_level, target=self.targets[target_key], initial_layout=initial_layout, **kwargs
+            )
+            self.pass_managers[(target_key, layout)] = pass_manager
+        return pass_manager
+
+
+def _layout_indices(layout: Layout, circuit: QuantumCircuit) -> tuple[int, ...]:
+    """Physical qubits the qubits of the circuit are mapped to by the layout, in order."""
+    return tuple(layout[qubit] for qubit in circuit.qubits)
+
+
+def _run_job(job: _TranspilationJob, state: _TranspilationState, callback=None) -> QuantumCircuit:
+    circuit, target_key, layout = job
+    # like qiskit.transpile, keep the name of the circuit
+    return state.pass_manager(target_key, layout).run(circuit, callback=callback, output_name=circuit.name)
+
+
+_WORKER_STATE: Optional[_TranspilationState] = None
+"""Targets and pass managers of a transpilation worker process."""
+
+
+def _init_transpilation_worker(state: _TranspilationState) -> None:
+    global _WORKER_STATE  # pylint: disable=global-statement
+    _WORKER_STATE = state
+    # like in qiskit.utils.parallel_map, the Rust passes must not start threads in the forked worker processes
+    os.environ["QISKIT_IN_PARALLEL"] = "TRUE"
+
+
+def _transpile_chunk(
+    jobs: list[tuple[_TranspilationJob, ParameterValueType]]
+) -> list[tuple[QuantumCircuit, ParameterValueType]]:
+    """Transpile circuits in a worker process."""
+    assert _WORKER_STATE is not None
+    results = []
+    for job, global_phase in jobs:
+        job[0].global_phase = global_phase
+        result = _run_job(job, _WORKER_STATE)
+        results.append((result, result.global_phase))
+    return results
+
+
+def _run_jobs_in_parallel(
+    jobs: list[_TranspilationJob], state: _TranspilationState, workers: int
+) -> list[QuantumCircuit]:
+    """Transpile circuits in worker processes, which receive the shared state once, when they are started."""
+    # a few chunks per worker keeps the load balanced if the circuits differ in size
+    chunk_size = math.ceil(len(jobs) / (4 * workers)) or 1
+    # pickling does not preserve the global phase of a circuit, so it is sent separately
+    chunks = [[(job, job[0].global_phase) for job in jobs[i : i + chunk_size]] for i in range(0, len(jobs), chunk_size)]
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks)), initializer=_init_transpilation_worker, initargs=(state,)
+    ) as executor:
+        for chunk_results in executor.map(_transpile_chunk, chunks):
+            for result, global_phase in chunk_results:
+                result.global_phase = global_phase
+                results.append(result)
+    return results
+
+
+def _transpilation_cache_key(
+    cache: TranspilationCache,
+    circuit: QuantumCircuit,
+    backend: IQMBackendBase,
+    target: Optional[IQMTarget],
+    initial_layout: Optional[Union[Layout, dict, list]],
+    options: dict,
+) -> Optional[str]:
+    """Key of a call of :func:`transpile_to_IQM` in the transpilation cache, or None if it cannot be cached."""
+    # pylint: disable=too-many-arguments
+    if initial_layout is not None:
+        # only layouts given as lists of physical qubit indices can be hashed canonically
+        if not isinstance(initial_layout, list) or not all(isinstance(q, int) for q in initial_layout):
+            return None
+    options = options | {"initial_layout": initial_layout}
+    if target is None:
+        architecture = backend.architecture
+        # the error profile only affects the noise-aware layout
+        error_profile = backend.get_noise_aware_target().iqm_error_profile if options["noise_aware_layout"] else None
+    else:
+        architecture = target.iqm_dqa
+        error_profile = target.iqm_error_profile
+        options["target"] = [
+            target.iqm_includes_resonators,
+            target.iqm_includes_fake_czs,
+            sorted(target.iqm_component_to_idx.items()),
+        ]
+    options["error_profile"] = None if error_profile is None else repr(error_profile)
+    return cache.key(circuit, architecture, options)
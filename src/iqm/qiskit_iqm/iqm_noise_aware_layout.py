@@ -0,0 +1,194 @@
+# Copyright 2025 Qiskit on IQM developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Choose the initial layout of a quantum circuit using the estimated errors of the operations of an IQM target."""
+from collections import Counter
+import itertools
+from typing import Optional
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.converters import circuit_to_dag
+from qiskit.dagcircuit import DAGCircuit
+from qiskit.transpiler.basepasses import AnalysisPass
+from qiskit.transpiler.layout import Layout
+import rustworkx as rx
+
+from iqm.qiskit_iqm.iqm_backend import IQMTarget
+
+
+class IQMNoiseAwareLayout(AnalysisPass):
+    """Choose the layout that maximizes the estimated success probability of the circuit.
+
+    The success probability of a placement is estimated as the product of the fidelities of the operations of the
+    circuit, using the instruction errors of the target (see :class:`.IQMTarget`). Every two-qubit gate in the circuit
+    counts as a CZ, every measurement as a measurement, and every other single-qubit gate as a PRX gate. Operations
+    without error data count as perfect.
+
+    The candidate placements are the embeddings of the interaction graph of the circuit into the coupling graph of the
+    target, found using VF2. The physical qubits are ordered by their quality before the search, so the first
+    candidates use the best qubits. The quality of a qubit is the sum of the log-fidelities of its PRX gate and its
+    measurement, and the mean log-fidelity of its CZ gates. Up to ``max_candidates`` candidates are collected into an
+    array and scored at once.
+
+    If the circuit cannot be embedded without SWAPs, or has gates acting on more than two qubits, no layout is set,
+    and the layout is left to the subsequent passes.
+
+    Args:
+        target: Transpilation target with instruction errors, see :meth:`.IQMBackendBase.get_noise_aware_target`.
+            Must not include resonators.
+        max_candidates: Maximum number of candidate placements to score.
+    """
+
+    def __init__(self, target: IQMTarget, max_candidates: int = 5000):
+        super().__init__()
+        self.target = target
+        self.max_candidates = max_candidates
+
+    def run(self, dag: DAGCircuit) -> None:
+        """Find the best layout for the given circuit, and store it in ``property_set['layout']``.
+
+        Args:
+            dag: circuit to find the layout for
+        """
+        # pylint: disable=too-many-locals
+        counts = _count_operations(dag)
+        if counts is None or len(dag.qubits) > len(self.target.iqm_dqa.qubits):
+            return
+        single, measurements, pairs = counts
+        log_prx, log_measure, log_cz = self._log_fidelities()
+
+        # logical qubits that are acted on, and the interaction graph between them
+        active = sorted(set(single) | set(measurements) | {q for pair in pairs for q in pair})
+        position = {q: i for i, q in enumerate(active)}
+        interaction = rx.PyGraph()
+        interaction.add_nodes_from(active)
+        interaction.add_edges_from_no_data([(position[a], position[b]) for a, b in pairs])
+
+        # physical qubits ordered from the best to the worst, and the coupling graph between them
+        physical = self._ranked_qubits(log_prx, log_measure, log_cz)
+        coupled = np.isfinite(log_cz)
+        coupling = rx.PyGraph()
+        coupling.add_nodes_from(physical)
+        node = {p: i for i, p in enumerate(physical)}
+        coupling.add_edges_from_no_data(
+            [(node[a], node[b]) for a, b in itertools.combinations(physical, 2) if coupled[a, b]]
+        )
+
+        mappings = rx.vf2_mapping(coupling, interaction, subgraph=True, induced=False, id_order=True)
+        rows = [
+            [physical[p] for p, _ in sorted(mapping.items(), key=lambda item: item[1])]
+            for mapping in itertools.islice(mappings, self.max_candidates)
+        ]
+        if not rows:
+            return
+        candidates = np.array(rows, dtype=np.intp).reshape(len(rows), len(active))
+
+        # score all the candidates at once, columns of the candidate array correspond to the active logical qubits
+        scores = np.zeros(len(candidates))
+        for counter, log_fidelity in ((single, log_prx), (measurements, log_measure)):
+            if counter:
+                columns = np.array([position[q] for q in counter])
+                weights = np.array(list(counter.values()), dtype=float)
+                scores += log_fidelity[candidates[:, columns]] @ weights
+        if pairs:
+            first = np.array([position[a] for a, _ in pairs])
+            second = np.array([position[b] for _, b in pairs])
+            weights = np.array(list(pairs.values()), dtype=float)
+            scores += log_cz[candidates[:, first], candidates[:, second]] @ weights
+        best = candidates[int(np.argmax(scores))]
+
+        layout = Layout({dag.qubits[q]: int(p) for q, p in zip(active, best)})
+        # the idle logical qubits get the best remaining physical qubits
+        used = set(best.tolist())
+        free = (p for p in physical if p not in used)
+        for q, qubit in enumerate(dag.qubits):
+            if q not in position:
+                layout[qubit] = next(free)
+        for qreg in dag.qregs.values():
+            layout.add_register(qreg)
+        self.property_set['layout'] = layout
+
+    def _ranked_qubits(self, log_prx: np.ndarray, log_measure: np.ndarray, log_cz: np.ndarray) -> list[int]:
+        """Physical qubits of the target ordered from the best to the worst, see :meth:`_log_fidelities`."""
+        coupled = np.isfinite(log_cz)
+        num_couplers = coupled.sum(axis=1)
+        # the mean over the couplers does not penalize the qubits for being well connected
+        mean_log_cz = np.divide(
+            np.where(coupled, log_cz, 0.0).sum(axis=1),
+            num_couplers,
+            out=np.zeros(len(num_couplers)),
+            where=num_couplers > 0,
+        )
+        quality = log_prx + log_measure + mean_log_cz
+        return sorted(
+            (self.target.iqm_component_to_idx[q] for q in self.target.iqm_dqa.qubits), key=lambda i: -quality[i]
+        )
+
+    def _log_fidelities(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Logarithms of the fidelities of the PRX gates and the measurements on each physical qubit, and of the CZ
+        gates on each pair of physical qubits, minus infinity for the pairs that have no CZ."""
+        target = self.target
+        num_qubits = target.num_qubits
+        log_prx = np.zeros(num_qubits)
+        log_measure = np.zeros(num_qubits)
+        log_cz = np.full((num_qubits, num_qubits), -np.inf)
+        for name, log_fidelity in (('r', log_prx), ('measure', log_measure)):
+            if name in target:
+                for (qubit,), properties in target[name].items():
+                    if properties is not None and properties.error is not None:
+                        log_fidelity[qubit] = np.log1p(-properties.error)
+        if 'cz' in target:
+            for (a, b), properties in target['cz'].items():
+                value = 0.0
+                if properties is not None and properties.error is not None:
+                    value = np.log1p(-properties.error)
+                log_cz[a, b] = log_cz[b, a] = max(value, log_cz[a, b]) if np.isfinite(log_cz[a, b]) else value
+        return log_prx, log_measure, log_cz
+
+
+def _count_operations(dag: DAGCircuit) -> Optional[tuple[Counter, Counter, Counter]]:
+    """Count the single-qubit gates and measurements on each logical qubit, and the two-qubit gates on each
+    unordered pair of logical qubits.
+
+    Returns:
+        the counts, or None if the circuit has gates acting on more than two qubits
+    """
+    qubit_indices = {qubit: i for i, qubit in enumerate(dag.qubits)}
+    single: Counter = Counter()
+    measurements: Counter = Counter()
+    pairs: Counter = Counter()
+    for node in dag.op_nodes(include_directives=False):
+        qubits = [qubit_indices[q] for q in node.qargs]
+        if len(qubits) == 1:
+            (measurements if node.name == 'measure' else single)[qubits[0]] += 1
+        elif len(qubits) == 2:
+            pairs[(min(qubits), max(qubits))] += 1
+        elif len(qubits) > 2:
+            return None
+    return single, measurements, pairs
+
+
+def generate_noise_aware_layout(circuit: QuantumCircuit, target: IQMTarget) -> Optional[Layout]:
+    """Choose an initial layout for the given circuit using :class:`IQMNoiseAwareLayout`.
+
+    Args:
+        circuit: circuit to find the layout for
+        target: transpilation target, with instruction errors
+
+    Returns:
+        the layout, or None if the circuit cannot be placed on the target without SWAPs
+    """
+    layout_pass = IQMNoiseAwareLayout(target)
+    layout_pass.run(circuit_to_dag(circuit))
+    return layout_pass.property_set['layout']
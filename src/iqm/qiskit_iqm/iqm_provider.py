@@ -15,21 +15,30 @@
 """
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
 from importlib.metadata import PackageNotFoundError, version
-from typing import Any, Optional, Union
+import io
+from json import dumps
+import math
+import os
+from typing import Any, Final, NamedTuple, Optional, Union
 from uuid import UUID
 import warnings
 
-from qiskit import QuantumCircuit
+import numpy as np
+from qiskit import QuantumCircuit, qpy
+from qiskit.circuit import Clbit
 from qiskit.providers import JobStatus, JobV1, Options
 
 from iqm.iqm_client import Circuit, CircuitCompilationOptions, CircuitValidationError, IQMClient, RunRequest
-from iqm.iqm_client.util import to_json_dict
-from iqm.qiskit_iqm.fake_backends import IQMFakeAdonis
+from iqm.iqm_client.util import IQMJSONEncoder, to_json_dict
 from iqm.qiskit_iqm.iqm_backend import IQMBackendBase
-from iqm.qiskit_iqm.iqm_job import IQMJob
-from iqm.qiskit_iqm.qiskit_to_iqm import serialize_instructions
+from iqm.qiskit_iqm.iqm_job import DUPLICATE_CIRCUITS_METADATA_KEY, IQMJob
+from iqm.qiskit_iqm.qiskit_to_iqm import CircuitTemplate, serialize_instructions, serialize_template
+from iqm.qiskit_iqm.run_request_export import Target, export_run_request
 
 try:
     __version__ = version('qiskit-iqm')
@@ -38,8 +47,24 @@ except PackageNotFoundError:  # pragma: no cover
 finally:
     del version, PackageNotFoundError
 
+PARALLEL_SERIALIZATION_THRESHOLD: Final[int] = 256
+"""Minimum number of circuits in a batch for :meth:`.IQMBackend.create_run_request` to serialize them in parallel."""
 
-class IQMBackend(IQMBackendBase):
+
+class SerializationCacheInfo(NamedTuple):
+    """Statistics of the circuit serialization cache of an :class:`.IQMBackend`."""
+
+    hits: int
+    """Number of circuits whose serialization was found in the cache."""
+    misses: int
+    """Number of circuits that were serialized and added to the cache."""
+    maxsize: int
+    """Maximum number of serialized circuits the cache can hold."""
+    currsize: int
+    """Number of serialized circuits currently in the cache."""
+
+
+class IQMBackend(IQMBackendBase):  # pylint: disable=too-many-instance-attributes
     """Backend for executing quantum circuits on IQM quantum computers.
 
     Args:
@@ -60,6 +85,11 @@ class IQMBackend(IQMBackendBase):
         self._max_circuits: Optional[int] = None
         self.name = 'IQM Backend'
         self._calibration_set_id = architecture.calibration_set_id
+        # LRU cache of serialized circuits, keyed by circuit fingerprint, disabled by default
+        self._serialization_cache: OrderedDict[Hashable, Circuit] = OrderedDict()
+        self._serialization_cache_size = 0
+        self._serialization_cache_hits = 0
+        self._serialization_cache_misses = 0
 
     @classmethod
     def _default_options(cls) -> Options:
@@ -85,6 +115,46 @@ class IQMBackend(IQMBackendBase):
     def max_circuits(self, value: Optional[int]) -> None:
         self._max_circuits = value
 
+    @property
+    def serialization_cache_size(self) -> int:
+        """Maximum number of serialized circuits kept in the serialization cache of :meth:`serialize_circuit`.
+
+        Workloads that submit the same circuits many times, such as calibration and benchmarking experiments,
+        can enable the cache to avoid serializing the circuits again. A circuit is looked up in the cache by a
+        fingerprint of its instructions, parameters, classical registers and metadata, and the qubit mapping used.
+        When the cache is full, the least recently used circuit is evicted.
+
+        The circuits returned from the cache have their own name and metadata, but share the instructions with the
+        cache, so the instructions of the returned circuits must not be modified.
+
+        The default value is 0, meaning the cache is disabled. Setting a smaller value evicts the least recently
+        used circuits as needed.
+        """
+        return self._serialization_cache_size
+
+    @serialization_cache_size.setter
+    def serialization_cache_size(self, value: int) -> None:
+        if value < 0:
+            raise ValueError(f'Serialization cache size must be non-negative, got {value}.')
+        self._serialization_cache_size = value
+        while len(self._serialization_cache) > value:
+            self._serialization_cache.popitem(last=False)
+
+    def serialization_cache_info(self) -> SerializationCacheInfo:
+        """Return the statistics of the serialization cache, see :attr:`serialization_cache_size`."""
+        return SerializationCacheInfo(
+            hits=self._serialization_cache_hits,
+            misses=self._serialization_cache_misses,
+            maxsize=self._serialization_cache_size,
+            currsize=len(self._serialization_cache),
+        )
+
+    def clear_serialization_cache(self) -> None:
+        """Empty the serialization cache and reset its statistics."""
+        self._serialization_cache.clear()
+        self._serialization_cache_hits = 0
+        self._serialization_cache_misses = 0
+
     def run(
         self,
         run_input: Union[QuantumCircuit, list[QuantumCircuit]],
@@ -106,6 +176,47 @@ class IQMBackend(IQMBackendBase):
 
         timeout_seconds = options.pop('timeout_seconds', None)
         run_request = self.create_run_request(run_input, **options)
+        return self._submit_run_request(run_request, timeout_seconds)
+
+    def run_sweep(
+        self,
+        circuit: Union[QuantumCircuit, CircuitTemplate],
+        values: np.ndarray,
+        *,
+        shots: int = 1024,
+        circuit_compilation_options: Optional[CircuitCompilationOptions] = None,
+        qubit_mapping: Optional[dict[int, str]] = None,
+        timeout_seconds: Optional[float] = None,
+    ) -> IQMJob:
+        """Run a parametric quantum circuit for several sets of parameter values.
+
+        The circuit is serialized only once, see :meth:`serialize_template`. The circuits are executed in the order
+        of the parameter sets in ``values``.
+
+        Args:
+            circuit: Parametric circuit, or a template created using :meth:`serialize_template`.
+            values: Parameter values with the shape ``(number of parameter sets, number of parameters)``.
+                The columns correspond to the parameters of the circuit in the order of ``circuit.parameters``.
+            shots: Same as in :meth:`create_run_request`.
+            circuit_compilation_options: Same as in :meth:`create_run_request`.
+            qubit_mapping: Same as in :meth:`create_run_request`. Ignored if ``circuit`` is a template.
+            timeout_seconds: Same as in :meth:`run`.
+
+        Returns:
+            Job object from which the results can be obtained once the execution has finished.
+        """
+        # pylint: disable=too-many-arguments
+        template = circuit if isinstance(circuit, CircuitTemplate) else self.serialize_template(circuit, qubit_mapping)
+        circuits_serialized = template.bind(values)
+        if len(circuits_serialized) == 0:
+            raise ValueError('Empty list of circuits submitted for execution.')
+        if circuit_compilation_options is None:
+            circuit_compilation_options = CircuitCompilationOptions()
+        run_request = self._create_run_request(circuits_serialized, shots, circuit_compilation_options)
+        return self._submit_run_request(run_request, timeout_seconds)
+
+    def _submit_run_request(self, run_request: RunRequest, timeout_seconds: Optional[float]) -> IQMJob:
+        """Submit a run request for execution and create the corresponding job."""
         job_id = self.client.submit_run_request(run_request)
         job = IQMJob(self, str(job_id), shots=run_request.shots, timeout_seconds=timeout_seconds)
         job.circuit_metadata = [c.metadata for c in run_request.circuits]
@@ -119,6 +230,11 @@ class IQMBackend(IQMBackendBase):
         circuit_compilation_options: Optional[CircuitCompilationOptions] = None,
         circuit_callback: Optional[Callable[[list[QuantumCircuit]], Any]] = None,
         qubit_mapping: Optional[dict[int, str]] = None,
+        serialization_workers: Optional[int] = 1,
+        trusted: bool = False,
+        group_measurements: bool = False,
+        deduplicate_circuits: bool = False,
+        sum_duplicate_shots: bool = False,
         **unknown_options,
     ) -> RunRequest:
         """Creates a run request without submitting it for execution.
@@ -147,6 +263,29 @@ class IQMBackend(IQMBackendBase):
                 purpose.
             qubit_mapping: Mapping from qubit indices in the circuit to qubit names on the device. If ``None``,
                 :attr:`.IQMBackendBase.index_to_qubit_name` will be used.
+            serialization_workers: Number of worker processes used for serializing the circuits. ``None`` means one
+                worker per CPU. Parallel serialization is only used if there is more than one worker and the batch
+                contains at least :data:`PARALLEL_SERIALIZATION_THRESHOLD` circuits, since starting the workers
+                has a considerable overhead. The order of the serialized circuits always matches ``run_input``.
+            trusted: Iff True, the circuits are assumed to serialize into valid instructions, e.g. because they
+                have been transpiled for this backend, and the instructions are constructed without validation.
+                The circuits are then validated only once, by
+                :meth:`~iqm.iqm_client.iqm_client.IQMClient.create_run_request`, instead of each instruction being
+                validated as it is created. This considerably speeds up the serialization of large circuits.
+            group_measurements: Iff True, the terminal measurements of each classical register are grouped into a
+                single multi-qubit measurement instruction, which makes the run request smaller. The results are
+                split back into the classical bits by :class:`.IQMJob`. See :meth:`serialize_circuit`.
+            deduplicate_circuits: Iff True, circuits that serialize into identical instructions are submitted only
+                once, which reduces the size of the run request and the execution time. The names and metadata of the
+                identical circuits are stored in the metadata of the submitted circuit, and :class:`.IQMJob` gives
+                its results to each of them, in the order of ``run_input``. By default, all the identical circuits
+                get the same measurement results.
+            sum_duplicate_shots: Only used with ``deduplicate_circuits``. Iff True, the shots of identical circuits
+                are summed instead, and each of them gets its own share of the measurement results. Since the number
+                of shots is the same for all the circuits in a run request, this is only possible if every circuit
+                in the batch is repeated equally many times. Each submitted circuit is then executed ``shots`` times
+                the number of its copies, and each copy gets ``shots`` of the results. Otherwise, the identical
+                circuits get the same measurement results, as if ``sum_duplicate_shots`` were False.
 
         Returns:
             The created run request object
@@ -179,8 +318,17 @@ class IQMBackend(IQMBackendBase):
         if circuit_callback:
             circuit_callback(circuits)
 
-        circuits_serialized: list[Circuit] = [self.serialize_circuit(circuit, qubit_mapping) for circuit in circuits]
+        circuits_serialized = self._serialize_circuits(
+            circuits, qubit_mapping, serialization_workers, trusted, group_measurements
+        )
+        if deduplicate_circuits:
+            circuits_serialized, shots = _deduplicate_circuits(circuits_serialized, shots, sum_duplicate_shots)
+        return self._create_run_request(circuits_serialized, shots, circuit_compilation_options)
 
+    def _create_run_request(
+        self, circuits_serialized: list[Circuit], shots: int, circuit_compilation_options: CircuitCompilationOptions
+    ) -> RunRequest:
+        """Create a run request for serialized circuits."""
         if self._use_default_calibration_set:
             default_calset_id = self.client.get_dynamic_quantum_architecture(None).calibration_set_id
             if self._calibration_set_id != default_calset_id:
@@ -204,6 +352,21 @@ class IQMBackend(IQMBackendBase):
 
         return run_request
 
+    @staticmethod
+    def export_run_request(run_request: RunRequest, target: Target) -> None:
+        """Write a run request into a file in a compact binary format.
+
+        This is useful for staging, auditing and replaying run requests offline. The binary format is considerably
+        smaller and faster to write and read than the JSON representation of the run request. Use
+        :func:`~iqm.qiskit_iqm.run_request_export.load_run_request` to read the run request back, or
+        :func:`~iqm.qiskit_iqm.run_request_export.iter_exported_circuits` to stream its circuits.
+
+        Args:
+            run_request: run request to export, e.g. created using :meth:`create_run_request`
+            target: path of the file, or a binary file object to write to
+        """
+        export_run_request(run_request, target)
+
     def retrieve_job(self, job_id: str) -> IQMJob:
         """Create and return an IQMJob instance associated with this backend with given job id.
 
@@ -219,7 +382,14 @@ class IQMBackend(IQMBackendBase):
         """Close IQMClient's session with the authentication server."""
         self.client.close_auth_session()
 
-    def serialize_circuit(self, circuit: QuantumCircuit, qubit_mapping: Optional[dict[int, str]] = None) -> Circuit:
+    def serialize_circuit(
+        self,
+        circuit: QuantumCircuit,
+        qubit_mapping: Optional[dict[int, str]] = None,
+        *,
+        trusted: bool = False,
+        group_measurements: bool = False,
+    ) -> Circuit:
         """Serialize a quantum circuit into the IQM data transfer format.
 
         Serializing is not strictly bound to the native gateset, i.e. some gates that are not explicitly mentioned in
@@ -230,15 +400,25 @@ class IQMBackend(IQMBackendBase):
         submitting directly to the backend, it is sometimes more explicit and understandable to use these concrete
         gates rather than 'r'. Serializing them explicitly makes it possible for the backend to accept such circuits.
 
-        Qiskit uses one measurement instruction per qubit (i.e. there is no measurement grouping concept). While
-        serializing we do not group any measurements together but rather associate a unique measurement key with each
-        measurement instruction, so that the results can later be reconstructed correctly (see :class:`.MeasurementKey`
-        documentation for more details).
+        Qiskit uses one measurement instruction per qubit (i.e. there is no measurement grouping concept). By default,
+        while serializing we do not group any measurements together but rather associate a unique measurement key with
+        each measurement instruction, so that the results can later be reconstructed correctly (see
+        :class:`.MeasurementKey` documentation for more details). With ``group_measurements``, the terminal
+        measurements into each classical register are serialized as a single multi-qubit measurement instead, whose
+        key encodes the classical bits of all the measured qubits (see
+        :func:`~iqm.qiskit_iqm.qiskit_to_iqm.group_terminal_measurements`).
+
+        If the serialization cache is enabled (see :attr:`serialization_cache_size`), a circuit that has already
+        been serialized is not serialized again, but taken from the cache.
 
         Args:
             circuit: quantum circuit to serialize
             qubit_mapping: Mapping from qubit indices in the circuit to qubit names on the device. If not provided,
                 :attr:`.IQMBackendBase.index_to_qubit_name` will be used.
+            trusted: Iff True, the circuit is assumed to serialize into valid instructions, and the returned
+                data transfer object is constructed without validation. It can be validated afterwards using
+                :func:`iqm.iqm_client.iqm_client.validate_circuit`.
+            group_measurements: Iff True, group the terminal measurements into multi-qubit measurement instructions.
 
         Returns:
             data transfer object representing the circuit
@@ -248,17 +428,279 @@ class IQMBackend(IQMBackendBase):
         """
         if qubit_mapping is None:
             qubit_mapping = self._idx_to_qb
-        instructions = serialize_instructions(circuit, qubit_index_to_name=qubit_mapping)
+        if self._serialization_cache_size == 0:
+            return _serialize_circuit(circuit, qubit_mapping, trusted, group_measurements)
+
+        fingerprint = _circuit_fingerprint(circuit, qubit_mapping)
+        if fingerprint is None:
+            return _serialize_circuit(circuit, qubit_mapping, trusted, group_measurements)
+        # unvalidated circuits must not be returned for untrusted calls
+        key = (fingerprint, trusted, group_measurements)
+        cached = self._serialization_cache.get(key)
+        if cached is not None:
+            self._serialization_cache.move_to_end(key)
+            self._serialization_cache_hits += 1
+            # the name is not part of the fingerprint
+            return _copy_cached_circuit(cached, circuit.name)
+
+        serialized = _serialize_circuit(circuit, qubit_mapping, trusted, group_measurements)
+        self._serialization_cache_misses += 1
+        self._serialization_cache[key] = serialized
+        if len(self._serialization_cache) > self._serialization_cache_size:
+            self._serialization_cache.popitem(last=False)
+        return _copy_cached_circuit(serialized, serialized.name)
+
+    def serialize_template(
+        self, circuit: QuantumCircuit, qubit_mapping: Optional[dict[int, str]] = None
+    ) -> CircuitTemplate:
+        """Serialize a parametric quantum circuit into a template, into which parameter values can be bound
+        without serializing the circuit again.
+
+        This is useful for parameter sweeps, where the same transpiled circuit is executed for many sets of parameter
+        values. The parameters of ``r``, ``rx`` and ``ry`` gates may be arbitrary parameter expressions. Use
+        :meth:`.CircuitTemplate.bind` to create the serialized circuits, or :meth:`run_sweep` to execute them.
 
-        try:
-            metadata = to_json_dict(circuit.metadata)
-        except ValueError:
-            warnings.warn(
-                f'Metadata of circuit {circuit.name} was dropped because it could not be serialised to JSON.',
+        Args:
+            circuit: parametric quantum circuit to serialize
+            qubit_mapping: Same as in :meth:`serialize_circuit`.
+
+        Returns:
+            template representing the circuit
+
+        Raises:
+            ValueError: circuit contains an unsupported instruction or is not transpiled in general
+        """
+        if qubit_mapping is None:
+            qubit_mapping = self._idx_to_qb
+        return serialize_template(circuit, qubit_mapping, metadata=_serialize_metadata(circuit))
+
+    def _serialize_circuits(
+        self,
+        circuits: list[QuantumCircuit],
+        qubit_mapping: Optional[dict[int, str]],
+        workers: Optional[int],
+        trusted: bool = False,
+        group_measurements: bool = False,
+    ) -> list[Circuit]:
+        """Serialize a batch of circuits, in parallel worker processes if the batch is large enough.
+
+        The circuits are split into chunks, each chunk is transferred to a worker process in QPY format.
+        Circuits that QPY cannot represent faithfully are serialized in this process instead.
+
+        Args:
+            circuits: quantum circuits to serialize
+            qubit_mapping: Same as in :meth:`serialize_circuit`.
+            workers: Same as ``serialization_workers`` in :meth:`create_run_request`.
+            trusted: Same as in :meth:`serialize_circuit`.
+            group_measurements: Same as in :meth:`serialize_circuit`.
+
+        Returns:
+            data transfer objects representing the circuits, in the same order as ``circuits``
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or len(circuits) < PARALLEL_SERIALIZATION_THRESHOLD:
+            return [
+                self.serialize_circuit(circuit, qubit_mapping, trusted=trusted, group_measurements=group_measurements)
+                for circuit in circuits
+            ]
+
+        if qubit_mapping is None:
+            qubit_mapping = self._idx_to_qb
+        # QPY does not preserve the time unit of delays, so such circuits are not sent to the workers.
+        local_indices = [i for i, c in enumerate(circuits) if any(inst.operation.name == 'delay' for inst in c.data)]
+        remote_indices = sorted(set(range(len(circuits))) - set(local_indices))
+        # a few chunks per worker keeps the load balanced if the circuits differ in size
+        chunk_size = math.ceil(len(remote_indices) / (4 * workers)) or 1
+        chunks = [remote_indices[i : i + chunk_size] for i in range(0, len(remote_indices), chunk_size)]
+
+        serialized: list[Optional[Circuit]] = [None] * len(circuits)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for chunk in chunks:
+                buffer = io.BytesIO()
+                try:
+                    qpy.dump([circuits[i] for i in chunk], buffer, metadata_serializer=IQMJSONEncoder)
+                except (TypeError, ValueError, qpy.QpyError):
+                    # some metadata cannot be stored in QPY, serialize_circuit will drop it with a warning
+                    local_indices.extend(chunk)
+                    continue
+                futures[tuple(chunk)] = executor.submit(
+                    _serialize_qpy_chunk, buffer.getvalue(), qubit_mapping, trusted, group_measurements
+                )
+
+            # serialize the rest here while the workers are busy
+            for i in local_indices:
+                serialized[i] = self.serialize_circuit(
+                    circuits[i], qubit_mapping, trusted=trusted, group_measurements=group_measurements
+                )
+
+            for chunk_indices, future in futures.items():
+                chunk_serialized, caught_warnings = future.result()
+                for message, category in caught_warnings:
+                    warnings.warn(message, category)
+                for i, circuit_serialized in zip(chunk_indices, chunk_serialized):
+                    serialized[i] = circuit_serialized
+
+        return serialized  # type: ignore[return-value]
+
+
+def _serialize_circuit(
+    circuit: QuantumCircuit, qubit_mapping: dict[int, str], trusted: bool = False, group_measurements: bool = False
+) -> Circuit:
+    """Serialize a quantum circuit into the IQM data transfer format.
+
+    See :meth:`.IQMBackend.serialize_circuit` for details.
+    """
+    instructions = serialize_instructions(
+        circuit, qubit_index_to_name=qubit_mapping, trusted=trusted, group_measurements=group_measurements
+    )
+    metadata = _serialize_metadata(circuit)
+    if trusted:
+        return Circuit.model_construct(name=circuit.name, instructions=tuple(instructions), metadata=metadata)
+    return Circuit(name=circuit.name, instructions=instructions, metadata=metadata)
+
+
+def _deduplicate_circuits(circuits: list[Circuit], shots: int, sum_shots: bool) -> tuple[list[Circuit], int]:
+    """Replace identical serialized circuits by a single circuit.
+
+    The identical circuits are replaced by the first of them, in whose metadata the positions, names and metadata of
+    all of them are stored, so that :class:`.IQMJob` can give the results to each of them.
+
+    Args:
+        circuits: serialized circuits
+        shots: number of shots for each circuit
+        sum_shots: iff True, the shots of the identical circuits are summed, provided that every circuit has equally
+            many copies, so that no circuit is executed more than its copies need
+
+    Returns:
+        the unique circuits in the order of their first occurrence, the number of shots for each of them
+    """
+    # maps the instructions of the circuits to the indices of the circuits in the batch
+    copies: dict[Hashable, list[int]] = {}
+    for idx, circuit in enumerate(circuits):
+        copies.setdefault(_instructions_key(circuit), []).append(idx)
+    if len(copies) == len(circuits):
+        return circuits, shots
+
+    # the number of shots is the same for all the circuits, so summing them must not give any circuit extra shots
+    num_copies = {len(indices) for indices in copies.values()}
+    sum_shots = sum_shots and len(num_copies) == 1
+    unique = []
+    for indices in copies.values():
+        circuit = circuits[indices[0]]
+        if len(indices) > 1:
+            originals = [[idx, circuits[idx].name, circuits[idx].metadata] for idx in indices]
+            metadata = {DUPLICATE_CIRCUITS_METADATA_KEY: {'circuits': originals, 'split_shots': sum_shots}}
+            circuit = circuit.model_copy(update={'metadata': metadata})
+        unique.append(circuit)
+    if sum_shots:
+        shots *= num_copies.pop()
+    return unique, shots
+
+
+def _instructions_key(circuit: Circuit) -> Hashable:
+    """Hashable representation of the instructions of a serialized circuit."""
+    key = tuple(
+        (inst.name, inst.implementation, tuple(inst.qubits), tuple(sorted(inst.args.items())))
+        for inst in circuit.instructions
+    )
+    try:
+        hash(key)
+    except TypeError:  # e.g. list-valued arguments of non-native gates
+        return dumps([inst.model_dump() for inst in circuit.instructions], sort_keys=True, cls=IQMJSONEncoder)
+    return key
+
+
+def _serialize_metadata(circuit: QuantumCircuit) -> Optional[dict[str, Any]]:
+    """Convert the metadata of a quantum circuit into JSON, or drop it with a warning if that is not possible."""
+    try:
+        return to_json_dict(circuit.metadata)
+    except ValueError:
+        warnings.warn(
+            f'Metadata of circuit {circuit.name} was dropped because it could not be serialised to JSON.',
+        )
+        return None
+
+
+def _copy_cached_circuit(cached: Circuit, name: str) -> Circuit:
+    """Copy of a circuit in the serialization cache with the given name, and its own copy of the metadata.
+
+    The instructions are shared with the cached circuit.
+    """
+    metadata = None if cached.metadata is None else deepcopy(cached.metadata)
+    return cached.model_copy(update={'name': name, 'metadata': metadata})
+
+
+def _circuit_fingerprint(circuit: QuantumCircuit, qubit_mapping: dict[int, str]) -> Optional[Hashable]:
+    """Structural fingerprint of a quantum circuit, used as the key of the serialization cache.
+
+    Circuits with equal fingerprints serialize into identical instructions and metadata.
+    The name of the circuit is not included in the fingerprint.
+
+    Args:
+        circuit: quantum circuit to fingerprint
+        qubit_mapping: mapping from qubit indices in the circuit to qubit names on the device
+
+    Returns:
+        the fingerprint, or ``None`` if the circuit cannot be fingerprinted (e.g. its metadata is not JSON serializable)
+    """
+    try:
+        metadata = dumps(circuit.metadata, sort_keys=True, allow_nan=False, cls=IQMJSONEncoder)
+    except (ValueError, TypeError):
+        return None
+    qubit_to_idx = {qubit: idx for idx, qubit in enumerate(circuit.qubits)}
+    clbit_to_idx = {clbit: idx for idx, clbit in enumerate(circuit.clbits)}
+    instructions = []
+    for circuit_instruction in circuit.data:
+        operation = circuit_instruction.operation
+        condition = operation.condition
+        if condition is not None:
+            bits, value = condition
+            if isinstance(bits, Clbit):
+                condition = (clbit_to_idx[bits], value)
+            else:
+                condition = (tuple(clbit_to_idx[bit] for bit in bits), value)
+        instructions.append(
+            (
+                operation.name,
+                tuple(operation.params),
+                operation.unit if operation.name == 'delay' else None,
+                tuple(qubit_to_idx[qubit] for qubit in circuit_instruction.qubits),
+                tuple(clbit_to_idx[clbit] for clbit in circuit_instruction.clbits),
+                condition,
             )
-            metadata = None
+        )
+    # measurement keys depend on the classical registers
+    cregs = tuple((creg.name, tuple(clbit_to_idx[clbit] for clbit in creg)) for creg in circuit.cregs)
+    key = (tuple(instructions), cregs, metadata, tuple(sorted(qubit_mapping.items())))
+    try:
+        hash(key)
+    except TypeError:  # e.g. array-valued gate parameters
+        return None
+    return key
+
+
+def _serialize_qpy_chunk(
+    data: bytes, qubit_mapping: dict[int, str], trusted: bool = False, group_measurements: bool = False
+) -> tuple[list[Circuit], list[tuple[str, type[Warning]]]]:
+    """Serialize QPY-encoded circuits in a worker process.
 
-        return Circuit(name=circuit.name, instructions=instructions, metadata=metadata)
+    Args:
+        data: circuits in QPY format
+        qubit_mapping: mapping from qubit indices in the circuits to qubit names on the device
+        trusted: whether to skip the validation of the serialized circuits
+        group_measurements: whether to group the terminal measurements
+
+    Returns:
+        serialized circuits in the same order as in ``data``, warnings raised during the serialization
+        so that they can be reissued in the parent process
+    """
+    circuits = qpy.load(io.BytesIO(data))
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        serialized = [_serialize_circuit(circuit, qubit_mapping, trusted, group_measurements) for circuit in circuits]
+    return serialized, [(str(w.message), w.category) for w in caught]
 
 
 class IQMFacadeBackend(IQMBackend):
@@ -272,6 +714,9 @@ class IQMFacadeBackend(IQMBackend):
     """
 
     def __init__(self, client: IQMClient, **kwargs):
+        # imported here to avoid loading qiskit-aer unless a facade backend is actually used
+        from iqm.qiskit_iqm.fake_backends.fake_adonis import IQMFakeAdonis  # pylint: disable=import-outside-toplevel
+
         self.fake_adonis = IQMFakeAdonis()
         target_architecture = client.get_dynamic_quantum_architecture(kwargs.get('calibration_set_id', None))
 
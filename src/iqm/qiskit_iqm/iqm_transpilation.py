@@ -12,16 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Transpilation tool to optimize the decomposition of single-qubit gates tailored to IQM hardware."""
+import cmath
 import math
 import warnings
 
 import numpy as np
 from qiskit import QuantumCircuit
-from qiskit.circuit.equivalence_library import SessionEquivalenceLibrary
 from qiskit.circuit.library import RGate, UnitaryGate
 from qiskit.dagcircuit import DAGCircuit
 from qiskit.transpiler.basepasses import TransformationPass
-from qiskit.transpiler.passes import BasisTranslator, Optimize1qGatesDecomposition, RemoveBarriers
+from qiskit.transpiler.passes import RemoveBarriers
 from qiskit.transpiler.passmanager import PassManager
 
 TOLERANCE = 1e-10  # The tolerance for equivalence checking against zero.
@@ -32,16 +32,19 @@ class IQMOptimizeSingleQubitGates(TransformationPass):
 
     This optimization pass expects the circuit to be correctly layouted and translated to the IQM architecture
     and raises an error otherwise.
-    The optimization logic follows the steps:
+    The optimization is done in a single traversal of the circuit, following the steps:
 
-    1. Convert single-qubit gates to :math:`U` gates and combine all neighboring :math:`U` gates.
-    2. Convert :math:`U` gates according to
+    1. Collect each run of consecutive :math:`R` gates on a qubit and multiply their matrices together.
+    2. Decompose the product according to
        :math:`U(\theta , \phi , \lambda) = ~ RZ(\phi + \lambda) R(\theta, \pi / 2  - \lambda)`.
     3. Commute `RZ` gates to the end of the circuit using the fact that `RZ` and `CZ` gates commute, and
        :math:`R(\theta , \phi) RZ(\lambda) = RZ(\lambda) R(\theta, \phi - \lambda)`.
     4. Drop `RZ` gates immediately before measurements, and otherwise replace them according to
        :math:`RZ(\lambda) = R(\pi, \lambda / 2) R(- \pi, 0)`.
 
+    :math:`R` gates with unbound parameters or classical conditions are not combined with their neighbors, only
+    the accumulated `RZ` rotation is commuted through them.
+
     Args:
         drop_final_rz: Drop terminal RZ gates even if there are no measurements following them (since they do not affect
             the measurement results). Note that this will change the unitary propagator of the circuit.
@@ -53,43 +56,69 @@ class IQMOptimizeSingleQubitGates(TransformationPass):
     def __init__(self, drop_final_rz: bool = True, ignore_barriers: bool = False):
         super().__init__()
         self._basis = ['r', 'cz', 'move']
-        self._intermediate_basis = ['u', 'cz', 'move']
         self._drop_final_rz = drop_final_rz
         self._ignore_barriers = ignore_barriers
 
     def run(self, dag: DAGCircuit) -> DAGCircuit:
-        # pylint: disable=too-many-branches
+        # pylint: disable=too-many-branches,too-many-statements
         self._validate_ops(dag)
-        # accumulated RZ angles for each qubit, from the beginning of the circuit to the current gate
-        rz_angles: list[float] = [0] * dag.num_qubits()
-
         if self._ignore_barriers:
             dag = RemoveBarriers().run(dag)
-        # convert all gates in the circuit to U and CZ gates
-        dag = BasisTranslator(SessionEquivalenceLibrary, self._intermediate_basis).run(dag)
-        # combine all sequential U gates into one
-        dag = Optimize1qGatesDecomposition(self._intermediate_basis).run(dag)
+
+        qubits = dag.qubits
+        qubit_indices = {qubit: index for index, qubit in enumerate(qubits)}
+        # accumulated RZ angles for each qubit, from the beginning of the circuit to the current gate
+        rz_angles: list[float] = [0] * len(qubits)
+        # angles of the R gates on each qubit that have not been combined and added to the new DAG yet
+        pending: list[list[tuple[float, float]]] = [[] for _ in qubits]
+        new_dag = dag.copy_empty_like()
+
+        def flush(qubit_index: int) -> None:
+            """Add the pending R gates on the qubit to the new DAG as at most one R gate."""
+            run = pending[qubit_index]
+            if not run:
+                return
+            pending[qubit_index] = []
+            rz_angle = rz_angles[qubit_index]
+            if len(run) == 1:
+                theta, phi = run[0]
+                lam = np.pi / 2 - phi
+            else:
+                theta, phi, lam, phase = _zyz_angles(_r_run_matrix(run, rz_angle))
+                rz_angles[qubit_index] = phi + lam
+                new_dag.global_phase += phase
+                rz_angle = 0
+            if not math.isclose(theta, 0, abs_tol=TOLERANCE):
+                new_dag.apply_operation_back(
+                    RGate(theta, np.pi / 2 - lam - rz_angle), (qubits[qubit_index],), check=False
+                )
+
         for node in dag.topological_op_nodes():
-            if node.name == 'u':
-                # convert into PRX + RZ
-                qubit_index = dag.find_bit(node.qargs[0])[0]
-                if isinstance(node.op.params[0], float) and math.isclose(node.op.params[0], 0, abs_tol=TOLERANCE):
-                    dag.remove_op_node(node)
-                else:
-                    dag.substitute_node(
-                        node, RGate(node.op.params[0], np.pi / 2 - node.op.params[2] - rz_angles[qubit_index])
-                    )
-                phase = node.op.params[1] + node.op.params[2]
-                dag.global_phase += phase / 2
-                rz_angles[qubit_index] += phase
-            elif node.name in {'measure', 'reset'}:
+            name = node.name
+            indices = [qubit_indices[qubit] for qubit in node.qargs]
+            op = node.op
+            if name == 'r':
+                theta, phi = op.params
+                if isinstance(theta, float) and isinstance(phi, float) and getattr(op, 'condition', None) is None:
+                    pending[indices[0]].append((theta, phi))
+                    continue
+                # cannot be combined with its neighbors, only commute the RZ rotation through
+                flush(indices[0])
+                if rz_angles[indices[0]] != 0:
+                    op = op.to_mutable()
+                    op.params = [theta, phi - rz_angles[indices[0]]]
+                new_dag.apply_operation_back(op, node.qargs, node.cargs, check=False)
+                continue
+            for index in indices:
+                flush(index)
+            if name in {'measure', 'reset'}:
                 # measure and reset destroy phase information. The local phases before and after such
                 # an operation are in principle independent, and the local computational frame phases
                 # are arbitrary so we could set rz_angles to any values here, but zeroing the
                 # angles results in fewest changes to the circuit.
-                for qubit in node.qargs:
-                    rz_angles[dag.find_bit(qubit)[0]] = 0
-            elif node.name == 'barrier':
+                for index in indices:
+                    rz_angles[index] = 0
+            elif name == 'barrier':
                 # TODO barriers are meant to restrict circuit optimization, so strictly speaking
                 # we should output any accumulated ``rz_angles`` here as explicit z rotations (like
                 # the final rz:s). However, ``rz_angles`` simply represents a choice of phases for the
@@ -97,25 +126,26 @@ class IQMOptimizeSingleQubitGates(TransformationPass):
                 # been transformed). This choice of local phases is in principle arbitrary, so maybe it
                 # makes no sense to convert it into active z rotations if we hit a barrier?
                 pass
-            elif node.name == 'move':
+            elif name == 'move':
                 # acts like iSWAP with RZ, moving it to the other component
-                qb, res = dag.find_bit(node.qargs[0])[0], dag.find_bit(node.qargs[1])[0]
+                qb, res = indices
                 rz_angles[res], rz_angles[qb] = rz_angles[qb], rz_angles[res]
-            elif node.name in {'cz', 'delay'}:
+            elif name in {'cz', 'delay'}:
                 pass  # commutes with RZ gates
             else:
-                raise ValueError(
-                    f"Unexpected operation '{node.name}' in circuit given to IQMOptimizeSingleQubitGates pass"
-                )
+                raise ValueError(f"Unexpected operation '{name}' in circuit given to IQMOptimizeSingleQubitGates pass")
+            new_dag.apply_operation_back(op, node.qargs, node.cargs, check=False)
 
+        for qubit_index in range(len(qubits)):
+            flush(qubit_index)
         if not self._drop_final_rz:
             for qubit_index, rz_angle in enumerate(rz_angles):
                 if rz_angle != 0:
-                    qubit = dag.qubits[qubit_index]
-                    dag.apply_operation_back(RGate(-np.pi, 0), qargs=(qubit,))
-                    dag.apply_operation_back(RGate(np.pi, rz_angles[qubit_index] / 2), qargs=(qubit,))
+                    qubit = qubits[qubit_index]
+                    new_dag.apply_operation_back(RGate(-np.pi, 0), qargs=(qubit,))
+                    new_dag.apply_operation_back(RGate(np.pi, rz_angle / 2), qargs=(qubit,))
 
-        return dag
+        return new_dag
 
     def _validate_ops(self, dag: DAGCircuit):
         valid_ops = self._basis + ['measure', 'reset', 'delay', 'barrier']
@@ -127,6 +157,35 @@ class IQMOptimizeSingleQubitGates(TransformationPass):
                 )
 
 
+def _r_run_matrix(run: list[tuple[float, float]], rz_angle: float) -> np.ndarray:
+    """Matrix of a run of R gates, given by their angles in circuit order, preceded by an RZ gate."""
+    theta, phi = np.array(run).T
+    cos = np.cos(theta / 2)
+    sin = np.sin(theta / 2)
+    phase = np.exp(1j * phi)
+    matrices = np.empty((len(run), 2, 2), dtype=complex)
+    matrices[:, 0, 0] = cos
+    matrices[:, 0, 1] = -1j * sin * phase.conj()
+    matrices[:, 1, 0] = -1j * sin * phase
+    matrices[:, 1, 1] = cos
+    product = np.diag([np.exp(-0.5j * rz_angle), np.exp(0.5j * rz_angle)])
+    for matrix in matrices:
+        product = matrix @ product
+    return product
+
+
+def _zyz_angles(matrix: np.ndarray) -> tuple[float, float, float, float]:
+    r"""Angles :math:`\theta, \phi, \lambda` and phase :math:`\gamma` of a single-qubit unitary
+    :math:`e^{i \gamma} RZ(\phi) RY(\theta) RZ(\lambda)`.
+    """
+    phase = cmath.phase(matrix[0, 0] * matrix[1, 1] - matrix[0, 1] * matrix[1, 0]) / 2
+    special = matrix * cmath.exp(-1j * phase)
+    theta = 2 * math.atan2(abs(special[1, 0]), abs(special[0, 0]))
+    angle_sum = 2 * cmath.phase(special[1, 1])
+    angle_difference = 2 * cmath.phase(special[1, 0])
+    return theta, (angle_sum + angle_difference) / 2, (angle_sum - angle_difference) / 2, phase
+
+
 def optimize_single_qubit_gates(
     circuit: QuantumCircuit, drop_final_rz: bool = True, ignore_barriers: bool = False
 ) -> QuantumCircuit:
@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """MOVE gate to be used on the IQM Star architecture."""
+from typing import Optional
+
 import numpy as np
-from qiskit.circuit import Gate
+from qiskit.circuit.singleton import SingletonGate
 import qiskit.quantum_info as qi
 
 # MOVE gate has undefined phases, so we pick two arbitrary phases here
@@ -31,7 +33,7 @@ This matrix is not a realistic description of MOVE, since it applies a zero phas
 state, and acts as identity in the :math:`|11\rangle` subspace, thus being equal to the SWAP gate."""
 
 
-class MoveGate(Gate):
+class MoveGate(SingletonGate):
     r"""The MOVE operation is a unitary population exchange operation between a qubit and a resonator.
     Its effect is only defined in the invariant subspace :math:`S = \text{span}\{|00\rangle, |01\rangle, |10\rangle\}`,
     where it swaps the populations of the states :math:`|01\rangle` and :math:`|10\rangle`.
@@ -50,12 +52,27 @@ class MoveGate(Gate):
     .. note::
        The MOVE gate must always be be applied on the qubit and the resonator in the
        order ``[qubit, resonator]``, regardless of which component is currently holding the state.
+
+    ``MoveGate()`` returns a shared immutable instance, like the Qiskit standard gates without parameters,
+    so creating MOVE instructions is cheap. Use :meth:`~qiskit.circuit.Instruction.to_mutable` to obtain an
+    instance that can be modified.
     """
 
-    def __init__(self, label=None):
+    _unitary: Optional[qi.Operator] = None
+
+    def __init__(self, label=None, *, duration=None, unit="dt"):
         """Initializes the move gate"""
-        super().__init__("move", 2, [], label=label)
-        self.unitary = qi.Operator(MOVE_GATE_UNITARY)
+        super().__init__("move", 2, [], label=label, duration=duration, unit=unit)
+
+    @property
+    def unitary(self) -> qi.Operator:
+        """Unitary of the ideal MOVE gate, see :data:`MOVE_GATE_UNITARY`.
+
+        The operator is created on first access, and shared by all instances.
+        """
+        if MoveGate._unitary is None:
+            MoveGate._unitary = qi.Operator(MOVE_GATE_UNITARY)
+        return MoveGate._unitary
 
     def _define(self):
         """This function is purposefully not defined so that that the Qiskit transpiler cannot accidentally
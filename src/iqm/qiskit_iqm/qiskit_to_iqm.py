@@ -15,16 +15,33 @@
 """
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import dataclass
+from functools import lru_cache
 import re
-from typing import Collection
+from typing import Any, Collection, Optional, Union
 
 import numpy as np
 from qiskit import QuantumCircuit as QiskitQuantumCircuit
-from qiskit.circuit import ClassicalRegister, Clbit, QuantumRegister
+from qiskit.circuit import (
+    Barrier,
+    CircuitInstruction,
+    ClassicalRegister,
+    Clbit,
+    Delay,
+    Measure,
+    Operation,
+    Parameter,
+    ParameterExpression,
+    QuantumRegister,
+    Qubit,
+    Reset,
+)
+from qiskit.circuit.library import CZGate, RGate
+from qiskit.dagcircuit import DAGCircuit
 from qiskit.transpiler.layout import Layout
 
-from iqm.iqm_client import Instruction
+from iqm.iqm_client import Circuit, Instruction
 from iqm.qiskit_iqm.move_gate import MoveGate
 
 
@@ -76,24 +93,152 @@ class MeasurementKey:
 
     @classmethod
     def from_string(cls, string: str) -> MeasurementKey:
-        """Create a MeasurementKey from its string representation."""
-        match = re.match(r'^(.*)_(\d+)_(\d+)_(\d+)$', string)
-        if match is None:
-            raise ValueError('Invalid measurement key string representation.')
-        return cls(match.group(1), int(match.group(2)), int(match.group(3)), int(match.group(4)))
+        """Create a MeasurementKey from its string representation.
+
+        The same keys recur in the results of every circuit in a batch, so the parsed keys are cached.
+        """
+        return _parse_measurement_key(string)
 
     @classmethod
     def from_clbit(cls, clbit: Clbit, circuit: QiskitQuantumCircuit) -> MeasurementKey:
-        """Create a MeasurementKey for a classical bit in a quantum circuit."""
+        """Create a MeasurementKey for a classical bit in a quantum circuit.
+
+        Use :meth:`table_for` to create the keys for all the classical bits of a circuit at once.
+        """
         bitloc = circuit.find_bit(clbit)
         creg = bitloc.registers[0][0]
         creg_idx = circuit.cregs.index(creg)
         clbit_idx = bitloc.registers[0][1]
         return cls(creg.name, len(creg), creg_idx, clbit_idx)
 
+    @classmethod
+    def table_for(cls, circuit: Union[QiskitQuantumCircuit, DAGCircuit]) -> dict[Clbit, MeasurementKey]:
+        """Create the MeasurementKeys for all the classical bits in the classical registers of a quantum circuit.
+
+        Gives the same keys as :meth:`from_clbit`, but the classical registers are enumerated only once, instead of
+        being searched for each classical bit.
+
+        Args:
+            circuit: quantum circuit, or its DAG representation
+
+        Returns:
+            Mapping from the classical bits of the circuit to their measurement keys. Classical bits that do not
+            belong to any classical register are not included.
+        """
+        table: dict[Clbit, MeasurementKey] = {}
+        cregs = circuit.cregs.values() if isinstance(circuit, DAGCircuit) else circuit.cregs
+        for creg_idx, creg in enumerate(cregs):
+            creg_len = len(creg)
+            for clbit_idx, clbit in enumerate(creg):
+                # a clbit belonging to several registers is identified by the first one of them
+                if clbit not in table:
+                    table[clbit] = cls(creg.name, creg_len, creg_idx, clbit_idx)
+        return table
+
+    @staticmethod
+    def join(keys: Sequence[MeasurementKey]) -> str:
+        """String representation of a group of measurement keys that share a single multi-qubit measurement.
+
+        The keys must belong to the same classical register. The representation is the same as for a single key,
+        but with the clbit indices of all the keys in the group, separated by dots, e.g. ``'meas_3_0_0.1.2'``.
+        The columns of the measurement result correspond to the keys in the given order.
+
+        Args:
+            keys: measurement keys of the measured qubits, in the order of the qubits of the measurement
+
+        Returns:
+            string representation of the group
+
+        Raises:
+            ValueError: the keys belong to different classical registers
+        """
+        first = keys[0]
+        if any(
+            (mk.creg_name, mk.creg_len, mk.creg_idx) != (first.creg_name, first.creg_len, first.creg_idx) for mk in keys
+        ):
+            raise ValueError('Grouped measurement keys must belong to the same classical register.')
+        clbit_indices = '.'.join(str(mk.clbit_idx) for mk in keys)
+        return f'{first.creg_name}_{first.creg_len}_{first.creg_idx}_{clbit_indices}'
+
+    @classmethod
+    def split(cls, string: str) -> tuple[MeasurementKey, ...]:
+        """Create the MeasurementKeys from the string representation of a single key or a group of keys.
+
+        See :meth:`join`. Like :meth:`from_string`, the parsed keys are cached.
+
+        Returns:
+            keys corresponding to the columns of the measurement result
+        """
+        return _parse_measurement_key_group(string)
+
+
+@lru_cache(maxsize=4096)
+def _parse_measurement_key(string: str) -> MeasurementKey:
+    """Parse the string representation of a measurement key, see :meth:`MeasurementKey.from_string`."""
+    match = re.match(r'^(.*)_(\d+)_(\d+)_(\d+)$', string)
+    if match is None:
+        raise ValueError('Invalid measurement key string representation.')
+    return MeasurementKey(match.group(1), int(match.group(2)), int(match.group(3)), int(match.group(4)))
+
+
+@lru_cache(maxsize=4096)
+def _parse_measurement_key_group(string: str) -> tuple[MeasurementKey, ...]:
+    """Parse the string representation of a group of measurement keys, see :meth:`MeasurementKey.split`."""
+    match = re.match(r'^(.*)_(\d+)_(\d+)_(\d+(?:\.\d+)*)$', string)
+    if match is None:
+        raise ValueError('Invalid measurement key string representation.')
+    creg_name, creg_len, creg_idx = match.group(1), int(match.group(2)), int(match.group(3))
+    return tuple(MeasurementKey(creg_name, creg_len, creg_idx, int(idx)) for idx in match.group(4).split('.'))
+
+
+_DELAY_UNIT_TO_SECONDS: dict[str, float] = {
+    'dt': 1e-9,  # we arbitrarily pick dt == 1 ns
+    's': 1.0,
+    'ms': 1e-3,
+    'us': 1e-6,
+    'ns': 1e-9,
+    'ps': 1e-12,
+}
+"""Conversion factors from the supported delay units to seconds."""
+
+
+def _serialize_delay(operation: Operation) -> tuple[str, dict[str, Any]]:
+    """Convert a Qiskit delay into a native delay instruction, with the duration in seconds."""
+    unit = operation.unit
+    if unit not in _DELAY_UNIT_TO_SECONDS:
+        raise ValueError(f"Delay: Unsupported unit '{unit}'")
+    return 'delay', {'duration': float(operation.params[0]) * _DELAY_UNIT_TO_SECONDS[unit]}
+
+
+_INSTRUCTION_SERIALIZERS: dict[str, Callable[[Operation], tuple[str, dict[str, Any]]]] = {
+    'r': lambda op: (
+        'prx',
+        {'angle_t': float(op.params[0] / (2 * np.pi)), 'phase_t': float(op.params[1] / (2 * np.pi))},
+    ),
+    'x': lambda op: ('prx', {'angle_t': 0.5, 'phase_t': 0.0}),
+    'rx': lambda op: ('prx', {'angle_t': float(op.params[0] / (2 * np.pi)), 'phase_t': 0.0}),
+    'y': lambda op: ('prx', {'angle_t': 0.5, 'phase_t': 0.25}),
+    'ry': lambda op: ('prx', {'angle_t': float(op.params[0] / (2 * np.pi)), 'phase_t': 0.25}),
+    'cz': lambda op: ('cz', {}),
+    'move': lambda op: ('move', {}),
+    'barrier': lambda op: ('barrier', {}),
+    'delay': _serialize_delay,
+    'reset': lambda op: ('reset', {}),
+}
+"""Converters from Qiskit operations into native IQM instructions, by the name of the operation.
+
+Each converter takes the operation, and returns the name and the arguments of the native instruction.
+Measurements are handled separately, since they also need the classical bits.
+"""
+
 
 def serialize_instructions(
-    circuit: QiskitQuantumCircuit, qubit_index_to_name: dict[int, str], allowed_nonnative_gates: Collection[str] = ()
+    circuit: QiskitQuantumCircuit,
+    qubit_index_to_name: dict[int, str],
+    allowed_nonnative_gates: Collection[str] = (),
+    *,
+    trusted: bool = False,
+    group_measurements: bool = False,
 ) -> list[Instruction]:
     """Serialize a quantum circuit into the IQM data transfer format.
 
@@ -108,6 +253,48 @@ def serialize_instructions(
             If such gates are present in the circuit, the caller must edit the result to be valid and executable.
             Notably, since IQM transfer format requires named parameters and qiskit parameters don't have names, the
             `i` th parameter of an unrecognized instruction is given the name ``"p<i>"``.
+        trusted: Iff True, the instructions are constructed without validating them.
+            Only use this for circuits that are known to serialize into valid instructions, e.g. circuits
+            transpiled for the backend.
+        group_measurements: Iff True, the terminal measurements of each classical register are grouped into a
+            single multi-qubit measurement instruction, see :func:`group_terminal_measurements`.
+
+    Returns:
+        list of instructions representing the circuit
+
+    Raises:
+        ValueError: circuit contains an unsupported instruction or is not transpiled in general
+    """
+    return _serialize_operations(
+        ((inst.operation, inst.qubits, inst.clbits) for inst in circuit.data),
+        circuit,
+        qubit_index_to_name,
+        allowed_nonnative_gates,
+        trusted,
+        group_measurements,
+    )
+
+
+def serialize_dag(
+    dag: DAGCircuit,
+    qubit_index_to_name: dict[int, str],
+    allowed_nonnative_gates: Collection[str] = (),
+    *,
+    trusted: bool = False,
+    group_measurements: bool = False,
+) -> list[Instruction]:
+    """Serialize a quantum circuit in the DAG representation into the IQM data transfer format.
+
+    Gives the same result as :func:`serialize_instructions` for ``dag_to_circuit(dag)``, but walks the operations of
+    the DAG in topological order directly, without copying them into a quantum circuit first. Useful in
+    transpiler passes, which operate on DAGs.
+
+    Args:
+        dag: quantum circuit to serialize
+        qubit_index_to_name: Mapping from qubit indices to the corresponding qubit names.
+        allowed_nonnative_gates: Same as in :func:`serialize_instructions`.
+        trusted: Same as in :func:`serialize_instructions`.
+        group_measurements: Same as in :func:`serialize_instructions`.
 
     Returns:
         list of instructions representing the circuit
@@ -115,71 +302,76 @@ def serialize_instructions(
     Raises:
         ValueError: circuit contains an unsupported instruction or is not transpiled in general
     """
-    # pylint: disable=too-many-branches,too-many-statements
+    return _serialize_operations(
+        ((node.op, node.qargs, node.cargs) for node in dag.topological_op_nodes()),
+        dag,
+        qubit_index_to_name,
+        allowed_nonnative_gates,
+        trusted,
+        group_measurements,
+    )
+
+
+def _serialize_operations(
+    operations: Iterable[tuple[Operation, tuple[Qubit, ...], tuple[Clbit, ...]]],
+    circuit: Union[QiskitQuantumCircuit, DAGCircuit],
+    qubit_index_to_name: dict[int, str],
+    allowed_nonnative_gates: Collection[str],
+    trusted: bool,
+    group_measurements: bool,
+) -> list[Instruction]:
+    """Serialize the operations of a quantum circuit into the IQM data transfer format.
+
+    Args:
+        operations: operations of the circuit, with the qubits and clbits they act on, in execution order
+        circuit: the circuit the operations belong to, for the bits and registers
+        qubit_index_to_name: Mapping from qubit indices to the corresponding qubit names.
+        allowed_nonnative_gates: Same as in :func:`serialize_instructions`.
+        trusted: Same as in :func:`serialize_instructions`.
+        group_measurements: Same as in :func:`serialize_instructions`.
+
+    Returns:
+        list of instructions representing the circuit
+    """
+    # pylint: disable=too-many-arguments,too-many-branches,too-many-statements
+    make_instruction = Instruction.model_construct if trusted else Instruction
     instructions: list[Instruction] = []
     # maps clbits to the latest "measure" instruction to store its result there
     clbit_to_measure: dict[Clbit, Instruction] = {}
-    for circuit_instruction in circuit.data:
-        instruction = circuit_instruction.operation
-        qubit_names = [qubit_index_to_name[circuit.find_bit(qubit).index] for qubit in circuit_instruction.qubits]
-        if instruction.name == 'r':
-            angle_t = float(instruction.params[0] / (2 * np.pi))
-            phase_t = float(instruction.params[1] / (2 * np.pi))
-            native_inst = Instruction(name='prx', qubits=qubit_names, args={'angle_t': angle_t, 'phase_t': phase_t})
-        elif instruction.name == 'x':
-            native_inst = Instruction(name='prx', qubits=qubit_names, args={'angle_t': 0.5, 'phase_t': 0.0})
-        elif instruction.name == 'rx':
-            angle_t = float(instruction.params[0] / (2 * np.pi))
-            native_inst = Instruction(name='prx', qubits=qubit_names, args={'angle_t': angle_t, 'phase_t': 0.0})
-        elif instruction.name == 'y':
-            native_inst = Instruction(name='prx', qubits=qubit_names, args={'angle_t': 0.5, 'phase_t': 0.25})
-        elif instruction.name == 'ry':
-            angle_t = float(instruction.params[0] / (2 * np.pi))
-            native_inst = Instruction(name='prx', qubits=qubit_names, args={'angle_t': angle_t, 'phase_t': 0.25})
-        elif instruction.name == 'cz':
-            native_inst = Instruction(name='cz', qubits=qubit_names, args={})
-        elif instruction.name == 'move':
-            native_inst = Instruction(name='move', qubits=qubit_names, args={})
-        elif instruction.name == 'barrier':
-            native_inst = Instruction(name='barrier', qubits=qubit_names, args={})
-        elif instruction.name == 'delay':
-            duration = float(instruction.params[0])
-            # convert duration to seconds
-            unit = instruction.unit
-            if unit == 'dt':
-                duration *= 1e-9  # we arbitrarily pick dt == 1 ns
-            elif unit == 's':
-                pass
-            elif unit == 'ms':
-                duration *= 1e-3
-            elif unit == 'us':
-                duration *= 1e-6
-            elif unit == 'ns':
-                duration *= 1e-9
-            elif unit == 'ps':
-                duration *= 1e-12
-            else:
-                raise ValueError(f"Delay: Unsupported unit '{unit}'")
-            native_inst = Instruction(name='delay', qubits=qubit_names, args={'duration': duration})
-        elif instruction.name == 'measure':
-            if len(circuit_instruction.clbits) != 1:
-                raise ValueError(
-                    f'Unexpected: measurement instruction {circuit_instruction} uses multiple classical bits.'
-                )
-            clbit = circuit_instruction.clbits[0]  # always a single-qubit measurement
-            mk = str(MeasurementKey.from_clbit(clbit, circuit))
-            native_inst = Instruction(name='measure', qubits=qubit_names, args={'key': mk})
+    # the bit lookups are done once per circuit instead of once per instruction
+    qubit_to_name = {
+        qubit: qubit_index_to_name[idx] for idx, qubit in enumerate(circuit.qubits) if idx in qubit_index_to_name
+    }
+    clbit_to_key = {clbit: str(mk) for clbit, mk in MeasurementKey.table_for(circuit).items()}
+    # maps the qubits of an instruction to the names of the corresponding physical qubits
+    loci: dict[tuple[Qubit, ...], tuple[str, ...]] = {}
+
+    for instruction, qubits, clbits in operations:
+        name = instruction.name
+        qubit_names = loci.get(qubits)
+        if qubit_names is None:
+            qubit_names = loci[qubits] = tuple(qubit_to_name[qubit] for qubit in qubits)
+
+        if (converter := _INSTRUCTION_SERIALIZERS.get(name)) is not None:
+            native_name, args = converter(instruction)
+            native_inst = make_instruction(name=native_name, qubits=qubit_names, args=args)
+        elif name == 'measure':
+            if len(clbits) != 1:
+                raise ValueError(f'Unexpected: measurement instruction {instruction} uses multiple classical bits.')
+            clbit = clbits[0]  # always a single-qubit measurement
+            if clbit not in clbit_to_key:
+                raise ValueError(f'Measurement result of {instruction} must be stored in a classical register.')
+            mk = clbit_to_key[clbit]
+            native_inst = make_instruction(name='measure', qubits=qubit_names, args={'key': mk})
             clbit_to_measure[clbit] = native_inst
-        elif instruction.name == 'reset':
-            native_inst = Instruction(name='reset', qubits=qubit_names, args={})
-        elif instruction.name == 'id':
+        elif name == 'id':
             continue
-        elif instruction.name in allowed_nonnative_gates:
+        elif name in allowed_nonnative_gates:
             args = {f'p{i}': param for i, param in enumerate(instruction.params)}
-            native_inst = Instruction.model_construct(name=instruction.name, qubits=tuple(qubit_names), args=args)
+            native_inst = Instruction.model_construct(name=name, qubits=qubit_names, args=args)
         else:
             raise ValueError(
-                f"Instruction '{instruction.name}' in the circuit '{circuit.name}' is not natively supported. "
+                f"Instruction '{name}' in the circuit '{circuit.name}' is not natively supported. "
                 f'You need to transpile the circuit before execution.'
             )
 
@@ -189,7 +381,7 @@ def serialize_instructions(
         if condition is not None:
             if native_inst.name != 'prx':
                 raise ValueError(
-                    'This backend only supports conditionals on r, x, y, rx and ry gates,' f' not on {instruction.name}'
+                    'This backend only supports conditionals on r, x, y, rx and ry gates,' f' not on {name}'
                 )
             native_inst.name = 'cc_prx'
             creg, value = condition
@@ -216,9 +408,226 @@ def serialize_instructions(
             native_inst.args['feedback_qubit'] = physical_qubit_name
 
         instructions.append(native_inst)
+
+    if group_measurements:
+        return group_terminal_measurements(instructions, trusted=trusted)
     return instructions
 
 
+def group_terminal_measurements(instructions: list[Instruction], *, trusted: bool = False) -> list[Instruction]:
+    """Group the terminal measurements of serialized circuit into multi-qubit measurement instructions.
+
+    Qiskit measures each qubit using a separate instruction, so circuits that measure many qubits at the end
+    contain as many single-qubit ``measure`` instructions, each with its own measurement key. Since nothing happens to
+    a qubit after its terminal measurement, the terminal measurements can equally well be done simultaneously.
+    The terminal single-qubit measurements into each classical register are replaced by a single multi-qubit
+    ``measure`` instruction at the position of the last of them, with a key representing all of them (see
+    :meth:`MeasurementKey.join`). :class:`.IQMJob` splits the results of grouped measurements back into the
+    classical bits.
+
+    Measurements that are followed by other instructions on the same qubit, or that provide classical feedback,
+    are not grouped.
+
+    Args:
+        instructions: serialized instructions of a circuit
+        trusted: Same as in :func:`serialize_instructions`.
+
+    Returns:
+        instructions with the terminal measurements grouped
+    """
+    make_instruction = Instruction.model_construct if trusted else Instruction
+    # index of the last instruction acting on each qubit
+    last_use: dict[str, int] = {}
+    for idx, inst in enumerate(instructions):
+        for qubit in inst.qubits:
+            last_use[qubit] = idx
+
+    # indices of the terminal measurements into each classical register
+    groups: dict[tuple[str, int, int], list[int]] = {}
+    for idx, inst in enumerate(instructions):
+        if (
+            inst.name == 'measure'
+            and len(inst.qubits) == 1
+            and last_use[inst.qubits[0]] == idx
+            and 'feedback_key' not in inst.args
+        ):
+            mk = MeasurementKey.from_string(inst.args['key'])
+            groups.setdefault((mk.creg_name, mk.creg_len, mk.creg_idx), []).append(idx)
+
+    # maps the index of the last measurement in each group to the grouped measurement
+    grouped: dict[int, Instruction] = {}
+    removed: set[int] = set()
+    for indices in groups.values():
+        if len(indices) < 2:
+            continue
+        key = MeasurementKey.join([MeasurementKey.from_string(instructions[idx].args['key']) for idx in indices])
+        qubits = tuple(instructions[idx].qubits[0] for idx in indices)
+        grouped[indices[-1]] = make_instruction(name='measure', qubits=qubits, args={'key': key})
+        removed.update(indices[:-1])
+    if not grouped:
+        return instructions
+    return [grouped.get(idx, inst) for idx, inst in enumerate(instructions) if idx not in removed]
+
+
+_PARAMETRIC_ARGS: dict[str, tuple[str, ...]] = {'r': ('angle_t', 'phase_t'), 'rx': ('angle_t',), 'ry': ('angle_t',)}
+"""Names of the IQM instruction arguments corresponding to the parameters of parametric Qiskit gates."""
+
+
+class CircuitTemplate:
+    """Serialized parametric quantum circuit, into which parameter values can be bound without serializing it again.
+
+    Create templates using :meth:`.IQMBackend.serialize_template` or :func:`serialize_template`.
+
+    Args:
+        name: name of the circuit
+        instructions: Serialized instructions of the circuit, with placeholder values for the parametric arguments.
+        slots: For each parametric instruction argument, the index of the instruction in ``instructions``,
+            the name of the argument, and the parameter expression for the angle in radians.
+        parameters: Free parameters of the circuit, in the order of the columns of the values given to :meth:`bind`.
+        metadata: metadata to attach to the bound circuits
+    """
+
+    def __init__(
+        self,
+        name: str,
+        instructions: list[Instruction],
+        slots: list[tuple[int, str, ParameterExpression]],
+        parameters: list[Parameter],
+        metadata: Optional[dict[str, Any]] = None,
+    ):
+        # pylint: disable=too-many-arguments
+        self.name = name
+        self.instructions = tuple(instructions)
+        self.parameters = parameters
+        self.metadata = metadata
+        self._slots = [
+            (inst_idx, arg_name, _compile_expression(expression)) for inst_idx, arg_name, expression in slots
+        ]
+
+    def bind(self, values: np.ndarray) -> list[Circuit]:
+        """Bind parameter values into the template.
+
+        All the parametric arguments are evaluated for all the parameter sets at once, and only the parametric
+        instructions are created anew for each parameter set. The instructions have been validated when the template
+        was created, so the bound circuits are constructed without validation.
+
+        Args:
+            values: Parameter values with the shape ``(number of parameter sets, len(parameters))``.
+                The columns correspond to :attr:`parameters`.
+
+        Returns:
+            serialized circuits, one for each parameter set
+
+        Raises:
+            ValueError: ``values`` has the wrong shape
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 2 or values.shape[1] != len(self.parameters):
+            raise ValueError(
+                f'Expected parameter values with the shape (*, {len(self.parameters)}), got {values.shape}.'
+            )
+        num_sets = len(values)
+        columns = {parameter: values[:, i] for i, parameter in enumerate(self.parameters)}
+
+        # bound argument values, in units of full turns, for each parametric instruction
+        bound_args: dict[int, list[tuple[str, list[float]]]] = {}
+        for inst_idx, arg_name, evaluate in self._slots:
+            angles = np.broadcast_to(evaluate(columns), (num_sets,))
+            bound_args.setdefault(inst_idx, []).append((arg_name, (angles / (2 * np.pi)).tolist()))
+
+        circuits = []
+        for i in range(num_sets):
+            instructions = list(self.instructions)
+            for inst_idx, args in bound_args.items():
+                inst = instructions[inst_idx]
+                new_args = dict(inst.args)
+                for arg_name, arg_values in args:
+                    new_args[arg_name] = arg_values[i]
+                instructions[inst_idx] = Instruction.model_construct(
+                    name=inst.name, implementation=inst.implementation, qubits=inst.qubits, args=new_args
+                )
+            circuits.append(
+                Circuit.model_construct(name=self.name, instructions=tuple(instructions), metadata=self.metadata)
+            )
+        return circuits
+
+
+def _compile_expression(expression: ParameterExpression) -> Callable[[dict[Parameter, np.ndarray]], np.ndarray]:
+    """Compile a parameter expression into a vectorized function.
+
+    Args:
+        expression: expression to compile
+
+    Returns:
+        Function that maps the parameters to arrays of their values, and returns the values of the expression.
+    """
+    if isinstance(expression, Parameter):
+        return lambda columns: columns[expression]
+    import sympy  # pylint: disable=import-outside-toplevel
+
+    parameters = list(expression.parameters)
+    function = sympy.lambdify(
+        [sympy.sympify(parameter.sympify()) for parameter in parameters],
+        sympy.sympify(expression.sympify()),
+        'numpy',
+        dummify=True,
+    )
+    return lambda columns: np.real(function(*(columns[parameter] for parameter in parameters)))
+
+
+def serialize_template(
+    circuit: QiskitQuantumCircuit, qubit_index_to_name: dict[int, str], metadata: Optional[dict[str, Any]] = None
+) -> CircuitTemplate:
+    """Serialize a parametric quantum circuit into a template.
+
+    The parameters of ``r``, ``rx`` and ``ry`` gates may be arbitrary parameter expressions. Other parameters in
+    the circuit must be bound.
+
+    Args:
+        circuit: quantum circuit to serialize
+        qubit_index_to_name: Mapping from qubit indices to the corresponding qubit names.
+        metadata: metadata to attach to the bound circuits
+
+    Returns:
+        template for binding the parameters of the circuit
+
+    Raises:
+        ValueError: circuit contains an unsupported instruction, or a parameter that cannot be bound in a template
+    """
+    parameters = list(circuit.parameters)
+    # Serialize the circuit once with placeholder values in the parametric arguments, and record the parameter
+    # expressions that go into them. The expressions are only evaluated when the template is bound, since they may
+    # be undefined at the placeholder values.
+    placeholder = circuit.copy_empty_like()
+    slots: list[tuple[int, str, ParameterExpression]] = []
+    inst_idx = 0
+    for circuit_instruction in circuit.data:
+        operation = circuit_instruction.operation
+        if operation.name == 'id':
+            placeholder.append(circuit_instruction)
+            continue  # not serialized
+        arg_names = _PARAMETRIC_ARGS.get(operation.name, ())
+        params = list(operation.params)
+        for i, param in enumerate(params):
+            if isinstance(param, ParameterExpression) and param.parameters:
+                if i >= len(arg_names):
+                    raise ValueError(
+                        f"Parameter {i} of instruction '{operation.name}' in the circuit '{circuit.name}' "
+                        'cannot be bound in a template.'
+                    )
+                slots.append((inst_idx, arg_names[i], param))
+                params[i] = 0.0
+        if params != operation.params:
+            operation = operation.to_mutable()
+            operation.params = params
+            circuit_instruction = circuit_instruction.replace(operation=operation)
+        placeholder.append(circuit_instruction)
+        inst_idx += 1
+    instructions = serialize_instructions(placeholder, qubit_index_to_name)
+
+    return CircuitTemplate(circuit.name, instructions, slots, parameters, metadata)
+
+
 # pylint: disable=too-many-branches
 def deserialize_instructions(
     instructions: list[Instruction], qubit_name_to_index: dict[str, int], layout: Layout
@@ -236,24 +645,28 @@ def deserialize_instructions(
     Returns:
         Qiskit circuit represented by the given instructions.
     """
-    # maps measurement key to the corresponding clbit
-    mk_to_clbit: dict[str, Clbit] = {}
+    # pylint: disable=too-many-statements
+    # maps measurement key to the corresponding clbits, several for grouped measurements
+    mk_to_clbit: dict[str, tuple[Clbit, ...]] = {}
     # maps feedback key to the corresponding clbit
-    fk_to_clbit: dict[str, Clbit] = {}
+    fk_to_clbit: dict[str, tuple[Clbit, ...]] = {}
 
     # maps creg index to creg in the circuit
     cl_regs: dict[int, ClassicalRegister] = {}
 
-    def register_key(key: str, mapping: dict[str, Clbit]) -> None:
+    def register_key(key: str, mapping: dict[str, tuple[Clbit, ...]]) -> None:
         """Update the classical registers and the given key-to-clbit mapping with the given key."""
-        mk = MeasurementKey.from_string(key)
-        # find/create the corresponding creg
-        creg = cl_regs.setdefault(mk.creg_idx, ClassicalRegister(size=mk.creg_len, name=mk.creg_name))
+        mks = MeasurementKey.split(key)
+        # find/create the corresponding creg, grouped keys share it
+        mk = mks[0]
+        creg = cl_regs.get(mk.creg_idx)
+        if creg is None:
+            creg = cl_regs[mk.creg_idx] = ClassicalRegister(size=mk.creg_len, name=mk.creg_name)
         # add the key to the given mapping
-        if mk.clbit_idx < len(creg):
-            mapping[str(mk)] = creg[mk.clbit_idx]
-        else:
-            raise IndexError(f'{mk}: Clbit index {mk.clbit_idx} is out of range for {creg}.')
+        for mk in mks:
+            if mk.clbit_idx >= len(creg):
+                raise IndexError(f'{mk}: Clbit index {mk.clbit_idx} is out of range for {creg}.')
+        mapping[key] = tuple(creg[mk.clbit_idx] for mk in mks)
 
     for instr in instructions:
         if instr.name == 'measure':
@@ -275,33 +688,44 @@ def deserialize_instructions(
         *layout.get_registers(),
         *(cl_regs.get(i, ClassicalRegister(0)) for i in range(max(cl_regs) + 1 if cl_regs else 0)),
     )
+
+    # The instructions are appended without Qiskit's argument broadcasting and checks, since the loci are known to
+    # consist of distinct qubits of the circuit, and the clbits have been created above.
+    loci: dict[tuple[str, ...], tuple[Qubit, ...]] = {}
     for instr in instructions:
-        locus = [index_to_qiskit_qubit[qubit_name_to_index[q]] for q in instr.qubits]
-        if instr.name == 'prx':
+        name = instr.name
+        locus = loci.get(instr.qubits)
+        if locus is None:
+            locus = loci[instr.qubits] = tuple(index_to_qiskit_qubit[qubit_name_to_index[q]] for q in instr.qubits)
+        if name == 'prx':
             angle_t = instr.args['angle_t'] * 2 * np.pi
             phase_t = instr.args['phase_t'] * 2 * np.pi
-            circuit.r(angle_t, phase_t, locus[0])
-        elif instr.name == 'cz':
-            circuit.cz(*locus)
-        elif instr.name == 'move':
-            circuit.append(MoveGate(), locus)
-        elif instr.name == 'measure':
-            mk = MeasurementKey.from_string(instr.args['key'])
-            circuit.measure(locus[0], mk_to_clbit[str(mk)])
-        elif instr.name == 'barrier':
-            circuit.barrier(*locus)
-        elif instr.name == 'delay':
+            circuit._append(CircuitInstruction(RGate(angle_t, phase_t), locus))
+        elif name == 'cz':
+            circuit._append(CircuitInstruction(CZGate(), locus))
+        elif name == 'move':
+            circuit._append(CircuitInstruction(MoveGate(), locus))
+        elif name == 'measure':
+            # grouped measurements become one measurement per qubit, like in Qiskit
+            for qubit, clbit in zip(locus, mk_to_clbit[instr.args['key']]):
+                circuit._append(CircuitInstruction(Measure(), (qubit,), (clbit,)))
+        elif name == 'barrier':
+            circuit._append(CircuitInstruction(Barrier(len(locus)), locus))
+        elif name == 'delay':
             duration = instr.args['duration']
-            circuit.delay(duration, locus, unit='s')  # native delay instructions always use seconds
-        elif instr.name == 'cc_prx':
+            for qubit in locus:
+                # native delay instructions always use seconds
+                circuit._append(CircuitInstruction(Delay(duration, unit='s'), (qubit,)))
+        elif name == 'cc_prx':
             angle_t = instr.args['angle_t'] * 2 * np.pi
             phase_t = instr.args['phase_t'] * 2 * np.pi
             feedback_key = instr.args['feedback_key']
             # NOTE: 'feedback_qubit' is not needed, because in Qiskit you only have single-qubit measurements.
-            circuit.r(angle_t, phase_t, locus[0]).c_if(fk_to_clbit[feedback_key], 1)
-        elif instr.name == 'reset':
+            gate = RGate(angle_t, phase_t).c_if(fk_to_clbit[feedback_key][0], 1)
+            circuit._append(CircuitInstruction(gate, locus))
+        elif name == 'reset':
             for qubit in locus:
-                circuit.reset(qubit)
+                circuit._append(CircuitInstruction(Reset(), (qubit,)))
         else:
-            raise ValueError(f'Unsupported instruction {instr.name} in the circuit.')
+            raise ValueError(f'Unsupported instruction {name} in the circuit.')
     return circuit
@@ -0,0 +1,281 @@
+# Copyright 2025 Qiskit on IQM developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compact binary export of run requests, for staging, auditing and replaying them offline.
+
+The JSON representation of a :class:`~iqm.iqm_client.models.RunRequest` repeats the names of the operations, qubits
+and arguments of every instruction. The binary format stores each distinct string only once, and the instructions of
+each circuit column by column, with the angles and other numeric arguments as arrays of floats. The circuits are
+written and read one at a time, so large batches can be streamed without holding their serialized form in memory.
+
+File layout, all integers are little-endian:
+
+* magic bytes and the format version,
+* the options of the run request (everything except the circuits) and the number of circuits, as length-prefixed JSON,
+* one record per circuit:
+
+  * the strings used for the first time in this circuit, which are appended to the string table,
+  * the name (as an index into the string table) and the metadata (as length-prefixed JSON) of the circuit,
+  * length-prefixed arrays of the operation names, implementations, locus sizes, loci, argument names,
+    argument types, float arguments and string arguments of the instructions.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, nullcontext
+import json
+import os
+import struct
+from typing import IO, Any, Union
+
+import numpy as np
+
+from iqm.iqm_client import Circuit, Instruction, RunRequest
+
+MAGIC = b'IQMRUNRQ'
+"""Magic bytes at the start of an exported run request."""
+FORMAT_VERSION = 1
+"""Version of the export format."""
+
+_ARG_FLOAT = 0
+_ARG_STR = 1
+_ARG_JSON = 2
+_ARG_NAME_SEPARATOR = '\x1f'
+
+_U32 = struct.Struct('<I')
+
+Target = Union[str, os.PathLike, IO[bytes]]
+"""File path, or a binary file object to read from or write to."""
+
+
+def _open(target: Target, mode: str) -> AbstractContextManager[IO[bytes]]:
+    """Open a file path in the given binary mode, or use the given binary file object as is."""
+    if isinstance(target, (str, os.PathLike)):
+        return open(target, mode)  # pylint: disable=unspecified-encoding
+    return nullcontext(target)
+
+
+class _StringTable:
+    """Strings of an exported run request, indexed in the order of their first use."""
+
+    def __init__(self) -> None:
+        self.index: dict[str, int] = {}
+        self.new: list[str] = []
+        # maps the name, implementation, locus and argument names of an instruction to their string indices
+        self.heads: dict[tuple, tuple[int, int, int, tuple[int, ...], int]] = {}
+
+    def ref(self, string: str) -> int:
+        """Index of the given string, which is added to the table if it is not there yet."""
+        idx = self.index.get(string)
+        if idx is None:
+            idx = self.index[string] = len(self.index)
+            self.new.append(string)
+        return idx
+
+
+def _write_bytes(file: IO[bytes], data: bytes) -> None:
+    file.write(_U32.pack(len(data)))
+    file.write(data)
+
+
+def _read_exactly(file: IO[bytes], size: int) -> bytes:
+    data = file.read(size)
+    if len(data) != size:
+        raise ValueError('Unexpected end of the exported run request.')
+    return data
+
+
+def _read_u32(file: IO[bytes]) -> int:
+    return _U32.unpack(_read_exactly(file, _U32.size))[0]
+
+
+def _read_bytes(file: IO[bytes]) -> bytes:
+    return _read_exactly(file, _read_u32(file))
+
+
+def _write_array(file: IO[bytes], values: list, dtype: str) -> None:
+    file.write(_U32.pack(len(values)))
+    file.write(np.asarray(values, dtype=dtype).tobytes())
+
+
+def _read_array(file: IO[bytes], dtype: str) -> list:
+    length = _read_u32(file)
+    dt = np.dtype(dtype)
+    return np.frombuffer(_read_exactly(file, length * dt.itemsize), dtype=dt).tolist()
+
+
+def export_run_request(run_request: RunRequest, target: Target) -> None:
+    """Write a run request into a file in the compact binary format.
+
+    Args:
+        run_request: run request to export
+        target: path of the file, or a binary file object to write to
+    """
+    options = run_request.model_dump(mode='json', exclude={'circuits'})
+    header = {'options': options, 'num_circuits': len(run_request.circuits)}
+    strings = _StringTable()
+    with _open(target, 'wb') as file:
+        file.write(MAGIC)
+        file.write(struct.pack('<H', FORMAT_VERSION))
+        _write_bytes(file, json.dumps(header).encode())
+        for circuit in run_request.circuits:
+            _write_circuit(file, circuit, strings)
+
+
+def _write_circuit(file: IO[bytes], circuit: Circuit, strings: _StringTable) -> None:
+    """Write a single circuit record."""
+    # pylint: disable=too-many-locals
+    ref = strings.ref
+    heads = strings.heads
+    instruction_heads = []
+    loci: list[int] = []
+    arg_types: list[int] = []
+    floats: list[float] = []
+    refs: list[int] = []
+    for inst in circuit.instructions:
+        args = inst.args
+        # deep circuits consist of relatively few distinct operations, so their strings are looked up only once
+        head_key = (inst.name, inst.implementation, inst.qubits, tuple(args))
+        head = heads.get(head_key)
+        if head is None:
+            head = heads[head_key] = (
+                ref(inst.name),
+                0 if inst.implementation is None else ref(inst.implementation) + 1,
+                len(inst.qubits),
+                tuple(ref(qubit) for qubit in inst.qubits),
+                ref(_ARG_NAME_SEPARATOR.join(args)),
+            )
+        instruction_heads.append(head)
+        loci.extend(head[3])
+        for value in args.values():
+            if isinstance(value, float):
+                arg_types.append(_ARG_FLOAT)
+                floats.append(value)
+            elif isinstance(value, str):
+                arg_types.append(_ARG_STR)
+                refs.append(ref(value))
+            else:
+                arg_types.append(_ARG_JSON)
+                refs.append(ref(json.dumps(value)))
+    name = ref(circuit.name)
+
+    # the strings used for the first time in this circuit precede the references to them
+    file.write(_U32.pack(len(strings.new)))
+    for string in strings.new:
+        _write_bytes(file, string.encode())
+    strings.new.clear()
+
+    file.write(_U32.pack(name))
+    _write_bytes(file, json.dumps(circuit.metadata).encode())
+    _write_array(file, [head[0] for head in instruction_heads], '<u4')
+    _write_array(file, [head[1] for head in instruction_heads], '<u4')
+    _write_array(file, [head[2] for head in instruction_heads], '<u2')
+    _write_array(file, loci, '<u4')
+    _write_array(file, [head[4] for head in instruction_heads], '<u4')
+    _write_array(file, arg_types, '<u1')
+    _write_array(file, floats, '<f8')
+    _write_array(file, refs, '<u4')
+
+
+def iter_exported_circuits(target: Target, *, trusted: bool = False) -> Iterator[Circuit]:
+    """Read the circuits of an exported run request one at a time.
+
+    Args:
+        target: path of the file, or a binary file object to read from
+        trusted: Iff True, the circuits are constructed without validating them. Only use this for files that are
+            known to have been written by :func:`export_run_request`.
+
+    Yields:
+        the circuits of the run request, in order
+    """
+    with _open(target, 'rb') as file:
+        header = _read_header(file)
+        strings: list[str] = []
+        for _ in range(header['num_circuits']):
+            yield _read_circuit(file, strings, trusted)
+
+
+def load_run_request(target: Target, *, trusted: bool = False) -> RunRequest:
+    """Read a run request written by :func:`export_run_request`.
+
+    Args:
+        target: path of the file, or a binary file object to read from
+        trusted: Same as in :func:`iter_exported_circuits`.
+
+    Returns:
+        the run request
+    """
+    with _open(target, 'rb') as file:
+        header = _read_header(file)
+        strings: list[str] = []
+        circuits = [_read_circuit(file, strings, trusted) for _ in range(header['num_circuits'])]
+    run_request = RunRequest.model_validate(header['options'] | {'circuits': []})
+    run_request.circuits = circuits
+    return run_request
+
+
+def _read_header(file: IO[bytes]) -> dict[str, Any]:
+    """Check the magic bytes and the version of an exported run request, and read its header."""
+    if _read_exactly(file, len(MAGIC)) != MAGIC:
+        raise ValueError('Not an exported run request.')
+    (version,) = struct.unpack('<H', _read_exactly(file, 2))
+    if version != FORMAT_VERSION:
+        raise ValueError(f'Unsupported run request export format version {version}.')
+    return json.loads(_read_bytes(file))
+
+
+def _read_circuit(file: IO[bytes], strings: list[str], trusted: bool) -> Circuit:
+    """Read a single circuit record, adding the new strings in it to ``strings``."""
+    # pylint: disable=too-many-locals
+    for _ in range(_read_u32(file)):
+        strings.append(_read_bytes(file).decode())
+    name = strings[_read_u32(file)]
+    metadata = json.loads(_read_bytes(file))
+    ops = _read_array(file, '<u4')
+    implementations = _read_array(file, '<u4')
+    locus_sizes = _read_array(file, '<u2')
+    loci = iter(_read_array(file, '<u4'))
+    arg_names = _read_array(file, '<u4')
+    arg_types = iter(_read_array(file, '<u1'))
+    floats = iter(_read_array(file, '<f8'))
+    refs = iter(_read_array(file, '<u4'))
+
+    make_instruction = Instruction.model_construct if trusted else Instruction
+    # the argument names of each distinct signature are split only once
+    signatures: dict[int, list[str]] = {}
+    instructions = []
+    for op, implementation, locus_size, signature in zip(ops, implementations, locus_sizes, arg_names):
+        names = signatures.get(signature)
+        if names is None:
+            joined = strings[signature]
+            names = signatures[signature] = joined.split(_ARG_NAME_SEPARATOR) if joined else []
+        args = {}
+        for arg_name in names:
+            arg_type = next(arg_types)
+            if arg_type == _ARG_FLOAT:
+                args[arg_name] = next(floats)
+            elif arg_type == _ARG_STR:
+                args[arg_name] = strings[next(refs)]
+            else:
+                args[arg_name] = json.loads(strings[next(refs)])
+        instructions.append(
+            make_instruction(
+                name=strings[op],
+                implementation=strings[implementation - 1] if implementation else None,
+                qubits=tuple(strings[next(loci)] for _ in range(locus_size)),
+                args=args,
+            )
+        )
+    if trusted:
+        return Circuit.model_construct(name=name, instructions=tuple(instructions), metadata=metadata)
+    return Circuit(name=name, instructions=instructions, metadata=metadata)
@@ -0,0 +1,333 @@
+# Copyright 2025 Qiskit on IQM developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Cache of transpiled circuits, for transpiling the same circuits for the same calibration set repeatedly."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from importlib.metadata import PackageNotFoundError, version
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+from typing import Any, NamedTuple, Optional, Union
+
+import numpy as np
+from qiskit import QuantumCircuit, qpy
+from qiskit.circuit import ClassicalRegister, Clbit, ParameterExpression
+from qiskit.circuit.library import get_standard_gate_name_mapping
+
+from iqm.iqm_client import DynamicQuantumArchitecture
+from iqm.qiskit_iqm.move_gate import MoveGate
+
+_STANDARD_GATES = frozenset(get_standard_gate_name_mapping())
+
+
+def _package_version(package: str) -> str:
+    try:
+        return version(package)
+    except PackageNotFoundError:  # pragma: no cover
+        return 'unknown'
+
+
+# transpiled circuits are not reused across versions, which may transpile differently
+_VERSIONS = f'{_package_version("qiskit")} {_package_version("qiskit-iqm")}'
+
+
+class TranspilationCacheInfo(NamedTuple):
+    """Statistics of a :class:`.TranspilationCache`."""
+
+    hits: int
+    """Number of transpiled circuits found in memory."""
+    disk_hits: int
+    """Number of transpiled circuits found on disk."""
+    misses: int
+    """Number of circuits that were transpiled and added to the cache."""
+    maxsize: int
+    """Maximum number of transpiled circuits the cache can hold in memory."""
+    currsize: int
+    """Number of transpiled circuits currently in memory."""
+
+
+class TranspilationCache:
+    """Cache of transpiled circuits for :func:`.transpile_to_IQM`.
+
+    A transpiled circuit is looked up by a canonical hash of the circuit, and a fingerprint of the transpilation
+    target and options: the dynamic quantum architecture (including its calibration set ID), the error profile,
+    the qubits the target is restricted to, the initial layout, the scheduling options, and the keyword arguments
+    passed to the Qiskit transpiler, such as the optimization level and the seed. The versions of Qiskit and
+    Qiskit on IQM are also part of the fingerprint. Circuits or options that cannot be hashed canonically (e.g. an
+    initial layout given as a :class:`~qiskit.transpiler.Layout`, or metadata that is not JSON serializable) are
+    transpiled without the cache.
+
+    The parameters of a circuit are identified by their names, so a cached transpilation of a parametrized circuit
+    is returned with the parameters of the circuit being transpiled. Note that without ``seed_transpiler`` the
+    result of the first transpilation of a circuit is reused, even though the transpiler could produce a different
+    result each time.
+
+    Args:
+        maxsize: Maximum number of transpiled circuits kept in memory. When the cache is full, the least recently
+            used circuit is evicted.
+        directory: If given, the transpiled circuits are also stored in this directory in QPY format, and the
+            circuits not found in memory are looked up there, so they persist across sessions. QPY does not preserve
+            the time unit of delays, so circuits with delays in units other than ``dt`` are only kept in memory.
+    """
+
+    def __init__(self, maxsize: int = 128, directory: Optional[Union[str, os.PathLike]] = None):
+        if maxsize < 0:
+            raise ValueError(f'Transpilation cache size must be non-negative, got {maxsize}.')
+        self.maxsize = maxsize
+        self.directory = None if directory is None else Path(directory)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self._circuits: OrderedDict[str, QuantumCircuit] = OrderedDict()
+        # digests of the architectures, by identity, together with the architectures to keep the identities valid
+        self._architecture_digests: dict[int, tuple[DynamicQuantumArchitecture, str]] = {}
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    def key(
+        self, circuit: QuantumCircuit, architecture: DynamicQuantumArchitecture, options: dict[str, Any]
+    ) -> Optional[str]:
+        """Cache key of transpiling the given circuit for the given architecture.
+
+        Args:
+            circuit: circuit to transpile
+            architecture: architecture of the transpilation target
+            options: JSON serializable description of the rest of the target and the transpilation options
+
+        Returns:
+            the key, or None if the circuit or the options cannot be hashed canonically
+        """
+        circuit_hash = _circuit_digest(circuit)
+        if circuit_hash is None:
+            return None
+        try:
+            options_json = json.dumps(options, sort_keys=True, allow_nan=False)
+        except (TypeError, ValueError):
+            return None
+        entry = self._architecture_digests.get(id(architecture))
+        if entry is None or entry[0] is not architecture:
+            digest = hashlib.sha256(architecture.model_dump_json().encode()).hexdigest()
+            entry = self._architecture_digests[id(architecture)] = (architecture, digest)
+        key = hashlib.sha256()
+        for part in (_VERSIONS, circuit_hash, str(architecture.calibration_set_id), entry[1], options_json):
+            key.update(part.encode())
+            key.update(b'\0')
+        return key.hexdigest()
+
+    def get(self, key: str, circuit: QuantumCircuit) -> Optional[QuantumCircuit]:
+        """Transpiled circuit stored under the given key, or None if there is none.
+
+        Args:
+            key: cache key, see :meth:`key`
+            circuit: circuit being transpiled, whose name and parameters the returned circuit uses
+
+        Returns:
+            copy of the cached transpiled circuit, or None
+        """
+        transpiled = self._circuits.get(key)
+        if transpiled is not None:
+            self._circuits.move_to_end(key)
+            self._hits += 1
+        elif self.directory is not None:
+            transpiled = self._load(key)
+            if transpiled is not None:
+                self._disk_hits += 1
+                self._remember(key, transpiled)
+        if transpiled is None:
+            return None
+        result = transpiled.copy(name=circuit.name)
+        # parameters are identified by their names, the circuit being transpiled may use different objects
+        parameters = {parameter.name: parameter for parameter in circuit.parameters}
+        substitutions = {
+            cached: parameters[cached.name]
+            for cached in result.parameters
+            if cached.name in parameters and parameters[cached.name] != cached
+        }
+        if substitutions:
+            result.assign_parameters(substitutions, inplace=True)
+        return result
+
+    def put(self, key: str, transpiled: QuantumCircuit) -> None:
+        """Store a transpiled circuit under the given key.
+
+        Args:
+            key: cache key, see :meth:`key`
+            transpiled: the transpiled circuit, which is copied
+        """
+        self._misses += 1
+        transpiled = transpiled.copy()
+        self._remember(key, transpiled)
+        if self.directory is not None and not _has_non_dt_delays(transpiled):
+            # write atomically, so that concurrent readers never see a partial file
+            with tempfile.NamedTemporaryFile(dir=self.directory, suffix='.tmp', delete=False) as file:
+                qpy.dump(transpiled, file)
+            os.replace(file.name, self.directory / f'{key}.qpy')
+
+    def info(self) -> TranspilationCacheInfo:
+        """Return the statistics of the cache."""
+        return TranspilationCacheInfo(
+            hits=self._hits,
+            disk_hits=self._disk_hits,
+            misses=self._misses,
+            maxsize=self.maxsize,
+            currsize=len(self._circuits),
+        )
+
+    def clear(self, *, disk: bool = False) -> None:
+        """Empty the cache and reset its statistics.
+
+        Args:
+            disk: Iff True, also delete the transpiled circuits stored on disk.
+        """
+        self._circuits.clear()
+        self._architecture_digests.clear()
+        self._hits = self._disk_hits = self._misses = 0
+        if disk and self.directory is not None:
+            for path in self.directory.glob('*.qpy'):
+                path.unlink(missing_ok=True)
+
+    def _remember(self, key: str, transpiled: QuantumCircuit) -> None:
+        if self.maxsize == 0:
+            return
+        self._circuits[key] = transpiled
+        if len(self._circuits) > self.maxsize:
+            self._circuits.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[QuantumCircuit]:
+        """Load a transpiled circuit from disk. Unreadable files, e.g. written by an incompatible version of Qiskit,
+        count as missing."""
+        assert self.directory is not None
+        path = self.directory / f'{key}.qpy'
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as file:
+                transpiled = qpy.load(file)[0]
+        except Exception:  # pylint: disable=broad-except
+            return None
+        # QPY loads MOVE gates as plain gates without a unitary
+        for i, circuit_instruction in enumerate(transpiled.data):
+            if circuit_instruction.operation.name == 'move' and not isinstance(circuit_instruction.operation, MoveGate):
+                transpiled.data[i] = circuit_instruction.replace(operation=MoveGate())
+        return transpiled
+
+
+def _has_non_dt_delays(circuit: QuantumCircuit) -> bool:
+    """True iff the circuit has delays whose time unit is not ``dt``, which QPY does not preserve."""
+    return any(
+        circuit_instruction.operation.name == 'delay' and circuit_instruction.operation.unit != 'dt'
+        for circuit_instruction in circuit.data
+    )
+
+
+def _circuit_digest(circuit: QuantumCircuit) -> Optional[str]:
+    """Canonical hash of a quantum circuit.
+
+    Circuits with the same registers, instructions, global phase and metadata have the same hash, regardless of
+    the identities of their bits and parameters. Parameters are identified by their names. The name of the circuit
+    is not included.
+
+    Returns:
+        SHA-256 hex digest of the circuit, or None if the circuit cannot be hashed canonically
+    """
+    digest = hashlib.sha256()
+    try:
+        digest.update(json.dumps(circuit.metadata, sort_keys=True, allow_nan=False).encode())
+    except (TypeError, ValueError):
+        return None
+    if not _update_digest(digest, circuit):
+        return None
+    return digest.hexdigest()
+
+
+def _update_digest(digest: Any, circuit: QuantumCircuit) -> bool:
+    """Feed the structure of the circuit into the hash object.
+
+    Returns:
+        False iff the circuit contains something that cannot be hashed canonically
+    """
+    global_phase = _param_repr(circuit.global_phase)
+    if circuit.calibrations or global_phase is None:
+        return False
+    qubit_to_idx = {qubit: idx for idx, qubit in enumerate(circuit.qubits)}
+    clbit_to_idx = {clbit: idx for idx, clbit in enumerate(circuit.clbits)}
+    parts = [
+        repr([(qreg.name, [qubit_to_idx[qubit] for qubit in qreg]) for qreg in circuit.qregs]),
+        repr([(creg.name, [clbit_to_idx[clbit] for clbit in creg]) for creg in circuit.cregs]),
+        repr((circuit.num_qubits, circuit.num_clbits)),
+        global_phase,
+    ]
+    for part in parts:
+        digest.update(part.encode())
+    for circuit_instruction in circuit.data:
+        operation = circuit_instruction.operation
+        condition = getattr(operation, 'condition', None)
+        if condition is not None:
+            condition = _condition_repr(condition, clbit_to_idx)
+            if condition is None:
+                return False
+        params = []
+        for param in operation.params:
+            if isinstance(param, QuantumCircuit):
+                block = hashlib.sha256()
+                if not _update_digest(block, param):
+                    return False
+                params.append(block.hexdigest())
+            else:
+                param_repr = _param_repr(param)
+                if param_repr is None:
+                    return False
+                params.append(param_repr)
+        head = repr(
+            (
+                operation.name,
+                operation.num_qubits,
+                operation.num_clbits,
+                params,
+                operation.unit if operation.name == 'delay' else None,
+                tuple(qubit_to_idx[qubit] for qubit in circuit_instruction.qubits),
+                tuple(clbit_to_idx[clbit] for clbit in circuit_instruction.clbits),
+                condition,
+            )
+        )
+        digest.update(head.encode())
+        # custom gates with the same name can have different definitions
+        definition = None if operation.name in _STANDARD_GATES else getattr(operation, 'definition', None)
+        if definition is not None and not _update_digest(digest, definition):
+            return False
+    return True
+
+
+def _condition_repr(condition: tuple, clbit_to_idx: dict[Clbit, int]) -> Optional[str]:
+    """Canonical string representation of a classical condition, or None if there is none."""
+    bits, value = condition
+    if isinstance(bits, Clbit):
+        return repr((clbit_to_idx[bits], value))
+    if isinstance(bits, ClassicalRegister):
+        return repr((bits.name, tuple(clbit_to_idx[bit] for bit in bits), value))
+    return None
+
+
+def _param_repr(param: Any) -> Optional[str]:
+    """Canonical string representation of an instruction parameter, or None if there is none."""
+    if isinstance(param, ParameterExpression):
+        return f'expr:{param}'
+    if isinstance(param, (int, float, complex, str, np.number)):
+        return repr(param)
+    if isinstance(param, np.ndarray):
+        return f'array:{param.dtype}:{param.shape}:{hashlib.sha256(param.tobytes()).hexdigest()}'
+    return None
@@ -59,9 +59,15 @@ class IQMSchedulingPlugin(PassManagerStagePlugin):
         self, pass_manager_config: PassManagerConfig, optimization_level: Optional[int] = None
     ) -> PassManager:
         """Build scheduling stage PassManager"""
+        return self._scheduling_pass_manager(pass_manager_config, self.optimize_sqg)
 
+    def _scheduling_pass_manager(self, pass_manager_config: PassManagerConfig, optimize_sqg: bool) -> PassManager:
+        """Build the scheduling stage PassManager, optionally with single qubit gate optimization.
+
+        The plugin instances are shared by all the transpilations, so the options must not be modified here.
+        """
         scheduling = PassManager()
-        if self.optimize_sqg:
+        if optimize_sqg:
             scheduling.append(
                 IQMOptimizeSingleQubitGates(drop_final_rz=self.drop_final_rz, ignore_barriers=self.ignore_barriers)
             )
@@ -228,7 +234,5 @@ class IQMDefaultSchedulingPlugin(IQMSchedulingPlugin):
     def pass_manager(
         self, pass_manager_config: PassManagerConfig, optimization_level: Optional[int] = None
     ) -> PassManager:
-        """Build scheduling stage PassManager"""
-        if optimization_level == 0:
-            self.optimize_sqg = False
-        return super().pass_manager(pass_manager_config, optimization_level)
+        """Build scheduling stage PassManager, without single qubit gate optimization at optimization level 0."""
+        return self._scheduling_pass_manager(pass_manager_config, self.optimize_sqg and optimization_level != 0)
@@ -19,6 +19,7 @@ from qiskit.providers import JobV1
 from qiskit_aer.noise.noise_model import NoiseModel
 
 from iqm.qiskit_iqm.fake_backends.fake_adonis import IQMFakeAdonis
+from iqm.qiskit_iqm.fake_backends.fake_deneb import IQMFakeDeneb
 from iqm.qiskit_iqm.fake_backends.iqm_fake_backend import IQMFakeBackend
 
 
@@ -237,3 +238,43 @@ def test_validate_compatible_architecture(adonis_architecture, linear_3q_archite
     backend = IQMFakeAdonis()
     assert backend.validate_compatible_architecture(adonis_architecture) is True
     assert backend.validate_compatible_architecture(linear_3q_architecture) is False
+
+
+def test_target_carries_error_profile(backend):
+    """The instruction properties of the noise-aware target are estimated from the error profile."""
+    target = backend.get_noise_aware_target()
+    assert target is backend.get_noise_aware_target()
+    assert target["r"][(0,)].error == pytest.approx(0.0001 / 2)
+    assert target["r"][(0,)].duration == pytest.approx(1e-9)
+    assert target["r"][(2,)].error == 0
+    assert target["cz"][(0, 1)].error == pytest.approx(3 * 0.001 / 4)
+    assert target["cz"][(0, 1)].duration == pytest.approx(1.5e-9)
+    assert target["measure"][(1,)].error == pytest.approx(0.025)
+    assert target["measure"][(1,)].duration is None
+    assert target["delay"][(0,)] is None
+
+
+def test_default_targets_do_not_carry_error_profile(backend):
+    """The error profile does not affect the targets used by default, and thus the default transpilation results."""
+    for target in [backend.target, backend.restrict_to_qubits(["QB2", "QB3"])]:
+        for name in target.operation_names:
+            assert all(properties is None for properties in target[name].values())
+    assert backend.get_noise_aware_target().operation_names == backend.target.operation_names
+    assert set(backend.get_noise_aware_target()["cz"]) == set(backend.target["cz"])
+
+
+def test_restricted_target_carries_error_profile(backend):
+    target = backend.get_noise_aware_target().restrict_to_qubits(["QB2", "QB3"])
+    assert target["r"][(0,)].error == pytest.approx(0.0001 / 2)
+    assert target["cz"][(0, 1)].error == pytest.approx(3 * 0.001 / 4)
+    assert target.restrict_to_qubits([1])["measure"][(0,)].error == pytest.approx(0.025)
+
+
+def test_target_fake_cz_properties():
+    """The properties of a CZ routed via a resonator combine the MOVE and CZ properties."""
+    backend = IQMFakeDeneb()
+    cz = backend.get_noise_aware_target()["cz"][(0, 1)]
+    # the MOVE gates of fake Deneb are perfect
+    assert cz.error == pytest.approx(3 * 0.0128 / 4)
+    assert cz.duration == pytest.approx((2 * 96 + 120) * 1e-9)
+    assert backend.target["cz"][(0, 1)] is None
@@ -29,13 +29,16 @@ import requests
 from iqm.iqm_client import (
     APIConfig,
     APIVariant,
+    Circuit,
     CircuitCompilationOptions,
     CircuitValidationError,
     HeraldingMode,
+    Instruction,
     IQMClient,
     RunRequest,
+    validate_circuit,
 )
-from iqm.qiskit_iqm.iqm_provider import IQMBackend, IQMJob
+from iqm.qiskit_iqm.iqm_provider import IQMBackend, IQMJob, _deduplicate_circuits
 from tests.utils import get_mock_ok_response
 
 
@@ -621,3 +624,297 @@ def test_create_run_request(backend, circuit, create_run_request_default_kwargs,
 
     verifyNoUnwantedInteractions()
     unstub()
+
+
+@pytest.mark.parametrize('workers', [1, 2, None])
+def test_create_run_request_parallel_serialization(
+    backend, create_run_request_default_kwargs, run_request, workers, monkeypatch
+):
+    monkeypatch.setattr('iqm.qiskit_iqm.iqm_provider.PARALLEL_SERIALIZATION_THRESHOLD', 4)
+    circuits = []
+    for i in range(10):
+        circuit = QuantumCircuit(3, 2, name=f'circuit_{i}', metadata={'index': i})
+        circuit.r(0.1 * i, 0.2, i % 3)
+        circuit.cz(0, 1)
+        circuit.measure(0, 0)
+        circuit.x(1).c_if(circuit.clbits[0], 1)
+        if i % 4 == 0:
+            circuit.delay(10, 2, unit='us')
+        circuit.measure(1, 1)
+        circuits.append(circuit)
+    # cannot be stored in QPY
+    circuits[3].metadata = {'not serializable': object()}
+    # can be stored in QPY, but not in JSON
+    circuits[6].metadata = {'nan': float('nan')}
+
+    with pytest.warns(UserWarning) as record:
+        expected = [backend.serialize_circuit(circuit) for circuit in circuits]
+    assert len(record) == 2
+    when(backend.client).create_run_request(expected, **create_run_request_default_kwargs).thenReturn(run_request)
+
+    with pytest.warns(UserWarning) as record:
+        assert backend.create_run_request(circuits, serialization_workers=workers) == run_request
+    assert sorted(str(w.message) for w in record) == [
+        f'Metadata of circuit circuit_{i} was dropped because it could not be serialised to JSON.' for i in (3, 6)
+    ]
+
+
+def test_serialization_cache_disabled_by_default(backend, circuit):
+    circuit.cz(0, 1)
+    backend.serialize_circuit(circuit)
+    assert backend.serialization_cache_size == 0
+    assert backend.serialization_cache_info() == (0, 0, 0, 0)
+
+
+def test_serialization_cache(backend):
+    backend.serialization_cache_size = 2
+
+    def make_circuit(angle: float, name: str, metadata: dict) -> QuantumCircuit:
+        circuit = QuantumCircuit(3, 1, name=name, metadata=metadata)
+        circuit.r(angle, 0, 0)
+        circuit.cz(0, 1)
+        circuit.measure(1, 0)
+        return circuit
+
+    first = backend.serialize_circuit(make_circuit(0.5, 'first', {'a': 1}))
+    second = backend.serialize_circuit(make_circuit(0.5, 'second', {'a': 1}))
+    assert second.name == 'second'
+    assert second.instructions == first.instructions
+    assert backend.serialization_cache_info() == (1, 1, 2, 1)
+
+    # different parameters, metadata or qubit mapping miss the cache
+    other = backend.serialize_circuit(make_circuit(0.25, 'other', {'a': 1}))
+    assert other.instructions[0].args['angle_t'] == 0.25 / (2 * np.pi)
+    backend.serialize_circuit(make_circuit(0.5, 'other', {'a': 2}))
+    remapped = backend.serialize_circuit(make_circuit(0.5, 'first', {'a': 1}), {0: 'QB3', 1: 'QB2', 2: 'QB1'})
+    assert remapped.instructions[0].qubits == ('QB3',)
+    assert backend.serialization_cache_info() == (1, 4, 2, 2)
+
+    # the least recently used circuit has been evicted
+    backend.serialize_circuit(make_circuit(0.5, 'first', {'a': 1}))
+    assert backend.serialization_cache_info() == (1, 5, 2, 2)
+
+    backend.serialization_cache_size = 1
+    assert backend.serialization_cache_info().currsize == 1
+    backend.clear_serialization_cache()
+    assert backend.serialization_cache_info() == (0, 0, 1, 0)
+
+
+def test_serialization_cache_returns_own_metadata(backend):
+    backend.serialization_cache_size = 2
+    circuit = QuantumCircuit(2, 1, metadata={'sweep': {'point': 1}})
+    circuit.cz(0, 1)
+    circuit.measure(1, 0)
+    first = backend.serialize_circuit(circuit)
+    first.metadata['sweep']['point'] = 2
+    second = backend.serialize_circuit(circuit)
+    assert backend.serialization_cache_info().hits == 1
+    assert second.metadata == {'sweep': {'point': 1}}
+    second.metadata['extra'] = True
+    assert backend.serialize_circuit(circuit).metadata == {'sweep': {'point': 1}}
+
+
+def test_serialization_cache_distinguishes_registers(backend):
+    backend.serialization_cache_size = 10
+    circuit_1 = QuantumCircuit(QuantumRegister(2), ClassicalRegister(1, 'a'), ClassicalRegister(1, 'b'))
+    circuit_1.measure(0, 1)
+    circuit_2 = QuantumCircuit(QuantumRegister(2), ClassicalRegister(2, 'a'))
+    circuit_2.measure(0, 1)
+    key_1 = backend.serialize_circuit(circuit_1).instructions[0].args['key']
+    key_2 = backend.serialize_circuit(circuit_2).instructions[0].args['key']
+    assert key_1 != key_2
+    assert backend.serialization_cache_info().hits == 0
+
+
+def test_serialization_cache_skips_unserializable_metadata(backend, circuit):
+    backend.serialization_cache_size = 10
+    circuit.cz(0, 1)
+    circuit.metadata = {'not serializable': object()}
+    with pytest.warns(UserWarning, match='Metadata of circuit'):
+        backend.serialize_circuit(circuit)
+    assert backend.serialization_cache_info() == (0, 0, 10, 0)
+
+
+def test_serialization_cache_size_must_be_non_negative(backend):
+    with pytest.raises(ValueError, match='must be non-negative'):
+        backend.serialization_cache_size = -1
+
+
+def test_serialize_circuit_trusted(backend):
+    circuit = QuantumCircuit(3, 2, name='trusted', metadata={'a': 1})
+    circuit.r(0.3, 0.2, 0)
+    circuit.x(1)
+    circuit.cz(0, 1)
+    circuit.barrier()
+    circuit.delay(10, 2, unit='ns')
+    circuit.measure(0, 0)
+    circuit.ry(0.1, 1).c_if(circuit.clbits[0], 1)
+    circuit.measure(1, 1)
+    circuit.reset(2)
+
+    trusted = backend.serialize_circuit(circuit, trusted=True)
+    assert trusted == backend.serialize_circuit(circuit)
+    validate_circuit(trusted)
+
+
+def test_serialize_circuit_trusted_skips_validation(backend):
+    backend.serialization_cache_size = 2
+    circuit = QuantumCircuit(3, name='empty')
+    trusted = backend.serialize_circuit(circuit, trusted=True)
+    assert trusted.instructions == ()
+    with pytest.raises(ValueError, match='at least one instruction'):
+        validate_circuit(trusted)
+    # unvalidated circuits are not returned from the cache for untrusted calls
+    with pytest.raises(ValueError, match='at least one instruction'):
+        backend.serialize_circuit(circuit)
+
+
+def test_create_run_request_trusted(backend, circuit, create_run_request_default_kwargs, run_request):
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure(1, 0)
+    circuit_transpiled = transpile(circuit, backend, optimization_level=0)
+    circuit_serialized = backend.serialize_circuit(circuit_transpiled)
+
+    when(backend.client).create_run_request([circuit_serialized], **create_run_request_default_kwargs).thenReturn(
+        run_request
+    )
+    assert backend.create_run_request(circuit_transpiled, trusted=True) == run_request
+
+
+def test_create_run_request_group_measurements(backend, create_run_request_default_kwargs, run_request):
+    circuit = QuantumCircuit(3, 3)
+    circuit.cz(0, 1)
+    circuit.measure([0, 1, 2], [0, 1, 2])
+    mapping = backend._idx_to_qb
+    circuit_serialized = Circuit(
+        name=circuit.name,
+        instructions=[
+            Instruction(name='cz', qubits=(mapping[0], mapping[1]), args={}),
+            Instruction(name='measure', qubits=(mapping[0], mapping[1], mapping[2]), args={'key': 'c_3_0_0.1.2'}),
+        ],
+        metadata={},
+    )
+    assert backend.serialize_circuit(circuit, group_measurements=True) == circuit_serialized
+
+    when(backend.client).create_run_request([circuit_serialized], **create_run_request_default_kwargs).thenReturn(
+        run_request
+    )
+    assert backend.create_run_request(circuit, group_measurements=True) == run_request
+
+
+def test_serialization_cache_group_measurements(backend):
+    backend.serialization_cache_size = 8
+    circuit = QuantumCircuit(2, 2)
+    circuit.measure([0, 1], [0, 1])
+    assert len(backend.serialize_circuit(circuit).instructions) == 2
+    assert len(backend.serialize_circuit(circuit, group_measurements=True).instructions) == 1
+    assert backend.serialization_cache_info().misses == 2
+
+
+@pytest.mark.parametrize('sum_shots', [False, True])
+def test_create_run_request_deduplicate_circuits(backend, create_run_request_default_kwargs, run_request, sum_shots):
+    circuits = []
+    for i, qubit in enumerate([0, 1, 0, 0]):
+        circuit = QuantumCircuit(3, 1, name=f'circuit_{i}')
+        circuit.measure(qubit, 0)
+        circuit.metadata = {'index': i}
+        circuits.append(circuit)
+    serialized = [backend.serialize_circuit(circuit) for circuit in circuits]
+    duplicates = {
+        'circuits': [[i, f'circuit_{i}', {'index': i}] for i in (0, 2, 3)],
+        # circuit_1 has no copies, so summing the shots would give it extra shots
+        'split_shots': False,
+    }
+    expected = [serialized[0].model_copy(update={'metadata': {'qiskit_iqm_duplicates': duplicates}}), serialized[1]]
+    kwargs = create_run_request_default_kwargs | {'shots': 1024}
+    when(backend.client).create_run_request(expected, **kwargs).thenReturn(run_request)
+
+    assert backend.create_run_request(circuits, deduplicate_circuits=True, sum_duplicate_shots=sum_shots) == run_request
+
+
+def test_create_run_request_sum_duplicate_shots(backend, create_run_request_default_kwargs, run_request):
+    """The shots are summed when every circuit has equally many copies."""
+    circuits = []
+    for i, qubit in enumerate([0, 1, 0, 1]):
+        circuit = QuantumCircuit(3, 1, name=f'circuit_{i}')
+        circuit.measure(qubit, 0)
+        circuits.append(circuit)
+    serialized = [backend.serialize_circuit(circuit) for circuit in circuits]
+    expected = [
+        serialized[first].model_copy(
+            update={
+                'metadata': {
+                    'qiskit_iqm_duplicates': {
+                        'circuits': [[i, f'circuit_{i}', {}] for i in (first, first + 2)],
+                        'split_shots': True,
+                    }
+                }
+            }
+        )
+        for first in (0, 1)
+    ]
+    kwargs = create_run_request_default_kwargs | {'shots': 2 * 1024}
+    when(backend.client).create_run_request(expected, **kwargs).thenReturn(run_request)
+
+    assert backend.create_run_request(circuits, deduplicate_circuits=True, sum_duplicate_shots=True) == run_request
+
+
+@pytest.mark.parametrize('copies', [[1, 4, 2], [2, 2, 2], [3, 1]])
+def test_deduplicated_circuits_get_the_requested_shots(backend, copies):
+    """Every circuit of the batch gets exactly the requested number of shots, also with mixed numbers of copies."""
+    shots = 10
+    circuits = []
+    for qubit, n_copies in enumerate(copies):
+        circuit = QuantumCircuit(3, 1)
+        circuit.measure(qubit, 0)
+        circuits.extend(circuit.copy(name=f'circuit_{qubit}_{j}') for j in range(n_copies))
+    serialized = [backend.serialize_circuit(circuit) for circuit in circuits]
+
+    unique, request_shots = _deduplicate_circuits(serialized, shots, sum_shots=True)
+    assert request_shots == (shots * copies[0] if len(set(copies)) == 1 else shots)
+    results = [(circuit.name, ['0'] * request_shots) for circuit in unique]
+    fanned_out, _ = IQMJob._fan_out_duplicates(results, [circuit.metadata for circuit in unique])
+
+    assert [name for name, _ in fanned_out] == [circuit.name for circuit in circuits]
+    assert all(len(memory) == shots for _, memory in fanned_out)
+
+
+def test_create_run_request_deduplicate_circuits_without_duplicates(
+    backend, circuit, create_run_request_default_kwargs, run_request
+):
+    circuit.measure(0, 0)
+    other = circuit.copy()
+    other.measure(1, 1)
+    expected = [backend.serialize_circuit(circuit), backend.serialize_circuit(other)]
+    when(backend.client).create_run_request(expected, **create_run_request_default_kwargs).thenReturn(run_request)
+    assert backend.create_run_request([circuit, other], deduplicate_circuits=True) == run_request
+
+
+def test_run_sweep(backend, create_run_request_default_kwargs, job_id, run_request):
+    theta = Parameter('theta')
+    circuit = QuantumCircuit(3, 1, name='sweep')
+    circuit.r(theta, 0, 0)
+    circuit.cz(0, 1)
+    circuit.measure(0, 0)
+    circuit.metadata = {'experiment': 'sweep'}
+    values = np.linspace(0, np.pi, 4).reshape(-1, 1)
+
+    # assign_parameters renames the circuit, run_sweep keeps the original name
+    expected = [
+        backend.serialize_circuit(circuit.assign_parameters(row)).model_copy(update={'name': 'sweep'}) for row in values
+    ]
+    when(backend.client).create_run_request(expected, **create_run_request_default_kwargs).thenReturn(run_request)
+    when(backend.client).submit_run_request(run_request).thenReturn(job_id)
+
+    job = backend.run_sweep(circuit, values)
+    assert job.job_id() == str(job_id)
+    job = backend.run_sweep(backend.serialize_template(circuit), values)
+    assert job.job_id() == str(job_id)
+
+
+def test_run_sweep_empty(backend):
+    circuit = QuantumCircuit(3)
+    circuit.rx(Parameter('theta'), 0)
+    with pytest.raises(ValueError, match='Empty list of circuits submitted for execution.'):
+        backend.run_sweep(circuit, np.zeros((0, 1)))
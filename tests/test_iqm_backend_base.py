@@ -14,14 +14,23 @@
 
 """Testing IQM backend.
 """
+import copy
+import itertools
+import pickle
 from typing import Optional
 
 import pytest
-from qiskit import QuantumCircuit
+from qiskit import QuantumCircuit, QuantumRegister
 from qiskit.compiler import transpile
 from qiskit.providers import Options
+from qiskit.transpiler import Layout, PassManagerConfig
 
-from iqm.qiskit_iqm.iqm_backend import IQMBackendBase
+from iqm.qiskit_iqm import iqm_backend, transpile_to_IQM
+from iqm.qiskit_iqm.fake_backends import IQMFakeAdonis, IQMFakeDeneb
+from iqm.qiskit_iqm.iqm_backend import RESTRICTED_TARGET_CACHE_SIZE, IQMBackendBase
+from iqm.qiskit_iqm.iqm_move_layout import generate_initial_layout
+from iqm.qiskit_iqm.iqm_transpilation import IQMOptimizeSingleQubitGates
+from iqm.qiskit_iqm.transpiler_plugins import IQMDefaultSchedulingPlugin
 
 
 class DummyIQMBackend(IQMBackendBase):
@@ -78,3 +87,150 @@ def test_transpile(backend):
             idx1 = circuit_transpiled.find_bit(qubits[0]).index
             idx2 = circuit_transpiled.find_bit(qubits[1]).index
             assert ((idx1, idx2) in cmap) or ((idx2, idx1) in cmap)
+
+
+def test_targets_are_built_lazily(move_architecture):
+    backend = DummyIQMBackend(move_architecture)
+    assert backend._fake_target_with_moves is None
+    assert backend._real_target is None
+    assert backend._coupling_map is None
+
+    target_with_resonators = backend.target_with_resonators
+    assert 'move' in target_with_resonators.operation_names
+    assert backend.target_with_resonators is target_with_resonators
+
+    real_target = backend.get_real_target()
+    assert 'move' in real_target.operation_names
+    assert backend.get_real_target() is real_target
+
+    assert backend.coupling_map is backend.coupling_map
+
+
+def test_target_with_resonators_without_move(backend):
+    assert backend.target_with_resonators is backend.target
+    assert backend._fake_target_with_moves is None
+
+
+def test_get_pass_manager_is_memoized(backend):
+    pass_manager = backend.get_pass_manager(1, seed_transpiler=42, initial_layout=[0, 1, 2])
+    assert backend.get_pass_manager(1, seed_transpiler=42, initial_layout=[0, 1, 2]) is pass_manager
+    assert backend.get_pass_manager(optimization_level=1, initial_layout=[0, 1, 2], seed_transpiler=42) is pass_manager
+    assert backend.get_pass_manager(1, seed_transpiler=43, initial_layout=[0, 1, 2]) is not pass_manager
+    assert backend.get_pass_manager(2, seed_transpiler=42, initial_layout=[0, 1, 2]) is not pass_manager
+    # options that cannot be hashed by value are not memoized
+    layout = Layout.generate_trivial_layout(QuantumRegister(3, 'q'))
+    assert backend.get_pass_manager(1, initial_layout=layout) is not backend.get_pass_manager(1, initial_layout=layout)
+
+
+def test_get_pass_manager_matches_transpile(backend):
+    circuit = QuantumCircuit(3, 3)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.cx(1, 2)
+    circuit.measure([0, 1, 2], [0, 1, 2])
+    pass_manager = backend.get_pass_manager(1, seed_transpiler=42)
+    expected = transpile(circuit, backend=backend, optimization_level=1, seed_transpiler=42)
+    for _ in range(2):
+        assert pass_manager.run(circuit) == expected
+
+
+def scheduling_tasks(pass_manager):
+    """Passes of the scheduling stage of a staged pass manager."""
+    return pass_manager.scheduling.to_flow_controller().tasks
+
+
+def test_get_pass_manager_does_not_mutate_options(backend):
+    """Pass managers of different optimization levels do not affect each other, nor the options given."""
+    options = {'seed_transpiler': 42, 'initial_layout': [2, 1, 0]}
+    level_0 = backend.get_pass_manager(0, **options)
+    level_1 = backend.get_pass_manager(1, **options)
+    assert options == {'seed_transpiler': 42, 'initial_layout': [2, 1, 0]}
+    assert not any(isinstance(task, IQMOptimizeSingleQubitGates) for task in scheduling_tasks(level_0))
+    assert any(isinstance(task, IQMOptimizeSingleQubitGates) for task in scheduling_tasks(level_1))
+
+
+def test_default_scheduling_plugin_is_not_mutated(backend):
+    plugin = IQMDefaultSchedulingPlugin()
+    config = PassManagerConfig(target=backend.target)
+    plugin.pass_manager(config, optimization_level=0)
+    assert plugin.optimize_sqg is True
+    tasks = plugin.pass_manager(config, optimization_level=1).to_flow_controller().tasks
+    assert any(isinstance(task, IQMOptimizeSingleQubitGates) for task in tasks)
+
+
+@pytest.fixture
+def count_restrictions(monkeypatch):
+    """Count the restricted targets built from the architecture."""
+    calls = []
+    restrict = iqm_backend._restrict_dqa_to_qubits
+
+    def counting_restrict(*args, **kwargs):
+        calls.append(args)
+        return restrict(*args, **kwargs)
+
+    monkeypatch.setattr(iqm_backend, '_restrict_dqa_to_qubits', counting_restrict)
+    return calls
+
+
+def target_summary(target):
+    return target.physical_qubits, sorted((op.name, qargs) for op, qargs in target.instructions)
+
+
+def test_restrict_to_qubits_is_memoized(adonis_architecture, count_restrictions):
+    backend = DummyIQMBackend(adonis_architecture)
+    restricted = backend.restrict_to_qubits(['QB4', 'QB3', 'QB1'])
+    assert backend.restrict_to_qubits([3, 2, 0]) is restricted
+    assert len(count_restrictions) == 1
+    # the order of the qubits defines their indices in the restricted target
+    assert backend.restrict_to_qubits(['QB1', 'QB3', 'QB4']) is not restricted
+    assert backend.restrict_to_qubits(['QB4', 'QB3', 'QB1'], include_fake_czs=False) is not restricted
+    assert len(count_restrictions) == 3
+
+    target_restricted = backend.target.restrict_to_qubits(['QB4', 'QB3', 'QB1'])
+    assert backend.target.restrict_to_qubits([3, 2, 0]) is target_restricted
+    assert len(count_restrictions) == 4
+    assert target_summary(target_restricted) == target_summary(restricted)
+
+
+def test_restrict_to_qubits_cache_is_bounded(adonis_architecture, count_restrictions):
+    backend = DummyIQMBackend(adonis_architecture)
+    restrictions = list(itertools.permutations(range(5), 4))[: RESTRICTED_TARGET_CACHE_SIZE + 1]
+    first = backend.target.restrict_to_qubits(list(restrictions[0]))
+    for restriction in restrictions[1:]:
+        backend.target.restrict_to_qubits(list(restriction))
+    assert len(count_restrictions) == RESTRICTED_TARGET_CACHE_SIZE + 1
+    # the least recently used restriction was evicted, and is built again
+    rebuilt = backend.target.restrict_to_qubits(list(restrictions[0]))
+    assert rebuilt is not first
+    assert len(count_restrictions) == RESTRICTED_TARGET_CACHE_SIZE + 2
+    assert target_summary(rebuilt) == target_summary(first)
+
+
+def test_restricted_targets_are_not_copied_with_the_target(adonis_architecture):
+    backend = DummyIQMBackend(adonis_architecture)
+    backend.target.restrict_to_qubits([0, 2])
+    assert not pickle.loads(pickle.dumps(backend.target))._iqm_restricted_targets
+    assert not copy.deepcopy(backend.target)._iqm_restricted_targets
+
+
+def test_generate_initial_layout_reuses_restricted_target(count_restrictions):
+    backend = IQMFakeDeneb()
+    circuit = QuantumCircuit(2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    layouts = [
+        generate_initial_layout(backend, circuit, restrict_to_qubits=['QB1', 'QB2', 'QB3', 'CR1']) for _ in range(2)
+    ]
+    assert layouts[0] == layouts[1]
+    assert len(count_restrictions) == 1
+
+
+def test_transpile_to_IQM_reuses_restricted_target(count_restrictions):
+    backend = IQMFakeAdonis()
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure([0, 1], [0, 1])
+    transpiled = [transpile_to_IQM(circuit, backend, restrict_to_qubits=['QB1', 'QB3', 'QB2']) for _ in range(2)]
+    assert transpiled[0] == transpiled[1]
+    assert len(count_restrictions) == 1
@@ -186,6 +186,62 @@ def test_result(job, iqm_result_two_registers, iqm_metadata):
     assert job._timeout_seconds is not None
 
 
+def test_result_grouped_measurements(job, iqm_result_two_registers, iqm_metadata):
+    # the clbits of 'c' are measured by a single measurement, in the reverse order of the qubits
+    grouped_result = {
+        'c_2_0_1.0': [[1, 1], [1, 0], [0, 1], [1, 0]],
+        'd_4_1_2': iqm_result_two_registers['d_4_1_2'],
+    }
+    client_result = RunResult(status=Status.READY, measurements=[grouped_result], metadata=iqm_metadata)
+    when(job._client).wait_for_results(uuid.UUID(job.job_id()), job._timeout_seconds).thenReturn(client_result)
+
+    result = job.result()
+
+    assert result.get_memory() == ['0100 11', '0100 10', '0100 01', '0100 10']
+
+
+def test_format_measurement_results_wrong_shape():
+    with pytest.raises(ValueError, match=r'c_2_0_0 has the wrong shape \(2, 2\), expected \(\*, 1\)'):
+        IQMJob._format_measurement_results({'c_2_0_0': [[0, 1], [1, 1]]}, 2)
+    with pytest.raises(ValueError, match=r'c_2_0_0.1 has the wrong shape \(2, 1\), expected \(\*, 2\)'):
+        IQMJob._format_measurement_results({'c_2_0_0.1': [[0], [1]]}, 2)
+
+
+@pytest.mark.parametrize('split_shots', [False, True])
+def test_result_deduplicated_circuits(job, split_shots):
+    duplicates = {
+        'circuits': [[0, 'circuit_0', {'a': 0}], [2, 'circuit_2', {'a': 2}], [3, 'circuit_3', None]],
+        'split_shots': split_shots,
+    }
+    instructions = [{'name': 'measure', 'qubits': ['0'], 'args': {'key': 'm1'}}]
+    iqm_metadata = {
+        'calibration_set_id': '9d75904b-0c93-461f-b1dc-bd200cfad1f1',
+        'request': {
+            'shots': 6,
+            'circuits': [
+                {'name': 'circuit_0', 'instructions': instructions, 'metadata': {'qiskit_iqm_duplicates': duplicates}},
+                {'name': 'circuit_1', 'instructions': instructions, 'metadata': {'a': 1}},
+            ],
+            'calibration_set_id': '9d75904b-0c93-461f-b1dc-bd200cfad1f1',
+            'qubit_mapping': [SingleQubitMapping(logical_name='0', physical_name='QB1')],
+        },
+    }
+    measurements = [{'c_1_0_0': [[0], [1], [0], [1], [1], [1]]}, {'c_1_0_0': [[0]] * 6}]
+    client_result = RunResult(status=Status.READY, measurements=measurements, metadata=iqm_metadata)
+    when(job._client).wait_for_results(uuid.UUID(job.job_id()), job._timeout_seconds).thenReturn(client_result)
+
+    result = job.result()
+
+    assert [r.header.name for r in result.results] == ['circuit_0', 'circuit_1', 'circuit_2', 'circuit_3']
+    assert [r.data.metadata for r in result.results] == [{'a': 0}, {'a': 1}, {'a': 2}, None]
+    assert result.get_memory(1) == ['0'] * 6
+    if split_shots:
+        assert [result.get_memory(i) for i in (0, 2, 3)] == [['0', '1'], ['0', '1'], ['1', '1']]
+    else:
+        for i in (0, 2, 3):
+            assert result.get_memory(i) == ['0', '1', '0', '1', '1', '1']
+
+
 def test_result_no_shots(job, iqm_result_no_shots, iqm_metadata):
     iqm_metadata['request']['heralding_mode'] = HeraldingMode.ZEROS
     client_result = RunResult(
@@ -242,3 +242,128 @@ def test_generate_initial_layout_many_moves():
     # move qubit(s)
     for k in range(1, n):
         assert layout[qreg[k]] in (1, 2, 3)  # QB2-4 have moves
+
+
+def star_architecture(num_qubits, num_resonators, move_qubits):
+    """Star architecture where every qubit has a CZ with every resonator, and the given qubits also have MOVEs."""
+    qubits = [f'QB{i + 1}' for i in range(num_qubits)]
+    resonators = [f'CR{i + 1}' for i in range(num_resonators)]
+    loci_1q = tuple((q,) for q in qubits)
+
+    def gate(loci):
+        return GateInfo(
+            implementations={'impl': GateImplementationInfo(loci=loci)},
+            default_implementation='impl',
+            override_default_implementation={},
+        )
+
+    return DynamicQuantumArchitecture(
+        calibration_set_id=UUID('26c5e70f-bea0-43af-bd37-6212ec7d04cb'),
+        qubits=qubits,
+        computational_resonators=resonators,
+        gates={
+            'prx': gate(loci_1q),
+            'cz': gate(tuple((q, r) for q in qubits for r in resonators)),
+            'move': gate(tuple((qubits[i], r) for i in move_qubits for r in resonators)),
+            'measure': gate(loci_1q),
+        },
+    )
+
+
+def assert_valid_layout(backend, qc, initial_layout):
+    """All the gates of the circuit are available on the mapped loci."""
+    target = backend.get_real_target()
+    layout = initial_layout.get_virtual_bits()
+    for instruction in qc.data:
+        name = instruction.operation.name
+        if name == 'barrier':
+            continue
+        locus = tuple(layout[qubit] for qubit in instruction.qubits)
+        assert target.instruction_supported('r' if name == 'h' else name, locus)
+
+
+def test_generate_initial_layout_multiple_resonators(hypothetical_fake_architecture):
+    """Initial layout generation maps each logical resonator to its own computational resonator."""
+    backend = MockBackend(hypothetical_fake_architecture)
+    # resonators 4 and 5, qubit 0 is moved into both of them
+    qc = IQMCircuit(6, 4)
+    qc.h(0)
+    qc.move(0, 4)
+    qc.cz(1, 4)
+    qc.move(0, 4)
+    qc.move(0, 5)
+    qc.cz(2, 5)
+    qc.cz(3, 5)
+    qc.move(0, 5)
+    qc.measure(range(4), range(4))
+
+    initial_layout = generate_initial_layout(backend, qc)
+    assert_valid_layout(backend, qc, initial_layout)
+    layout = initial_layout.get_virtual_bits()
+    assert {layout[qc.qubits[4]], layout[qc.qubits[5]]} == {8, 9}
+
+
+def test_generate_initial_layout_too_many_resonators():
+    """Initial layout generation fails if the circuit needs more resonators than the architecture has."""
+    backend = MockBackend(arch_three_moves)
+    qc = IQMCircuit(4)
+    qc.cz(0, 2)
+    qc.cz(1, 3)
+    with pytest.raises(TranspilerError, match='Circuit requires 2 computational resonators'):
+        generate_initial_layout(backend, qc)
+
+
+def test_generate_initial_layout_reassigns_qubits():
+    """A layout is found even if the logical qubits must not use the physical qubits with the fewest operations."""
+    # QB1 has prx and move, QB2 has prx, cz and measure
+    arch = DynamicQuantumArchitecture(
+        calibration_set_id=UUID('26c5e70f-bea0-43af-bd37-6212ec7d04cb'),
+        qubits=['QB1', 'QB2'],
+        computational_resonators=['CR1'],
+        gates={
+            name: GateInfo(
+                implementations={'impl': GateImplementationInfo(loci=loci)},
+                default_implementation='impl',
+                override_default_implementation={},
+            )
+            for name, loci in [
+                ('prx', (('QB1',), ('QB2',))),
+                ('cz', (('QB2', 'CR1'),)),
+                ('move', (('QB1', 'CR1'),)),
+                ('measure', (('QB2',),)),
+            ]
+        },
+    )
+    backend = MockBackend(arch)
+    qc = IQMCircuit(3)
+    qc.h(0)  # would take QB1, which has the fewest operations
+    qc.h(1)
+    qc.move(1, 2)  # but logical qubit 1 needs it
+    qc.move(1, 2)
+
+    initial_layout = generate_initial_layout(backend, qc)
+    assert_valid_layout(backend, qc, initial_layout)
+    layout = initial_layout.get_virtual_bits()
+    assert layout[qc.qubits[0]] == 1
+    assert layout[qc.qubits[1]] == 0
+
+
+def test_generate_initial_layout_large_star():
+    """Initial layout generation handles large devices with several resonators."""
+    num_qubits = 60
+    backend = MockBackend(star_architecture(num_qubits, 3, move_qubits=range(0, num_qubits, 10)))
+    # three resonators, each with a moved qubit and CZs from several other qubits
+    num_logical = 20
+    qc = IQMCircuit(num_logical + 3, num_logical)
+    for res in range(3):
+        resonator = num_logical + res
+        moved = res
+        qc.move(moved, resonator)
+        for k in range(3 + res, num_logical, 3):
+            qc.h(k)
+            qc.cz(k, resonator)
+        qc.move(moved, resonator)
+    qc.measure(range(num_logical), range(num_logical))
+
+    initial_layout = generate_initial_layout(backend, qc)
+    assert_valid_layout(backend, qc, initial_layout)
@@ -6,19 +6,22 @@ from itertools import product
 import numpy as np
 import pytest
 import qiskit
-from qiskit.circuit import ClassicalRegister, ParameterVector, QuantumCircuit, QuantumRegister
+from qiskit.circuit import ClassicalRegister, Parameter, ParameterVector, QuantumCircuit, QuantumRegister
 from qiskit.circuit.library import QuantumVolume
 from qiskit.compiler import transpile
+from qiskit.converters import circuit_to_dag, dag_to_circuit
 import qiskit.passmanager
 from qiskit.quantum_info import Operator
 import qiskit.scheduler
 import stevedore
 
-from iqm.iqm_client import ExistingMoveHandlingOptions
+from iqm.iqm_client import Circuit, CircuitTranspilationError, ExistingMoveHandlingOptions
+from iqm.iqm_client.transpile import transpile_insert_moves
 from iqm.qiskit_iqm.iqm_circuit_validation import validate_circuit
-from iqm.qiskit_iqm.iqm_naive_move_pass import _get_scheduling_method, transpile_to_IQM
+from iqm.qiskit_iqm.iqm_naive_move_pass import IQMNaiveResonatorMoving, _get_scheduling_method, transpile_to_IQM
 from iqm.qiskit_iqm.iqm_transpilation import IQMReplaceGateWithUnitaryPass
 from iqm.qiskit_iqm.move_gate import MOVE_GATE_UNITARY, MoveGate
+from iqm.qiskit_iqm.qiskit_to_iqm import serialize_dag, serialize_instructions
 
 from .utils import capture_submitted_circuits, get_mocked_backend
 
@@ -149,6 +152,7 @@ class TestTranspilation:
             pytest.skip("Qiskit transpiler does not insert MOVE gates, so circuit is probably invalid.")
         transpiled_circuit = self.transpile(optimization_level=optimization_level)
         validate_circuit(transpiled_circuit, self.backend)
+        validate_circuit(circuit_to_dag(transpiled_circuit), self.backend)
 
     def test_transpiled_circuit_keeps_layout(self):
         """Test that the layout of the transpiled circuit is preserved."""
@@ -240,6 +244,126 @@ def test_transpile_empty_optimized_circuit(ndonis_architecture):
     assert len(transpiled_circuit) == 0
 
 
+def test_naive_resonator_moving_without_layout(move_architecture):
+    """The pass can be run on its own, without a layout in the property set."""
+    backend = get_mocked_backend(move_architecture)[0]
+    target = backend.target_with_resonators
+    qc = QuantumCircuit(target.num_qubits, 2)
+    qc.r(0.1, 0.2, 0)
+    qc.cz(5, 0)  # QB6 is moved to the resonator
+    qc.measure([0, 5], [0, 1])
+    routed = dag_to_circuit(IQMNaiveResonatorMoving(target).run(circuit_to_dag(qc)))
+    assert routed.count_ops() == {"move": 2, "cz": 1, "r": 1, "measure": 2}
+    validate_circuit(routed, backend)
+
+
+def random_star_circuit(target, num_gates, seed):
+    """Random circuit of native gates and fictional CZs on the qubits of a Star architecture."""
+    rng = np.random.default_rng(seed)
+    qubits = [target.iqm_component_to_idx[q] for q in target.iqm_dqa.qubits]
+    cz_loci = [locus for locus in target["cz"] if all(q in qubits for q in locus)]
+    qc = QuantumCircuit(target.num_qubits, len(qubits))
+    for _ in range(num_gates):
+        kind = rng.choice(["r", "cz", "cz", "barrier", "measure"], p=[0.4, 0.2, 0.2, 0.1, 0.1])
+        qubit = int(rng.choice(qubits))
+        if kind == "r":
+            qc.r(*rng.uniform(0, np.pi, 2), qubit)
+        elif kind == "cz":
+            qc.cz(*(int(q) for q in cz_loci[rng.integers(len(cz_loci))]))
+        elif kind == "barrier":
+            qc.barrier(*(int(q) for q in rng.choice(qubits, 2, replace=False)))
+        else:
+            qc.measure(qubit, qubits.index(qubit))
+    return qc
+
+
+def wire_sequences(instructions):
+    """Instructions acting on each QPU component, in order.
+
+    Two circuits have the same DAG iff their wire sequences are equal.
+    """
+    sequences = {}
+    for instruction in instructions:
+        for component in instruction.qubits:
+            sequences.setdefault(component, []).append(instruction)
+    return sequences
+
+
+@pytest.mark.parametrize("architecture", ["move_architecture", "hypothetical_fake_architecture"])
+@pytest.mark.parametrize("seed", range(5))
+def test_naive_resonator_moving_matches_transpile_insert_moves(architecture, seed, request):
+    """The pass routes the circuit exactly like the IQM client."""
+    backend = get_mocked_backend(request.getfixturevalue(architecture))[0]
+    target = backend.target
+    dag = circuit_to_dag(random_star_circuit(target, 200, seed))
+    expected = transpile_insert_moves(
+        Circuit(name="expected", instructions=serialize_dag(dag, target.iqm_idx_to_component)),
+        target.iqm_dqa,
+    )
+    routed = dag_to_circuit(IQMNaiveResonatorMoving(target).run(dag))
+    assert "move" in routed.count_ops()
+    assert wire_sequences(serialize_instructions(routed, target.iqm_idx_to_component)) == wire_sequences(
+        expected.instructions
+    )
+
+
+@pytest.mark.parametrize(
+    "existing_moves",
+    [ExistingMoveHandlingOptions.KEEP, ExistingMoveHandlingOptions.REMOVE, ExistingMoveHandlingOptions.TRUST],
+)
+def test_naive_resonator_moving_existing_moves(move_architecture, existing_moves):
+    """Existing MOVE gates are handled like in the IQM client."""
+    backend = get_mocked_backend(move_architecture)[0]
+    target = backend.target_with_resonators
+    qc = QuantumCircuit(target.num_qubits)
+    qc.append(MoveGate(), [5, 6])
+    qc.cz(0, 6)
+    qc.cz(1, 6)
+    qc.append(MoveGate(), [5, 6])
+    qc.cz(2, 5)
+    qc.r(0.1, 0.2, 5)
+    dag = circuit_to_dag(qc)
+    expected = transpile_insert_moves(
+        Circuit(name="expected", instructions=serialize_dag(dag, target.iqm_idx_to_component)),
+        target.iqm_dqa,
+        existing_moves=existing_moves,
+    )
+    routed = dag_to_circuit(IQMNaiveResonatorMoving(target, existing_moves).run(dag))
+    assert wire_sequences(serialize_instructions(routed, target.iqm_idx_to_component)) == wire_sequences(
+        expected.instructions
+    )
+
+
+def test_naive_resonator_moving_invalid_moves(move_architecture):
+    """Invalid MOVE sandwiches are rejected when the existing MOVE gates are kept."""
+    target = get_mocked_backend(move_architecture)[0].target_with_resonators
+    qc = QuantumCircuit(target.num_qubits)
+    qc.append(MoveGate(), [5, 6])
+    qc.r(0.1, 0.2, 5)
+    qc.append(MoveGate(), [5, 6])
+    with pytest.raises(CircuitTranspilationError, match="while the state"):
+        IQMNaiveResonatorMoving(target).run(circuit_to_dag(qc))
+
+
+def test_naive_resonator_moving_parametric_gates(move_architecture):
+    """Gates with unbound parameters are routed as they are, and the parameters can be bound afterwards."""
+    target = get_mocked_backend(move_architecture)[0].target
+    theta, phi = Parameter("θ"), Parameter("φ")
+    qc = QuantumCircuit(target.num_qubits)
+    qc.r(theta, phi, 0)
+    qc.rx(2 * theta, 5)
+    qc.cz(0, 5)  # QB6 is moved to the resonator
+    qc.ry(phi + 0.5, 5)
+    routed = dag_to_circuit(IQMNaiveResonatorMoving(target).run(circuit_to_dag(qc)))
+    assert routed.count_ops() == {"move": 2, "cz": 1, "r": 1, "rx": 1, "ry": 1}
+    assert set(routed.parameters) == {theta, phi}
+
+    for values in ([0.1, 0.2], [0.3, -0.4]):
+        bound = dict(zip([theta, phi], values))
+        expected = IQMNaiveResonatorMoving(target).run(circuit_to_dag(qc.assign_parameters(bound)))
+        assert circuit_to_dag(routed.assign_parameters(bound)) == expected
+
+
 @pytest.mark.parametrize(
     ("remove_final_rzs", "ignore_barriers", "existing_moves_handling"),
     list(
@@ -431,3 +555,67 @@ def test_symbolic_gates(backend, transpile_method):
     # When the symbolic gates are bound to parameters, validation should pass
     qc_t2 = qc_t1.assign_parameters({p_vec[0]: 0.1, p_vec[1]: 0.2})
     validate_circuit(qc_t2, backend)
+
+
+@pytest.mark.parametrize("backend", ["adonis_architecture", "move_architecture"], indirect=True)
+def test_transpile_to_IQM_batch(backend):
+    """A batch of circuits is transpiled like each of the circuits separately."""
+    circuits = [get_test_circuit(kind, 3) for kind in ["QuantumVolume", "GHZ", "MCM"]]
+    for i, circuit in enumerate(circuits):
+        circuit.name = f"circuit_{i}"
+    transpiled = transpile_to_IQM(circuits, backend, seed_transpiler=123)
+    assert isinstance(transpiled, list)
+    for circuit, result in zip(circuits, transpiled):
+        assert result == transpile_to_IQM(circuit, backend, seed_transpiler=123)
+        assert result.name == circuit.name
+        validate_circuit(result, backend)
+
+
+def test_transpile_to_IQM_batch_with_moves(move_architecture):
+    """Circuits with and without MOVE gates are transpiled in the same batch, each with its own layout."""
+    backend = get_mocked_backend(move_architecture)[0]
+    with_moves = QuantumCircuit(2, 1)
+    with_moves.append(MoveGate(), [0, 1])
+    with_moves.append(MoveGate(), [0, 1])
+    with_moves.measure(0, 0)
+    circuits = [with_moves, get_test_circuit("GHZ", 3)]
+    with pytest.raises(ValueError, match="existing_moves_handling is not set"):
+        transpile_to_IQM(circuits, backend)
+
+    transpiled = transpile_to_IQM(
+        circuits, backend, existing_moves_handling=ExistingMoveHandlingOptions.KEEP, output_name=["a", "b"]
+    )
+    assert [circuit.name for circuit in transpiled] == ["a", "b"]
+    assert transpiled[0].count_ops()["move"] == 2
+    for result in transpiled:
+        validate_circuit(result, backend)
+
+
+def test_transpile_to_IQM_batch_in_parallel(adonis_architecture):
+    """Batches are transpiled in worker processes with the same result."""
+    backend = get_mocked_backend(adonis_architecture)[0]
+    circuits = [QuantumVolume(3, seed=seed) for seed in range(4)]
+    serial = transpile_to_IQM(circuits, backend, seed_transpiler=123)
+    parallel = transpile_to_IQM(circuits, backend, seed_transpiler=123, num_processes=2)
+    assert parallel == serial
+
+
+@pytest.mark.parametrize("backend", ["adonis_architecture", "move_architecture"], indirect=True)
+@pytest.mark.parametrize("seed", range(3))
+def test_transpile_to_IQM_matches_qiskit_transpile(backend, seed):
+    """Transpiling a single circuit gives the same result as the Qiskit transpiler with the same options."""
+    circuit = QuantumVolume(3, seed=seed)
+    circuit.measure_all()
+    expected = transpile(
+        circuit,
+        target=backend.target,
+        scheduling_method=_get_scheduling_method(
+            perform_move_routing=True,
+            optimize_single_qubits=True,
+            remove_final_rzs=True,
+            ignore_barriers=False,
+            existing_moves_handling=None,
+        ),
+        seed_transpiler=seed,
+    )
+    assert transpile_to_IQM(circuit, backend, seed_transpiler=seed) == expected
@@ -0,0 +1,176 @@
+# Copyright 2025 Qiskit on IQM developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Testing noise-aware layout selection.
+"""
+import itertools
+
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.circuit.library import QuantumVolume
+
+from iqm.qiskit_iqm import transpile_to_IQM
+from iqm.qiskit_iqm.fake_backends import IQMFakeAdonis, IQMFakeDeneb
+from iqm.qiskit_iqm.fake_backends.fake_garnet import IQMFakeGarnet
+from iqm.qiskit_iqm.iqm_noise_aware_layout import IQMNoiseAwareLayout, generate_noise_aware_layout
+from tests.utils import get_mocked_backend
+
+
+def bad_qb3_adonis():
+    """Fake Adonis whose QB1 and the CZ between QB1 and QB3 are much worse than the rest."""
+    backend = IQMFakeAdonis()
+    profile = backend.error_profile
+    profile.single_qubit_gate_depolarizing_error_parameters['prx']['QB1'] = 0.2
+    profile.two_qubit_gate_depolarizing_error_parameters['cz'][('QB1', 'QB3')] = 0.5
+    return backend.copy_with_error_profile(profile)
+
+
+def coupled(target, a: int, b: int) -> bool:
+    """True iff the target has a CZ between the given physical qubits, in either direction."""
+    return (a, b) in target['cz'] or (b, a) in target['cz']
+
+
+def success_probability(circuit: QuantumCircuit, target, physical: list[int]) -> float:
+    """Estimated success probability of the circuit placed on the given physical qubits, computed gate by gate."""
+    probability = 1.0
+    for instruction in circuit.data:
+        qubits = tuple(physical[circuit.find_bit(q).index] for q in instruction.qubits)
+        if instruction.operation.name == 'barrier':
+            continue
+        if len(qubits) == 2:
+            properties = target['cz'].get(qubits) or target['cz'].get(qubits[::-1])
+        elif instruction.operation.name == 'measure':
+            properties = target['measure'][qubits]
+        else:
+            properties = target['r'][qubits]
+        probability *= 1 - properties.error
+    return probability
+
+
+def test_layout_avoids_bad_qubits():
+    backend = bad_qb3_adonis()
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure([0, 1], [0, 1])
+    layout = generate_noise_aware_layout(circuit, backend.get_noise_aware_target())
+    physical = [layout[q] for q in circuit.qubits]
+    assert backend.qubit_name_to_index('QB1') not in physical
+    assert backend.qubit_name_to_index('QB3') in physical
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_layout_is_optimal(seed):
+    """On a small device, the chosen placement is the best one of all the possible placements."""
+    backend = IQMFakeAdonis()
+    target = backend.get_noise_aware_target()
+    rng = np.random.default_rng(seed)
+    circuit = QuantumCircuit(3, 3)
+    for _ in range(20):
+        qubit = int(rng.integers(3))
+        circuit.rx(float(rng.uniform(0, np.pi)), qubit)
+        circuit.cz(1, int(rng.choice([0, 2])))
+    circuit.measure([0, 1, 2], [0, 1, 2])
+
+    layout = generate_noise_aware_layout(circuit, target)
+    chosen = [layout[q] for q in circuit.qubits]
+    best = max(
+        success_probability(circuit, target, list(physical))
+        for physical in itertools.permutations(range(target.num_qubits), 3)
+        if coupled(target, physical[1], physical[0]) and coupled(target, physical[1], physical[2])
+    )
+    assert success_probability(circuit, target, chosen) == pytest.approx(best)
+
+
+def test_well_connected_qubit_outranks_leaf_qubit():
+    """A qubit with many good couplers is not ranked below a leaf qubit just because it has more couplers."""
+    backend = IQMFakeAdonis()
+    profile = backend.error_profile
+    # QB3 is the hub of Adonis, QB1 is a leaf with a single coupler, all the CZs are equally good
+    profile.single_qubit_gate_depolarizing_error_parameters['prx'] |= {'QB1': 0.002, 'QB3': 0.001}
+    profile.readout_errors |= {qubit: {'0': 0.02, '1': 0.03} for qubit in ['QB1', 'QB3']}
+    cz_errors = profile.two_qubit_gate_depolarizing_error_parameters['cz']
+    for pair in cz_errors:
+        cz_errors[pair] = 0.01
+    target = backend.copy_with_error_profile(profile).get_noise_aware_target()
+    layout_pass = IQMNoiseAwareLayout(target)
+    ranked = layout_pass._ranked_qubits(*layout_pass._log_fidelities())  # pylint: disable=protected-access
+    assert ranked.index(target.iqm_component_to_idx['QB3']) < ranked.index(target.iqm_component_to_idx['QB1'])
+
+
+def test_layout_covers_idle_qubits():
+    backend = IQMFakeAdonis()
+    circuit = QuantumCircuit(4)
+    circuit.cz(0, 3)
+    layout = generate_noise_aware_layout(circuit, backend.get_noise_aware_target())
+    physical = [layout[q] for q in circuit.qubits]
+    assert len(set(physical)) == 4
+    assert coupled(backend.target, physical[0], physical[3])
+
+
+def test_no_layout_when_routing_is_needed():
+    backend = IQMFakeAdonis()
+    triangle = QuantumCircuit(3)
+    triangle.cz(0, 1)
+    triangle.cz(1, 2)
+    triangle.cz(2, 0)
+    assert generate_noise_aware_layout(triangle, backend.target) is None
+    three_qubit_gate = QuantumCircuit(3)
+    three_qubit_gate.ccx(0, 1, 2)
+    assert generate_noise_aware_layout(three_qubit_gate, backend.target) is None
+    assert generate_noise_aware_layout(QuantumCircuit(6), backend.target) is None
+
+
+def test_layout_without_error_data(adonis_architecture):
+    """Without error data all the placements are equally good, and a valid one is chosen."""
+    backend, _ = get_mocked_backend(adonis_architecture)
+    circuit = QuantumCircuit(2)
+    circuit.cz(0, 1)
+    layout_pass = IQMNoiseAwareLayout(backend.target, max_candidates=1)
+    layout_pass(circuit)
+    layout = layout_pass.property_set['layout']
+    assert coupled(backend.target, layout[circuit.qubits[0]], layout[circuit.qubits[1]])
+
+
+def test_layout_on_star_architecture():
+    """On Star architectures, the CZs routed via the resonator are scored using the MOVE and CZ errors."""
+    backend = IQMFakeDeneb()
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure([0, 1], [0, 1])
+    layout = generate_noise_aware_layout(circuit, backend.get_noise_aware_target())
+    assert len({layout[q] for q in circuit.qubits}) == 2
+
+
+@pytest.mark.parametrize('optimization_level', [0, 1, 2, 3])
+def test_transpile_to_iqm_with_noise_aware_layout(optimization_level):
+    backend = bad_qb3_adonis()
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure([0, 1], [0, 1])
+    transpiled = transpile_to_IQM(
+        circuit, backend, noise_aware_layout=True, optimization_level=optimization_level, seed_transpiler=1
+    )
+    used = {transpiled.find_bit(q).index for instruction in transpiled.data for q in instruction.qubits}
+    assert backend.qubit_name_to_index('QB1') not in used
+
+
+def test_transpile_to_iqm_with_noise_aware_layout_needs_routing():
+    backend = IQMFakeGarnet()
+    circuit = QuantumVolume(5, seed=1).decompose()
+    circuit.measure_all()
+    transpiled = transpile_to_IQM(circuit, backend, noise_aware_layout=True, seed_transpiler=1)
+    assert transpiled.num_qubits == backend.num_qubits
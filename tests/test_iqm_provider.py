@@ -15,6 +15,8 @@
 """Testing IQMProvider.
 """
 from importlib.metadata import version
+import subprocess
+import sys
 import uuid
 
 from mockito import ANY, matchers, mock, when
@@ -23,6 +25,8 @@ from qiskit import QuantumCircuit
 import requests
 
 from iqm.iqm_client import IQMClient, RunRequest, RunResult, RunStatus
+import iqm.qiskit_iqm
+from iqm.qiskit_iqm.fake_backends.fake_adonis import IQMFakeAdonis
 from iqm.qiskit_iqm.iqm_provider import IQMBackend, IQMFacadeBackend, IQMProvider
 from tests.utils import get_mock_ok_response
 
@@ -135,3 +139,16 @@ def test_facade_backend_raises_error_on_remote_execution_fail(adonis_architectur
 
     with pytest.raises(RuntimeError, match='Remote execution did not succeed'):
         backend.run(circuit)
+
+
+def test_package_import_does_not_load_qiskit_aer():
+    code = 'import sys; import iqm.qiskit_iqm; print("qiskit_aer" in sys.modules)'
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
+
+
+def test_fake_backends_are_imported_lazily_from_package():
+    assert 'IQMFakeAdonis' in dir(iqm.qiskit_iqm)
+    assert iqm.qiskit_iqm.IQMFakeAdonis is IQMFakeAdonis
+    with pytest.raises(AttributeError, match='has no attribute'):
+        _ = iqm.qiskit_iqm.IQMFakeNonexistent
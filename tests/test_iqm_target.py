@@ -14,9 +14,13 @@
 """Testing extended quantum architecture specification.
 """
 from typing import Optional
+from uuid import UUID
 
 import pytest
 
+from iqm.iqm_client import DynamicQuantumArchitecture, GateImplementationInfo, GateInfo
+from iqm.qiskit_iqm.fake_backends import IQMErrorProfile, IQMFakeDeneb
+from iqm.qiskit_iqm.iqm_backend import IQMTarget
 from tests.utils import get_mocked_backend
 
 
@@ -46,10 +50,15 @@ class TestIQMTargetReflectsDQA:
         self.dqa = dqa
         self.backend = get_mocked_backend(dqa)[0]
 
+    @property
+    def fake_target(self):
+        """The target with resonators, or None if the DQA has no MOVE gates."""
+        return self.backend.target_with_resonators if "move" in self.dqa.gates else None
+
     def test_backend_size(self):
         assert self.backend.num_qubits == len(self.dqa.qubits)
-        if self.backend._fake_target_with_moves is not None:
-            assert self.backend._fake_target_with_moves.num_qubits == len(self.dqa.components)
+        if self.fake_target is not None:
+            assert self.fake_target.num_qubits == len(self.dqa.components)
 
     def test_physical_qubits(self):
         """Check that the physical qubits are in the correct order: resonators at the end."""
@@ -72,8 +81,8 @@ class TestIQMTargetReflectsDQA:
         dqa_gates.discard("move")
         assert dqa_gates == set(dqa_name for name in target_gates if (dqa_name := QISKIT_TO_IQM[name]) is not None)
 
-        if self.backend._fake_target_with_moves is not None:
-            target_gates = set(self.backend._fake_target_with_moves.operation_names)
+        if self.fake_target is not None:
+            target_gates = set(self.fake_target.operation_names)
             dqa_gates = set(self.dqa.gates)
             assert dqa_gates == set(dqa_name for name in target_gates if (dqa_name := QISKIT_TO_IQM[name]) is not None)
 
@@ -84,16 +93,14 @@ class TestIQMTargetReflectsDQA:
             qiskit_name,
             iqm_name=iqm_name,
         )
-        if self.backend._fake_target_with_moves is not None:
-            self.check_instruction(qiskit_name, iqm_name=iqm_name, target=self.backend._fake_target_with_moves)
+        if self.fake_target is not None:
+            self.check_instruction(qiskit_name, iqm_name=iqm_name, target=self.fake_target)
 
     def test_id_gates(self):
         """Check that the id gates are defined for both qubits and components."""
         self.check_instruction("id", expected_loci=[(q,) for q in self.dqa.qubits])
-        if self.backend._fake_target_with_moves is not None:
-            self.check_instruction(
-                "id", expected_loci=[(q,) for q in self.dqa.components], target=self.backend._fake_target_with_moves
-            )
+        if self.fake_target is not None:
+            self.check_instruction("id", expected_loci=[(q,) for q in self.dqa.components], target=self.fake_target)
 
     def test_cz_gates(self):
         """Check that the cz gates are defined for the correct qubits."""
@@ -111,7 +118,7 @@ class TestIQMTargetReflectsDQA:
         """Check that the virtual czs in the target are as expected."""
         target_loci = [
             tuple(self.backend.index_to_qubit_name(qb) for qb in loci)
-            for i, loci in self.backend._fake_target_with_moves.instructions
+            for i, loci in self.fake_target.instructions
             if i.name == "cz"
         ]
         real_cz_loci = list(
@@ -138,11 +145,11 @@ class TestIQMTargetReflectsDQA:
             self.validate_move_loci_fake_target()
             self.validate_cz_loci_fake_target()
         else:
-            assert self.backend._fake_target_with_moves is None
+            assert self.backend.target_with_resonators is self.backend.target
 
     def validate_move_loci_fake_target(self):
         """Check that the moves in the fake target are as in the dqa."""
-        self.check_instruction("move", iqm_name="move", target=self.backend._fake_target_with_moves)
+        self.check_instruction("move", iqm_name="move", target=self.fake_target)
 
     def validate_cz_loci_fake_target(self):
         """Check that the czs in the fake target are as expected."""
@@ -153,11 +160,11 @@ class TestIQMTargetReflectsDQA:
         )
         fake_loci = [
             tuple(self.backend.index_to_qubit_name(qb) for qb in loci)
-            for i, loci in self.backend._fake_target_with_moves.instructions
+            for i, loci in self.fake_target.instructions
             if i.name == "cz"
         ]
         expected_loci = real_loci + fake_loci
-        self.check_instruction("cz", expected_loci=expected_loci, target=self.backend._fake_target_with_moves)
+        self.check_instruction("cz", expected_loci=expected_loci, target=self.fake_target)
 
     def check_instruction(self, qiskit_name: str, iqm_name: Optional[str] = None, expected_loci=None, target=None):
         """Checks that the given instruction is defined for the expected qubits (directed)."""
@@ -216,3 +223,122 @@ def test_target_from_restricted_qubits(dqa, restriction):
                 assert translated_edge in backend.target_with_resonators.build_coupling_map().get_edges()
             else:
                 assert translated_edge in backend.coupling_map.get_edges()
+
+
+def reference_cz_connections(target: IQMTarget) -> dict:
+    """CZ connections of the target, found by scanning all the qubits for each MOVE locus."""
+    dqa = target.iqm_dqa
+    cz_loci = dqa.gates["cz"].loci
+    connections = {}
+    for c1, c2 in cz_loci:
+        if target.iqm_includes_resonators or all(component in dqa.qubits for component in (c1, c2)):
+            connections[(c1, c2)] = target._locus_properties("cz", (c1, c2))
+    if not target.iqm_includes_fake_czs or "move" not in dqa.gates:
+        return connections
+    real_loci = set(connections)
+    for c1, res in dqa.gates["move"].loci:
+        for c2 in dqa.qubits:
+            if c2 not in [c1, res] and ((c2, res) in cz_loci or (res, c2) in cz_loci):
+                properties = target._fake_cz_properties(c1, c2, res)
+                for locus in [(c1, c2), (c2, c1)]:
+                    if locus in real_loci:
+                        continue
+                    previous = connections.get(locus)
+                    previous_error = None if previous is None else previous.error
+                    error = None if properties is None else properties.error
+                    if locus not in connections or (
+                        error is not None and (previous_error is None or error < previous_error)
+                    ):
+                        connections[locus] = properties
+    return connections
+
+
+def summarize(properties):
+    return None if properties is None else (properties.duration, properties.error)
+
+
+@pytest.mark.parametrize(
+    "architecture",
+    ["move_architecture", "adonis_architecture", "hypothetical_fake_architecture", "ndonis_architecture", "deneb"],
+)
+@pytest.mark.parametrize("include_resonators", [False, True])
+@pytest.mark.parametrize("include_fake_czs", [False, True])
+def test_target_cz_connections_match_reference(request, architecture, include_resonators, include_fake_czs):
+    """Test that the CZ connections of the target are the same as found by scanning the qubits, in the same order."""
+    if architecture == "deneb":
+        backend = IQMFakeDeneb()
+        dqa, error_profile = backend.architecture, backend.error_profile
+    else:
+        dqa, error_profile = request.getfixturevalue(architecture), None
+    component_to_idx = {component: idx for idx, component in enumerate(dqa.components)}
+    target = IQMTarget(dqa, component_to_idx, include_resonators, include_fake_czs, error_profile)
+
+    expected = reference_cz_connections(target)
+    cz_connections = {
+        tuple(target.iqm_idx_to_component[idx] for idx in locus): summarize(properties)
+        for locus, properties in target["cz"].items()
+    }
+    assert list(cz_connections.items()) == [(locus, summarize(properties)) for locus, properties in expected.items()]
+
+
+def two_route_architecture(move_loci, real_cz: bool) -> DynamicQuantumArchitecture:
+    """QB1 can reach QB2 by MOVEs through both CR1 and CR2, optionally QB1 and QB2 also have a real CZ."""
+
+    def gate(loci) -> GateInfo:
+        return GateInfo(
+            implementations={"default": GateImplementationInfo(loci=tuple(loci))},
+            default_implementation="default",
+            override_default_implementation={},
+        )
+
+    cz_loci = [("QB2", "CR1"), ("QB2", "CR2")] + ([("QB1", "QB2")] if real_cz else [])
+    return DynamicQuantumArchitecture(
+        calibration_set_id=UUID("26c5e70f-bea0-43af-bd37-6212ec7d04cb"),
+        qubits=["QB1", "QB2"],
+        computational_resonators=["CR1", "CR2"],
+        gates={"prx": gate([("QB1",), ("QB2",)]), "cz": gate(cz_loci), "move": gate(move_loci)},
+    )
+
+
+def two_route_error_profile(cz_errors: dict) -> IQMErrorProfile:
+    return IQMErrorProfile(
+        t1s={"QB1": 10000.0, "QB2": 10000.0},
+        t2s={"QB1": 10000.0, "QB2": 10000.0},
+        single_qubit_gate_depolarizing_error_parameters={"prx": {"QB1": 0.001, "QB2": 0.001}},
+        two_qubit_gate_depolarizing_error_parameters={
+            "cz": cz_errors,
+            "move": {("QB1", "CR1"): 0.01, ("QB1", "CR2"): 0.01},
+        },
+        single_qubit_gate_durations={"prx": 40.0},
+        two_qubit_gate_durations={"cz": 80.0, "move": 60.0},
+        readout_errors={"QB1": {"0": 0.01, "1": 0.01}, "QB2": {"0": 0.01, "1": 0.01}},
+    )
+
+
+@pytest.mark.parametrize("move_loci", [[("QB1", "CR1"), ("QB1", "CR2")], [("QB1", "CR2"), ("QB1", "CR1")]])
+def test_fake_cz_keeps_route_with_known_error(move_loci):
+    """Test that a route with an unknown error does not replace a route with a known error, in any order."""
+    dqa = two_route_architecture(move_loci, real_cz=False)
+    profile = two_route_error_profile({("QB2", "CR2"): 0.02})
+    target = IQMTarget(dqa, {"QB1": 0, "QB2": 1, "CR1": 2, "CR2": 3}, False, error_profile=profile)
+    expected = target._fake_cz_properties("QB1", "QB2", "CR2")
+    assert expected.error is not None
+    for locus in [(0, 1), (1, 0)]:
+        assert summarize(target["cz"][locus]) == summarize(expected)
+
+
+@pytest.mark.parametrize("move_loci", [[("QB1", "CR1"), ("QB1", "CR2")], [("QB1", "CR2"), ("QB1", "CR1")]])
+def test_fake_cz_keeps_route_with_smallest_error(move_loci):
+    dqa = two_route_architecture(move_loci, real_cz=False)
+    profile = two_route_error_profile({("QB2", "CR1"): 0.05, ("QB2", "CR2"): 0.02})
+    target = IQMTarget(dqa, {"QB1": 0, "QB2": 1, "CR1": 2, "CR2": 3}, False, error_profile=profile)
+    assert summarize(target["cz"][(0, 1)]) == summarize(target._fake_cz_properties("QB1", "QB2", "CR2"))
+
+
+def test_fake_cz_does_not_replace_real_cz():
+    dqa = two_route_architecture([("QB1", "CR1"), ("QB1", "CR2")], real_cz=True)
+    profile = two_route_error_profile({("QB1", "QB2"): 0.5, ("QB2", "CR1"): 0.01, ("QB2", "CR2"): 0.01})
+    target = IQMTarget(dqa, {"QB1": 0, "QB2": 1, "CR1": 2, "CR2": 3}, False, error_profile=profile)
+    assert summarize(target["cz"][(0, 1)]) == summarize(target._locus_properties("cz", ("QB1", "QB2")))
+    # the reverse direction has no real CZ, so a fake route is used
+    assert summarize(target["cz"][(1, 0)]) == summarize(target._fake_cz_properties("QB1", "QB2", "CR1"))
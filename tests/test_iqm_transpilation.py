@@ -19,18 +19,27 @@ import math
 import numpy as np
 import pytest
 from qiskit import QuantumCircuit, transpile
+from qiskit.circuit import Parameter
 from qiskit.circuit.equivalence_library import SessionEquivalenceLibrary
+from qiskit.converters import circuit_to_dag, dag_to_circuit
+from qiskit.quantum_info import Operator
 from qiskit.transpiler import PassManager
 from qiskit.transpiler.passes import BasisTranslator
 from qiskit_aer import AerSimulator
 
+from benchmarks._common import three_stage_optimization
 from iqm.qiskit_iqm.fake_backends.fake_adonis import IQMFakeAdonis
 from iqm.qiskit_iqm.fake_backends.fake_aphrodite import IQMFakeAphrodite
 from iqm.qiskit_iqm.fake_backends.fake_deneb import IQMFakeDeneb
 from iqm.qiskit_iqm.iqm_circuit_validation import validate_circuit
 from iqm.qiskit_iqm.iqm_move_layout import generate_initial_layout
-from iqm.qiskit_iqm.iqm_transpilation import TOLERANCE, IQMOptimizeSingleQubitGates, optimize_single_qubit_gates
-from iqm.qiskit_iqm.move_gate import MoveGate
+from iqm.qiskit_iqm.iqm_transpilation import (
+    TOLERANCE,
+    IQMOptimizeSingleQubitGates,
+    IQMReplaceGateWithUnitaryPass,
+    optimize_single_qubit_gates,
+)
+from iqm.qiskit_iqm.move_gate import MOVE_GATE_UNITARY, MoveGate
 from tests.utils import get_mocked_backend
 
 
@@ -180,3 +189,81 @@ def test_optimize_single_qubit_gates_works_on_invalid_move_sandwich():
         if gate.operation.name == 'r':
             assert math.isclose(gate.operation.params[0], np.pi, rel_tol=TOLERANCE)
             assert math.isclose(gate.operation.params[1], 0, abs_tol=TOLERANCE)
+
+
+def simulated_operator(circuit: QuantumCircuit) -> Operator:
+    """Operator of the circuit, with MOVE gates replaced by their ideal unitary."""
+    return Operator(PassManager(IQMReplaceGateWithUnitaryPass('move', MOVE_GATE_UNITARY)).run(circuit))
+
+
+def random_native_circuit(seed: int, num_gates: int = 60, measure: bool = False) -> QuantumCircuit:
+    """Random circuit of R, CZ and MOVE gates, barriers and delays on three qubits and a resonator."""
+    rng = np.random.default_rng(seed)
+    circuit = QuantumCircuit(4, 3)
+    for _ in range(num_gates):
+        kind = rng.choice(['r', 'r', 'r', 'rz', 'cz', 'move', 'barrier', 'delay', 'measure'])
+        qubit = int(rng.integers(3))
+        if kind == 'r':
+            circuit.r(rng.choice([0.0, np.pi, rng.uniform(-np.pi, np.pi)]), rng.uniform(-np.pi, np.pi), qubit)
+        elif kind == 'rz':
+            # a Z rotation as two R gates, so that runs with vanishing polar angles are optimized too
+            circuit.r(-np.pi, 0.0, qubit)
+            circuit.r(np.pi, rng.uniform(-np.pi, np.pi), qubit)
+        elif kind == 'cz':
+            circuit.cz(qubit, (qubit + 1) % 3)
+        elif kind == 'move':
+            # MOVE sandwiches, the resonator starts and ends in the ground state
+            circuit.append(MoveGate(), [qubit, 3])
+            circuit.cz(3, (qubit + 1) % 3)
+            circuit.append(MoveGate(), [qubit, 3])
+        elif kind == 'barrier':
+            circuit.barrier()
+        elif kind == 'delay':
+            circuit.delay(20, qubit)
+        elif measure:
+            circuit.measure(qubit, qubit)
+    return circuit
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_optimize_single_qubit_gates_matches_three_stage_optimization(seed):
+    """Test that the fused pass implements the same unitary with as many R gates as the three-stage optimization."""
+    circuit = random_native_circuit(seed)
+    optimized = PassManager(IQMOptimizeSingleQubitGates(drop_final_rz=False)).run(circuit)
+    reference = dag_to_circuit(three_stage_optimization(circuit_to_dag(circuit), drop_final_rz=False))
+
+    assert np.allclose(simulated_operator(optimized).data, simulated_operator(circuit).data)
+    assert np.allclose(simulated_operator(optimized).data, simulated_operator(reference).data)
+    assert optimized.count_ops() == reference.count_ops()
+
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('ignore_barriers', [False, True])
+def test_optimize_single_qubit_gates_matches_three_stage_optimization_with_measurements(seed, ignore_barriers):
+    """Test that the fused pass produces as many gates as the three-stage optimization in measured circuits."""
+    circuit = random_native_circuit(seed, measure=True)
+    optimized = PassManager(IQMOptimizeSingleQubitGates(ignore_barriers=ignore_barriers)).run(circuit)
+    if ignore_barriers:
+        circuit.data = [instruction for instruction in circuit.data if instruction.operation.name != 'barrier']
+    reference = dag_to_circuit(three_stage_optimization(circuit_to_dag(circuit)))
+
+    assert optimized.count_ops() == reference.count_ops()
+
+
+def test_optimize_single_qubit_gates_commutes_rz_through_parametrized_gates():
+    """Test that R gates with unbound parameters are kept, with the accumulated RZ rotation commuted through them."""
+    theta, phi = Parameter('theta'), Parameter('phi')
+    circuit = QuantumCircuit(1)
+    circuit.r(-np.pi, 0.0, 0)
+    circuit.r(np.pi, 0.4, 0)
+    circuit.r(theta, phi, 0)
+    circuit.r(0.3, 0.2, 0)
+    circuit.r(0.5, 0.1, 0)
+
+    optimized = PassManager(IQMOptimizeSingleQubitGates(drop_final_rz=False)).run(circuit)
+
+    assert optimized.count_ops() == {'r': 4}
+    assert optimized.data[0].operation.params[0] == theta
+    assert optimized.data[0].operation.params[1].parameters == {phi}
+    values = {theta: 0.7, phi: -1.1}
+    assert Operator(optimized.assign_parameters(values)).equiv(Operator(circuit.assign_parameters(values)))
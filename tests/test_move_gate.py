@@ -0,0 +1,43 @@
+# Copyright 2025 Qiskit on IQM developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Testing the MOVE gate.
+"""
+import numpy as np
+import pytest
+
+from iqm.qiskit_iqm.iqm_circuit import IQMCircuit
+from iqm.qiskit_iqm.move_gate import MOVE_GATE_UNITARY, MoveGate
+
+
+def test_move_gate_is_shared():
+    assert MoveGate() is MoveGate()
+    assert not MoveGate().mutable
+    circuit = IQMCircuit(4)
+    circuit.move(0, 3)
+    circuit.move(1, 3)
+    assert circuit.data[0].operation is circuit.data[1].operation is MoveGate()
+
+
+def test_move_gate_unitary_is_shared():
+    assert np.array_equal(MoveGate().unitary.data, np.array(MOVE_GATE_UNITARY))
+    assert MoveGate().unitary is MoveGate(label='move').unitary
+
+
+def test_move_gate_to_mutable():
+    with pytest.raises(TypeError):
+        MoveGate().label = 'label'
+    gate = MoveGate().to_mutable()
+    gate.label = 'label'
+    assert gate.name == 'move'
+    assert MoveGate().label is None
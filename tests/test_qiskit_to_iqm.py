@@ -14,12 +14,21 @@
 
 """Testing Qiskit to IQM conversion tools.
 """
+import numpy as np
 import pytest
 from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+from qiskit.circuit import Parameter, ParameterVector
+from qiskit.converters import circuit_to_dag, dag_to_circuit
 from qiskit.transpiler.layout import Layout
 
-from iqm.iqm_client import Instruction
-from iqm.qiskit_iqm.qiskit_to_iqm import MeasurementKey, deserialize_instructions, serialize_instructions
+from iqm.iqm_client import Circuit, Instruction
+from iqm.qiskit_iqm.qiskit_to_iqm import (
+    MeasurementKey,
+    deserialize_instructions,
+    serialize_dag,
+    serialize_instructions,
+    serialize_template,
+)
 
 from .utils import get_transpiled_circuit_json
 
@@ -51,6 +60,36 @@ def test_measurement_key_from_clbit():
 def test_measurement_key_from_string(key_str):
     mk = MeasurementKey.from_string(key_str)
     assert str(mk) == key_str
+    assert MeasurementKey.from_string(key_str) is mk
+
+
+def test_measurement_key_from_string_invalid():
+    with pytest.raises(ValueError, match='Invalid measurement key string representation.'):
+        MeasurementKey.from_string('abc_4_5')
+
+
+def test_measurement_key_join_and_split():
+    keys = [MeasurementKey('a_b', 4, 1, idx) for idx in (2, 0, 3)]
+    key_str = MeasurementKey.join(keys)
+    assert key_str == 'a_b_4_1_2.0.3'
+    assert MeasurementKey.split(key_str) == tuple(keys)
+    assert MeasurementKey.split('a_b_4_1_2') == (MeasurementKey('a_b', 4, 1, 2),)
+    # grouped keys are not valid single keys
+    with pytest.raises(ValueError, match='Invalid measurement key string representation.'):
+        MeasurementKey.from_string(key_str)
+    with pytest.raises(ValueError, match='must belong to the same classical register'):
+        MeasurementKey.join([MeasurementKey('a', 2, 0, 0), MeasurementKey('b', 2, 1, 0)])
+
+
+def test_measurement_key_table_for():
+    cregs = [ClassicalRegister(i % 3 + 1, name=f'round_{i}') for i in range(50)]
+    shared = ClassicalRegister(name='shared', bits=[cregs[1][0], cregs[2][1]])
+    circuit = QuantumCircuit(QuantumRegister(2), *cregs, shared)
+    table = MeasurementKey.table_for(circuit)
+    assert len(table) == circuit.num_clbits
+    for clbit in circuit.clbits:
+        assert table[clbit] == MeasurementKey.from_clbit(clbit, circuit)
+    assert str(table[shared[1]]) == 'round_2_3_2_1'
 
 
 def test_circuit_to_iqm_json(adonis_architecture):
@@ -98,6 +137,83 @@ def test_serialize_instructions_can_allow_nonnative_gates():
     assert instructions[0] == Instruction.model_construct(name='nonnative', qubits=('QB2', 'QB3', 'QB5'), args={})
 
 
+def test_serialize_instructions_measurement_keys_match_from_clbit():
+    """Measurement keys are computed per circuit, and must agree with MeasurementKey.from_clbit."""
+    creg1, creg2 = ClassicalRegister(2, name='cr1'), ClassicalRegister(1, name='cr2')
+    # a register sharing a clbit with cr1
+    shared = ClassicalRegister(name='shared', bits=[creg1[1]])
+    circuit = QuantumCircuit(QuantumRegister(3), creg1, creg2, shared)
+    circuit.measure([0, 1, 2], [creg1[0], creg1[1], creg2[0]])
+    circuit.x(0).c_if(shared, 1)
+
+    instructions = serialize_instructions(circuit, {i: f'QB{i + 1}' for i in range(3)})
+    assert [inst.args['key'] for inst in instructions[:3]] == [
+        str(MeasurementKey.from_clbit(clbit, circuit)) for clbit in (creg1[0], creg1[1], creg2[0])
+    ]
+    assert instructions[1].args['feedback_key'] == 'cr1_2_0_1'
+    assert instructions[3].name == 'cc_prx'
+    assert instructions[3].args['feedback_key'] == 'cr1_2_0_1'
+
+
+def test_serialize_instructions_group_measurements():
+    creg1, creg2 = ClassicalRegister(3, name='cr1'), ClassicalRegister(2, name='cr2')
+    circuit = QuantumCircuit(QuantumRegister(5), creg1, creg2)
+    circuit.measure(0, creg2[0])
+    circuit.x(1).c_if(creg2[0], 1)  # the measurement provides feedback
+    circuit.measure(4, creg1[2])
+    circuit.measure(1, creg1[0])
+    circuit.measure(2, creg2[1])
+    circuit.x(2)  # not a terminal measurement
+    circuit.measure(3, creg1[1])
+    mapping = {i: f'QB{i + 1}' for i in range(5)}
+
+    instructions = serialize_instructions(circuit, mapping, group_measurements=True)
+    assert [(inst.name, inst.qubits, inst.args.get('key')) for inst in instructions] == [
+        ('measure', ('QB1',), 'cr2_2_1_0'),
+        ('cc_prx', ('QB2',), None),
+        ('measure', ('QB3',), 'cr2_2_1_1'),
+        ('prx', ('QB3',), None),
+        ('measure', ('QB5', 'QB2', 'QB4'), 'cr1_3_0_2.0.1'),
+    ]
+    assert serialize_instructions(circuit, mapping, group_measurements=True, trusted=True) == instructions
+    dag = circuit_to_dag(circuit)
+    assert serialize_dag(dag, mapping, group_measurements=True) == serialize_instructions(
+        dag_to_circuit(dag), mapping, group_measurements=True
+    )
+
+    # a single terminal measurement is not grouped
+    single = QuantumCircuit(2, 2)
+    single.measure(0, 0)
+    assert serialize_instructions(single, mapping, group_measurements=True) == serialize_instructions(single, mapping)
+
+
+def test_serialize_dag_matches_serialize_instructions():
+    creg1, creg2 = ClassicalRegister(2, name='cr1'), ClassicalRegister(1, name='cr2')
+    circuit = QuantumCircuit(QuantumRegister(3), creg1, creg2, name='dag')
+    circuit.r(0.1, 0.2, 0)
+    circuit.cz(0, 1)
+    circuit.barrier()
+    circuit.measure(1, creg2[0])
+    circuit.x(2).c_if(creg2, 1)
+    circuit.delay(20, 0, unit='ns')
+    circuit.measure([0, 2], creg1)
+    mapping = {i: f'QB{i + 1}' for i in range(3)}
+
+    dag = circuit_to_dag(circuit)
+    # the topological order of the DAG may differ from the order of the instructions in the circuit
+    expected = serialize_instructions(dag_to_circuit(dag), mapping)
+    assert serialize_dag(dag, mapping) == expected
+    assert serialize_dag(dag, mapping, trusted=True) == expected
+    assert sorted(map(str, expected)) == sorted(map(str, serialize_instructions(circuit, mapping)))
+
+
+def test_serialize_dag_unsupported_instruction():
+    circuit = QuantumCircuit(2, name='dag')
+    circuit.h(0)
+    with pytest.raises(ValueError, match="Instruction 'h' in the circuit 'dag' is not natively supported"):
+        serialize_dag(circuit_to_dag(circuit), {0: 'QB1', 1: 'QB2'})
+
+
 def test_deserialize_instructions_empty():
     """Check that default input creates an empty qiskit quantum circuit."""
     circuit = deserialize_instructions([], {}, Layout())
@@ -156,9 +272,119 @@ def test_deserialize_instructions_roundtrip():
     assert new_instructions == instructions
 
 
+def test_deserialize_instructions_broadcasts_delay_and_reset():
+    """Multi-qubit delays and resets become one instruction per qubit, like in Qiskit."""
+    instructions = [
+        Instruction(name='delay', qubits=['QB1', 'QB2'], args={'duration': 50e-9}),
+        Instruction(name='reset', qubits=['QB1', 'QB2'], args={}),
+        Instruction(name='measure', qubits=['QB1'], args={'key': 'c_2_0_0'}),
+        Instruction(name='measure', qubits=['QB2'], args={'key': 'c_2_0_1'}),
+    ]
+    circuit = deserialize_instructions(instructions, {'QB1': 0, 'QB2': 1}, Layout())
+    assert [(inst.operation.name, [circuit.find_bit(q).index for q in inst.qubits]) for inst in circuit.data] == [
+        ('delay', [0]),
+        ('delay', [1]),
+        ('reset', [0]),
+        ('reset', [1]),
+        ('measure', [0]),
+        ('measure', [1]),
+    ]
+    assert circuit.data[0].operation.unit == 's'
+    # both keys refer to the same classical register
+    assert len(circuit.cregs) == 1
+    assert [circuit.find_bit(inst.clbits[0]).index for inst in circuit.data[4:]] == [0, 1]
+
+
+def test_deserialize_instructions_grouped_measurement():
+    instructions = [Instruction(name='measure', qubits=['QB2', 'QB1'], args={'key': 'c_2_0_0.1'})]
+    circuit = deserialize_instructions(instructions, {'QB1': 0, 'QB2': 1}, Layout())
+    assert [
+        (circuit.find_bit(inst.qubits[0]).index, circuit.find_bit(inst.clbits[0]).index) for inst in circuit.data
+    ] == [
+        (1, 0),
+        (0, 1),
+    ]
+    assert serialize_instructions(circuit, {0: 'QB1', 1: 'QB2'}, group_measurements=True) == instructions
+
+
 def test_deserialize_instructions_unsupported_instruction():
     """Check that invalid instruction raises an error."""
     instruction = Instruction(name='cz', qubits=['QB1', 'QB2'], args={})
     instruction.name = 'cx'  # Purposely creating an instruction with an unsupported name.
     with pytest.raises(ValueError, match='Unsupported instruction cx in the circuit.'):
         deserialize_instructions([instruction], {'QB1': 0, 'QB2': 1, 'CR1': 2}, Layout())
+
+
+def test_serialize_template_bind_matches_serialize_instructions():
+    theta = ParameterVector('theta', 2)
+    phi = Parameter('phi')
+    qubit_index_to_name = {0: 'QB1', 1: 'QB2'}
+    circuit = QuantumCircuit(2, 1)
+    circuit.r(theta[0], phi, 0)
+    circuit.id(1)
+    circuit.rx(2 * theta[1] + 0.5, 1)
+    circuit.cz(0, 1)
+    circuit.measure(0, 0)
+    circuit.ry(phi.sin(), 1).c_if(0, 1)
+    circuit.r(0.3, 0.1, 0)
+
+    template = serialize_template(circuit, qubit_index_to_name, metadata={'sweep': True})
+    assert template.parameters == list(circuit.parameters)
+    values = np.array([[0.1, 0.2, 0.3], [1.0, 2.0, 3.0], [-1.0, 0.0, 4.0]])
+    bound = template.bind(values)
+
+    assert len(bound) == 3
+    for circuit_bound, row in zip(bound, values):
+        expected = serialize_instructions(circuit.assign_parameters(row), qubit_index_to_name)
+        assert circuit_bound.name == circuit.name
+        assert circuit_bound.metadata == {'sweep': True}
+        assert len(circuit_bound.instructions) == len(expected)
+        for instruction, expected_instruction in zip(circuit_bound.instructions, expected):
+            assert instruction.name == expected_instruction.name
+            assert instruction.qubits == expected_instruction.qubits
+            assert instruction.args.keys() == expected_instruction.args.keys()
+            for arg_name, arg_value in instruction.args.items():
+                assert arg_value == pytest.approx(expected_instruction.args[arg_name])
+        # bound circuits are valid
+        Circuit.model_validate(circuit_bound.model_dump())
+
+
+def test_serialize_template_expressions_undefined_at_zero():
+    """The parameter expressions are evaluated only when binding, so they need not be defined at zero."""
+    theta = Parameter('theta')
+    qubit_index_to_name = {0: 'QB1', 1: 'QB2'}
+    circuit = QuantumCircuit(2)
+    circuit.rx(1 / theta, 0)
+    circuit.r(theta.log(), (theta - 1) ** 0.5, 1)
+
+    template = serialize_template(circuit, qubit_index_to_name)
+    values = np.array([[2.0], [4.0]])
+    for circuit_bound, row in zip(template.bind(values), values):
+        expected = serialize_instructions(circuit.assign_parameters(row), qubit_index_to_name)
+        for instruction, expected_instruction in zip(circuit_bound.instructions, expected):
+            assert instruction.args == pytest.approx(expected_instruction.args)
+
+
+def test_serialize_template_without_parameters():
+    circuit = QuantumCircuit(1)
+    circuit.x(0)
+    template = serialize_template(circuit, {0: 'QB1'})
+    bound = template.bind(np.zeros((2, 0)))
+    assert [c.instructions for c in bound] == [tuple(serialize_instructions(circuit, {0: 'QB1'}))] * 2
+
+
+def test_serialize_template_wrong_shape():
+    theta = Parameter('theta')
+    circuit = QuantumCircuit(1)
+    circuit.rx(theta, 0)
+    template = serialize_template(circuit, {0: 'QB1'})
+    with pytest.raises(ValueError, match=r'Expected parameter values with the shape \(\*, 1\), got \(3,\)'):
+        template.bind(np.zeros(3))
+
+
+def test_serialize_template_unsupported_parameter():
+    duration = Parameter('duration')
+    circuit = QuantumCircuit(1)
+    circuit.delay(duration, 0, unit='s')
+    with pytest.raises(ValueError, match="Parameter 0 of instruction 'delay'"):
+        serialize_template(circuit, {0: 'QB1'})
@@ -0,0 +1,109 @@
+# Copyright 2025 Qiskit on IQM developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Testing the binary export of run requests.
+"""
+import io
+import uuid
+
+import pytest
+
+from iqm.iqm_client import Circuit, HeraldingMode, Instruction, RunRequest, SingleQubitMapping
+from iqm.qiskit_iqm.iqm_provider import IQMBackend
+from iqm.qiskit_iqm.run_request_export import export_run_request, iter_exported_circuits, load_run_request
+
+
+@pytest.fixture
+def run_request():
+    circuit_1 = Circuit(
+        name='circuit_1',
+        instructions=[
+            Instruction(name='prx', qubits=('QB1',), args={'angle_t': 0.25, 'phase_t': 0.1}),
+            Instruction(name='cz', implementation='tgss', qubits=('QB1', 'QB2'), args={}),
+            Instruction(name='measure', qubits=('QB1',), args={'key': 'c_2_0_0', 'feedback_key': 'c_2_0_0'}),
+            Instruction(
+                name='cc_prx',
+                qubits=('QB2',),
+                args={'angle_t': 0.5, 'phase_t': 0.0, 'feedback_qubit': 'QB1', 'feedback_key': 'c_2_0_0'},
+            ),
+            Instruction(name='barrier', qubits=('QB1', 'QB2'), args={}),
+            Instruction(name='delay', qubits=('QB2',), args={'duration': 4e-8}),
+            Instruction(name='measure', qubits=('QB2', 'QB3'), args={'key': 'c_2_0_1.0'}),
+        ],
+        metadata={'experiment': {'round': 1}},
+    )
+    circuit_2 = Circuit(
+        name='circuit_2',
+        instructions=[
+            Instruction(name='prx', qubits=('QB3',), args={'angle_t': -0.125, 'phase_t': 0.75}),
+        ],
+        metadata=None,
+    )
+    return RunRequest(
+        circuits=[circuit_1, circuit_2],
+        calibration_set_id=uuid.uuid4(),
+        qubit_mapping=[SingleQubitMapping(logical_name='QB1', physical_name='QB1')],
+        shots=100,
+        heralding_mode=HeraldingMode.ZEROS,
+    )
+
+
+@pytest.mark.parametrize('trusted', [False, True])
+def test_export_and_load_run_request(tmp_path, run_request, trusted):
+    path = tmp_path / 'run_request.bin'
+    IQMBackend.export_run_request(run_request, path)
+
+    loaded = load_run_request(path, trusted=trusted)
+    assert loaded.model_dump() == run_request.model_dump()
+    assert len(path.read_bytes()) < len(run_request.model_dump_json())
+
+
+def test_iter_exported_circuits(run_request):
+    buffer = io.BytesIO()
+    export_run_request(run_request, buffer)
+
+    buffer.seek(0)
+    circuits = iter_exported_circuits(buffer)
+    assert next(circuits) == run_request.circuits[0]
+    # the strings introduced by the first circuit are reused by the second one
+    assert next(circuits).model_dump() == run_request.circuits[1].model_dump()
+    assert next(circuits, None) is None
+
+
+def test_export_run_request_non_native_instructions(run_request):
+    # non-native instructions may have arbitrary JSON arguments
+    instruction = Instruction.model_construct(
+        name='nonnative', qubits=('QB3',), args={'p0': [1, 2], 'p1': 3, 'p2': True}
+    )
+    circuit = Circuit.model_construct(name='nonnative', instructions=(instruction,), metadata=None)
+    run_request = run_request.model_copy(update={'circuits': [circuit]})
+    buffer = io.BytesIO()
+    export_run_request(run_request, buffer)
+
+    buffer.seek(0)
+    assert load_run_request(buffer, trusted=True).model_dump() == run_request.model_dump()
+
+
+def test_load_run_request_invalid_file(run_request):
+    with pytest.raises(ValueError, match='Not an exported run request.'):
+        load_run_request(io.BytesIO(run_request.model_dump_json().encode()))
+
+    buffer = io.BytesIO()
+    export_run_request(run_request, buffer)
+    with pytest.raises(ValueError, match='Unexpected end of the exported run request.'):
+        load_run_request(io.BytesIO(buffer.getvalue()[:-10]))
+
+    data = bytearray(buffer.getvalue())
+    data[8] = 99
+    with pytest.raises(ValueError, match='Unsupported run request export format version 99.'):
+        load_run_request(io.BytesIO(bytes(data)))
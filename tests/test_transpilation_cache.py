@@ -0,0 +1,228 @@
+# Copyright 2025 Qiskit on IQM developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Testing the transpilation cache.
+"""
+import uuid
+
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter
+from qiskit.transpiler import Layout
+
+from iqm.qiskit_iqm import TranspilationCache, transpile_to_IQM
+from iqm.qiskit_iqm.fake_backends import IQMFakeAdonis, IQMFakeDeneb
+from iqm.qiskit_iqm.move_gate import MoveGate
+from iqm.qiskit_iqm.qiskit_to_iqm import serialize_instructions
+from iqm.qiskit_iqm.transpilation_cache import _circuit_digest
+from tests.utils import get_mocked_backend
+
+
+def ghz(num_qubits: int = 3, angle: float = 0.5) -> QuantumCircuit:
+    circuit = QuantumCircuit(num_qubits, name='ghz')
+    circuit.h(0)
+    circuit.rx(angle, 0)
+    for qubit in range(num_qubits - 1):
+        circuit.cx(qubit, qubit + 1)
+    circuit.measure_all()
+    return circuit
+
+
+def test_warm_transpilation_is_cached():
+    backend = IQMFakeAdonis()
+    cache = TranspilationCache()
+    cold = transpile_to_IQM(ghz(), backend, cache=cache, seed_transpiler=1)
+    circuit = ghz()
+    circuit.name = 'another_name'
+    warm = transpile_to_IQM(circuit, backend, cache=cache, seed_transpiler=1)
+    assert warm == cold
+    assert warm.name == 'another_name'
+    assert warm.layout.initial_layout == cold.layout.initial_layout
+    info = cache.info()
+    assert (info.hits, info.disk_hits, info.misses, info.currsize) == (1, 0, 1, 1)
+
+
+def test_cached_circuits_are_copies():
+    backend = IQMFakeAdonis()
+    cache = TranspilationCache()
+    first = transpile_to_IQM(ghz(), backend, cache=cache, seed_transpiler=1)
+    expected = first.copy()
+    first.x(0)
+    assert transpile_to_IQM(ghz(), backend, cache=cache, seed_transpiler=1) == expected
+
+
+@pytest.mark.parametrize(
+    'kwargs',
+    [
+        {'seed_transpiler': 2},
+        {'seed_transpiler': 1, 'optimization_level': 3},
+        {'seed_transpiler': 1, 'restrict_to_qubits': ['QB1', 'QB2', 'QB3']},
+        {'seed_transpiler': 1, 'initial_layout': [2, 0, 1]},
+        {'seed_transpiler': 1, 'remove_final_rzs': False},
+        {'seed_transpiler': 1, 'noise_aware_layout': True},
+    ],
+)
+def test_options_are_part_of_the_key(kwargs):
+    backend = IQMFakeAdonis()
+    cache = TranspilationCache()
+    transpile_to_IQM(ghz(), backend, cache=cache, seed_transpiler=1)
+    transpiled = transpile_to_IQM(ghz(), backend, cache=cache, **kwargs)
+    assert cache.info().misses == 2
+    assert transpiled == transpile_to_IQM(ghz(), backend, **kwargs)
+
+
+def test_architecture_is_part_of_the_key(adonis_architecture):
+    cache = TranspilationCache()
+    backend, _ = get_mocked_backend(adonis_architecture)
+    transpile_to_IQM(ghz(), backend, cache=cache, seed_transpiler=1)
+    recalibrated = adonis_architecture.model_copy(update={'calibration_set_id': uuid.uuid4()})
+    backend, _ = get_mocked_backend(recalibrated)
+    transpile_to_IQM(ghz(), backend, cache=cache, seed_transpiler=1)
+    transpile_to_IQM(ghz(), IQMFakeAdonis(), cache=cache, seed_transpiler=1)
+    assert cache.info().misses == 3
+
+
+def test_error_profile_is_part_of_the_key():
+    backend = IQMFakeAdonis()
+    profile = backend.error_profile
+    profile.readout_errors['QB1'] = {'0': 0.5, '1': 0.5}
+    cache = TranspilationCache()
+    transpile_to_IQM(ghz(), backend, cache=cache, seed_transpiler=1, noise_aware_layout=True)
+    transpile_to_IQM(
+        ghz(), backend.copy_with_error_profile(profile), cache=cache, seed_transpiler=1, noise_aware_layout=True
+    )
+    assert cache.info().misses == 2
+
+
+def test_uncacheable_transpilations():
+    backend = IQMFakeAdonis()
+    cache = TranspilationCache()
+    circuit = ghz()
+    layout = Layout({qubit: i for i, qubit in enumerate(circuit.qubits)})
+    transpile_to_IQM(circuit, backend, cache=cache, initial_layout=layout)
+    circuit.metadata = {'not json': object()}
+    transpile_to_IQM(circuit, backend, cache=cache)
+    assert cache.info() == (0, 0, 0, 128, 0)
+
+
+def test_disk_cache(tmp_path):
+    backend = IQMFakeDeneb()
+    cold = transpile_to_IQM(ghz(), backend, cache=TranspilationCache(directory=tmp_path), seed_transpiler=1)
+    assert len(list(tmp_path.glob('*.qpy'))) == 1
+    cache = TranspilationCache(directory=tmp_path)
+    warm = transpile_to_IQM(ghz(), backend, cache=cache, seed_transpiler=1)
+    qubit_mapping = dict(enumerate(backend.physical_qubits))
+    assert serialize_instructions(warm, qubit_mapping) == serialize_instructions(cold, qubit_mapping)
+    assert warm.layout.initial_layout == cold.layout.initial_layout
+    assert cache.info().disk_hits == 1
+    transpile_to_IQM(ghz(), backend, cache=cache, seed_transpiler=1)
+    assert cache.info().hits == 1
+
+    cache.clear(disk=True)
+    assert not list(tmp_path.glob('*.qpy'))
+    assert cache.info() == (0, 0, 0, 128, 0)
+
+
+def test_unreadable_disk_entries_are_misses(tmp_path):
+    backend = IQMFakeAdonis()
+    transpile_to_IQM(ghz(), backend, cache=TranspilationCache(directory=tmp_path), seed_transpiler=1)
+    (path,) = tmp_path.glob('*.qpy')
+    path.write_bytes(b'garbage')
+    cache = TranspilationCache(directory=tmp_path)
+    transpile_to_IQM(ghz(), backend, cache=cache, seed_transpiler=1)
+    assert cache.info().misses == 1
+
+
+def test_lru_eviction():
+    backend = IQMFakeAdonis()
+    cache = TranspilationCache(maxsize=2)
+    for angle in (0.1, 0.2, 0.1, 0.3, 0.2):
+        transpile_to_IQM(ghz(angle=angle), backend, cache=cache, seed_transpiler=1)
+    # 0.2 was evicted when 0.3 was added, as 0.1 had been used more recently
+    assert cache.info() == (1, 0, 4, 2, 2)
+    with pytest.raises(ValueError, match='non-negative'):
+        TranspilationCache(maxsize=-1)
+
+
+def test_parameters_of_the_transpiled_circuit(tmp_path):
+    backend = IQMFakeDeneb()
+    cache = TranspilationCache(directory=tmp_path)
+
+    def circuit_with_new_parameter():
+        theta = Parameter('theta')
+        circuit = QuantumCircuit(2)
+        circuit.rx(theta, 0)
+        circuit.cx(0, 1)
+        circuit.measure_all()
+        return circuit, theta
+
+    circuit, _ = circuit_with_new_parameter()
+    transpile_to_IQM(circuit, backend, cache=cache, seed_transpiler=1)
+    for warm_cache in (cache, TranspilationCache(directory=tmp_path)):
+        circuit, theta = circuit_with_new_parameter()
+        transpiled = transpile_to_IQM(circuit, backend, cache=warm_cache, seed_transpiler=1)
+        assert list(transpiled.parameters) == [theta]
+        assert not transpiled.assign_parameters({theta: 0.3}).parameters
+
+
+def test_circuit_digest():
+    assert _circuit_digest(ghz()) == _circuit_digest(ghz())
+    assert _circuit_digest(ghz()) != _circuit_digest(ghz(angle=0.6))
+    assert _circuit_digest(ghz()) != _circuit_digest(ghz(num_qubits=4))
+
+    def with_custom_gate(angle: float) -> QuantumCircuit:
+        definition = QuantumCircuit(1, name='custom')
+        definition.rx(angle, 0)
+        circuit = QuantumCircuit(1)
+        circuit.append(definition.to_gate(), [0])
+        return circuit
+
+    assert _circuit_digest(with_custom_gate(0.1)) != _circuit_digest(with_custom_gate(0.2))
+
+    unitary = QuantumCircuit(1)
+    unitary.unitary(np.eye(2), [0])
+    assert _circuit_digest(unitary) is not None
+
+    circuit = ghz()
+    circuit.metadata = {'a': 1, 'b': 2}
+    reordered = ghz()
+    reordered.metadata = {'b': 2, 'a': 1}
+    assert _circuit_digest(circuit) == _circuit_digest(reordered)
+
+
+def test_disk_cache_preserves_delays_and_moves(tmp_path):
+    backend = IQMFakeDeneb()
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure([0, 1], [0, 1])
+    with_delay = circuit.copy()
+    with_delay.delay(5, 0, unit='us')
+    for _ in range(2):
+        transpiled = transpile_to_IQM(
+            with_delay, backend, cache=TranspilationCache(directory=tmp_path), seed_transpiler=1
+        )
+        (delay,) = [instruction.operation for instruction in transpiled.data if instruction.operation.name == 'delay']
+        assert (delay.duration, delay.unit) == (5, 'us')
+    # QPY would load the delay in dt
+    assert not list(tmp_path.glob('*.qpy'))
+
+    cold = transpile_to_IQM(circuit, backend, cache=TranspilationCache(directory=tmp_path), seed_transpiler=1)
+    assert 'move' in cold.count_ops()
+    cache = TranspilationCache(directory=tmp_path)
+    warm = transpile_to_IQM(circuit, backend, cache=cache, seed_transpiler=1)
+    assert cache.info().disk_hits == 1
+    moves = [instruction.operation for instruction in warm.data if instruction.operation.name == 'move']
+    assert moves and all(isinstance(move, MoveGate) for move in moves)
+    assert warm == cold